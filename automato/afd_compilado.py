@@ -0,0 +1,103 @@
+# Arquivo: simulador_de_automatos/automato/afd_compilado.py
+from array import array
+from collections.abc import Sequence
+from automato import EPSILON
+
+class AFDCompilado:
+    """
+    Forma compacta de um AFD para verificações em massa (sem GUI e sem passo a passo).
+    Estados viram inteiros, símbolos viram colunas e δ fica numa tabela densa array('i').
+    """
+    def __init__(self, nomes_estados, inicial, finais, transicoes, versao=None):
+        """
+        nomes_estados: sequência de nomes (a posição é o id do estado); outras sequências
+        (ex.: a tabela de nomes preguiçosa do formato binário) são usadas sem cópia.
+        inicial: id do estado inicial (-1 se não houver).
+        finais: ids dos estados finais.
+        transicoes: iterável de (id_origem, rotulo, id_destino).
+        """
+        self.nomes = nomes_estados if isinstance(nomes_estados, Sequence) else list(nomes_estados)
+        self.inicial = inicial
+        self.versao = versao # Versão do autômato de origem no momento da compilação
+        self.finais = bytearray(len(self.nomes))
+        for id_estado in finais: self.finais[id_estado] = 1
+
+        simples = []
+        self.rotulos_longos = {} # id_origem -> [(rotulo, id_destino)], mais longos primeiro
+        for origem, rotulo, destino in transicoes:
+            if rotulo == EPSILON or not rotulo: continue # O simulador de AFD ignora transições épsilon
+            if len(rotulo) == 1: simples.append((origem, rotulo, destino))
+            else: self.rotulos_longos.setdefault(origem, []).append((rotulo, destino))
+        for rotulos in self.rotulos_longos.values():
+            rotulos.sort(key=lambda item: len(item[0]), reverse=True)
+
+        # Cada símbolo de um caractere vira uma coluna da tabela
+        self.colunas = {simbolo: i for i, simbolo in enumerate(sorted({r for _, r, _ in simples}))}
+        self.num_colunas = max(1, len(self.colunas))
+        # A tabela guarda o deslocamento da linha do destino (id * num_colunas), ou -1 se indefinida,
+        # para que o laço de execução não precise multiplicar a cada símbolo
+        self.tabela = array('i', [-1]) * (len(self.nomes) * self.num_colunas)
+        for origem, rotulo, destino in simples:
+            self.tabela[origem * self.num_colunas + self.colunas[rotulo]] = destino * self.num_colunas
+
+    @classmethod
+    def de_afd(cls, afd):
+        """Compila um objeto AFD (ou qualquer autômato com transições (origem, simbolo) -> destino)."""
+        ids = {nome: i for i, nome in enumerate(afd.estados)}
+        inicial = ids.get(afd.estado_inicial.nome, -1) if afd.estado_inicial else -1
+        finais = [ids[e.nome] for e in afd.estados_finais if e.nome in ids]
+        transicoes = [(ids[o], rotulo, ids[d]) for (o, rotulo), d in afd.transicoes.items() if o in ids and d in ids]
+        return cls(list(ids), inicial, finais, transicoes, versao=afd.versao)
+
+    def executar(self, cadeia):
+        """
+        Executa a cadeia sem gerar passos intermediários.
+        Retorna (nome_estado_atual, simbolos_consumidos); se consumidos < len(cadeia),
+        a execução parou numa transição indefinida. Sem estado inicial, retorna (None, 0).
+        """
+        if self.inicial < 0: return None, 0
+        id_estado, consumidos = self._executar_ids(cadeia)
+        return self.nomes[id_estado], consumidos
+
+    def aceita(self, cadeia):
+        """Retorna True se a cadeia for totalmente consumida e terminar num estado final."""
+        if self.inicial < 0: return False
+        id_estado, consumidos = self._executar_ids(cadeia)
+        return consumidos == len(cadeia) and self.finais[id_estado] == 1
+
+    def _executar_ids(self, cadeia):
+        """Laço principal: retorna (id_estado_atual, simbolos_consumidos)."""
+        if self.rotulos_longos: return self._executar_com_rotulos_longos(cadeia)
+
+        tabela = self.tabela
+        linha = self.inicial * self.num_colunas
+        consumidos = 0
+        for consumidos, coluna in enumerate(map(self.colunas.get, cadeia)):
+            if coluna is None: break
+            proxima = tabela[linha + coluna]
+            if proxima < 0: break
+            linha = proxima
+        else:
+            consumidos = len(cadeia)
+        return linha // self.num_colunas, consumidos
+
+    def _executar_com_rotulos_longos(self, cadeia):
+        """Caminho usado quando há rótulos com mais de um caractere (casamento do mais longo, como no SimuladorAFD)."""
+        tabela, colunas, longos, k = self.tabela, self.colunas, self.rotulos_longos, self.num_colunas
+        id_estado = self.inicial
+        indice = 0
+        tamanho = len(cadeia)
+        while indice < tamanho:
+            for rotulo, destino in longos.get(id_estado, ()):
+                if cadeia.startswith(rotulo, indice):
+                    id_estado = destino
+                    indice += len(rotulo)
+                    break
+            else:
+                coluna = colunas.get(cadeia[indice])
+                if coluna is None: break
+                proxima = tabela[id_estado * k + coluna]
+                if proxima < 0: break
+                id_estado = proxima // k
+                indice += 1
+        return id_estado, indice
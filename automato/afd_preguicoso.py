@@ -0,0 +1,84 @@
+# Arquivo: simulador_de_automatos/automato/afd_preguicoso.py
+from collections import OrderedDict
+
+class AFDPreguicoso:
+    """
+    Determinização preguiçosa de um AFN: os estados do AFD são construídos sob demanda durante a execução.
+    Cada estado do AFD é um conjunto de estados do AFN (representado como a máscara de bits do AFNCompilado,
+    equivalente a um frozenset) e suas transições são memorizadas num cache LRU limitado a 'max_estados',
+    para que a explosão exponencial de subconjuntos não esgote a memória.
+    """
+    def __init__(self, afn, max_estados=4096):
+        if max_estados < 1: raise ValueError("max_estados deve ser pelo menos 1.")
+        self.motor = afn.compilar()
+        self.versao = self.motor.versao
+        self.max_estados = max_estados
+        self._cache = OrderedDict() # mascara -> {rotulo: proxima_mascara}; 0 indica que travou
+        self.acertos = 0
+        self.construidos = 0
+        self.descartados = 0
+        self._apenas_simbolos_unitarios = self.motor.comprimentos in ([], [1])
+
+    def _linha(self, mascara):
+        """Retorna a linha de transições do estado do AFD 'mascara', criando-a (e descartando a menos usada) se preciso."""
+        linha = self._cache.get(mascara)
+        if linha is None:
+            linha = {}
+            self._cache[mascara] = linha
+            self.construidos += 1
+            if len(self._cache) > self.max_estados:
+                self._cache.popitem(last=False)
+                self.descartados += 1
+        else:
+            self._cache.move_to_end(mascara)
+        return linha
+
+    def _proximo(self, mascara, linha, cadeia, indice):
+        """Retorna (proxima_mascara, comprimento) a partir de 'indice'; comprimento 0 indica que travou."""
+        if self._apenas_simbolos_unitarios:
+            simbolo = cadeia[indice]
+            proxima = linha.get(simbolo)
+            if proxima is None:
+                proxima, _, _ = self.motor.passo(mascara, simbolo, 0)
+                linha[simbolo] = proxima
+            else:
+                self.acertos += 1
+            return proxima, (1 if proxima else 0)
+        # Rótulos de vários caracteres: casa o mais longo, como no SimuladorAFN
+        for comprimento in self.motor.comprimentos:
+            rotulo = cadeia[indice:indice + comprimento]
+            if len(rotulo) < comprimento: continue
+            proxima = linha.get(rotulo)
+            if proxima is None:
+                proxima, consumido, _ = self.motor.passo(mascara, rotulo, 0)
+                linha[rotulo] = proxima if consumido == comprimento else 0
+                proxima = linha[rotulo]
+            else:
+                self.acertos += 1
+            if proxima: return proxima, comprimento
+        return 0, 0
+
+    def executar(self, cadeia):
+        """Executa a cadeia. Retorna (conjunto de nomes dos estados do AFN ativos, símbolos consumidos)."""
+        mascara = self.motor.mascara_inicial
+        indice = 0
+        tamanho = len(cadeia)
+        while indice < tamanho and mascara:
+            proxima, comprimento = self._proximo(mascara, self._linha(mascara), cadeia, indice)
+            if not comprimento: break
+            mascara = proxima
+            indice += comprimento
+        return self.motor.nomes_de(mascara), indice
+
+    def aceita(self, cadeia):
+        """Retorna True se a cadeia for totalmente consumida com algum estado final ativo."""
+        mascara = self.motor.mascara_inicial
+        if not mascara: return False
+        indice = 0
+        tamanho = len(cadeia)
+        while indice < tamanho:
+            proxima, comprimento = self._proximo(mascara, self._linha(mascara), cadeia, indice)
+            if not comprimento: return False
+            mascara = proxima
+            indice += comprimento
+        return bool(mascara & self.motor.mascara_finais)
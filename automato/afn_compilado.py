@@ -0,0 +1,132 @@
+# Arquivo: simulador_de_automatos/automato/afn_compilado.py
+from automato import EPSILON
+
+class AFNCompilado:
+    """
+    Motor de simulação de AFN baseado em bitsets.
+    Cada estado vira um bit de um inteiro; os fechos-ε de todos os estados são calculados uma única vez
+    e cada passo é a união (OU) das máscaras de sucessores pré-calculadas por (estado, rótulo).
+    """
+    def __init__(self, afn):
+        ids = {nome: i for i, nome in enumerate(afn.estados)}
+        arestas = [] # (id_origem, rotulo, id_destino)
+        for (origem, rotulo), destinos in afn.transicoes.items():
+            if origem not in ids: continue
+            for destino in (destinos if isinstance(destinos, set) else (destinos,)):
+                if destino in ids: arestas.append((ids[origem], rotulo, ids[destino]))
+        inicial = ids.get(afn.estado_inicial.nome, -1) if afn.estado_inicial else -1
+        finais = [ids[e.nome] for e in afn.estados_finais if e.nome in ids]
+        self._montar(list(ids), inicial, finais, arestas, afn.versao)
+
+    @classmethod
+    def de_arestas(cls, nomes_estados, inicial, finais, arestas, versao=None):
+        """
+        Monta o motor direto de ids inteiros, sem um objeto AFN (ex.: a partir de um arquivo binário).
+        nomes_estados: sequência de nomes (a posição é o id); inicial: id ou -1; finais: ids;
+        arestas: iterável de (id_origem, rotulo, id_destino), com EPSILON nas transições vazias.
+        """
+        motor = cls.__new__(cls)
+        motor._montar(nomes_estados, inicial, finais, arestas, versao)
+        return motor
+
+    def _montar(self, nomes_estados, inicial, finais, arestas, versao):
+        self.versao = versao # Versão do autômato de origem no momento da compilação
+        self.nomes = nomes_estados
+        self.ids = {nome: i for i, nome in enumerate(self.nomes)}
+        n = len(self.nomes)
+
+        # Por estado: rótulo -> máscara dos destinos diretos; as transições ε ficam à parte para os fechos
+        self.sucessores = [{} for _ in range(n)]
+        vizinhos_epsilon = [0] * n
+        for origem, rotulo, destino in arestas:
+            if rotulo == EPSILON: vizinhos_epsilon[origem] |= 1 << destino
+            else:
+                linha = self.sucessores[origem]
+                linha[rotulo] = linha.get(rotulo, 0) | (1 << destino)
+
+        # Fecho-ε de cada estado (busca pelas transições ε, como em AFN.fecho_epsilon)
+        self.fecho = []
+        for i in range(n):
+            fecho = 1 << i
+            pendentes = [i]
+            while pendentes:
+                novos = vizinhos_epsilon[pendentes.pop()] & ~fecho
+                if novos:
+                    fecho |= novos
+                    pendentes.extend(self._bits(novos))
+            self.fecho.append(fecho)
+
+        # Por estado: rótulo -> máscara dos destinos já com fecho-ε
+        self.sucessores_fecho = [{rotulo: self.fechar(mascara) for rotulo, mascara in linha.items()} for linha in self.sucessores]
+        self.comprimentos = sorted({len(rotulo) for linha in self.sucessores for rotulo in linha}, reverse=True) # Rótulos mais longos têm prioridade
+
+        self.mascara_finais = 0
+        for id_estado in finais: self.mascara_finais |= 1 << id_estado
+        self.mascara_inicial = self.fecho[inicial] if 0 <= inicial < n else 0
+
+    # --- Conversões entre nomes e máscaras ---
+    def mascara_de(self, nomes):
+        mascara = 0
+        for nome in nomes:
+            if nome in self.ids: mascara |= 1 << self.ids[nome]
+        return mascara
+
+    def nomes_de(self, mascara):
+        return {self.nomes[i] for i in self._bits(mascara)}
+
+    @staticmethod
+    def _bits(mascara):
+        """Itera sobre os índices dos bits ligados da máscara."""
+        while mascara:
+            bit = mascara & -mascara
+            yield bit.bit_length() - 1
+            mascara ^= bit
+
+    def fechar(self, mascara):
+        """Aplica o fecho-ε a um conjunto de estados (máscara)."""
+        resultado = mascara
+        for i in self._bits(mascara):
+            resultado |= self.fecho[i]
+        return resultado
+
+    # --- Execução ---
+    def passo(self, mascara, cadeia, indice, com_transicoes=False):
+        """
+        Consome o rótulo mais longo que casa em 'indice' a partir dos estados ativos.
+        Retorna (proxima_mascara, comprimento_consumido, transicoes_ativas); comprimento 0 indica que travou.
+        transicoes_ativas (pares origem/destino) só é montado se com_transicoes=True.
+        """
+        ativos = list(self._bits(mascara))
+        for comprimento in self.comprimentos:
+            rotulo = cadeia[indice:indice + comprimento]
+            if len(rotulo) < comprimento: continue
+            proxima = 0
+            pares = set() if com_transicoes else None
+            for i in ativos:
+                destinos = self.sucessores_fecho[i].get(rotulo)
+                if destinos:
+                    proxima |= destinos
+                    if com_transicoes:
+                        origem = self.nomes[i]
+                        pares.update((origem, self.nomes[j]) for j in self._bits(self.sucessores[i][rotulo]))
+            if proxima:
+                return proxima, comprimento, pares
+        return 0, 0, set() if com_transicoes else None
+
+    def executar(self, cadeia):
+        """Executa a cadeia inteira. Retorna (máscara dos estados atuais, símbolos consumidos)."""
+        mascara = self.mascara_inicial
+        indice = 0
+        tamanho = len(cadeia)
+        while indice < tamanho:
+            proxima, comprimento, _ = self.passo(mascara, cadeia, indice)
+            if not comprimento: break
+            mascara = proxima
+            indice += comprimento
+        return mascara, indice
+
+    def aceita(self, cadeia):
+        """Retorna True se a cadeia for totalmente consumida com algum estado final ativo."""
+        if not self.mascara_inicial: return False
+        mascara, consumidos = self.executar(cadeia)
+        return consumidos == len(cadeia) and bool(mascara & self.mascara_finais)
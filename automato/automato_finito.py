@@ -1,4 +1,10 @@
+from bisect import insort
 from .estado import Estado
+from .afd_compilado import AFDCompilado
+from .afn_compilado import AFNCompilado
+from .afd_preguicoso import AFDPreguicoso
+from .minimizacao import minimizar_deterministico
+from collections import deque
 from automato import EPSILON # Importa EPSILON do __init__
 
 class AutomatoFinito:
@@ -8,12 +14,36 @@ class AutomatoFinito:
         self.transicoes = {} # Dicionário: (estado_origem, simbolo) -> set(estados_destino) ou estado_destino (AFD)
         self.estado_inicial = None # ATRIBUTO CORRETO
         self.estados_finais = set()
+        # Índice de adjacência: estado_origem -> [rótulos de saída], ordenados do mais longo ao mais curto
+        self.rotulos_por_origem = {}
+        # Contador de modificações: toda edição incrementa, invalidando formas compiladas em cache
+        self.versao = 0
+        self._compilado = None
+        self._preguicoso = None # AFDPreguicoso do AFN, validado pela versão como o _compilado
+
+    def _indexar_rotulo(self, origem, rotulo):
+        """
+        Registra um rótulo de saída (ainda não indexado) de 'origem', mantendo a ordem por comprimento decrescente.
+        Quem chama verifica antes se a chave (origem, rotulo) é nova em self.transicoes.
+        """
+        rotulos = self.rotulos_por_origem.get(origem)
+        if rotulos is None: self.rotulos_por_origem[origem] = [rotulo]
+        elif len(rotulos[-1]) >= len(rotulo): rotulos.append(rotulo) # Caso comum: rótulos de mesmo tamanho
+        else: insort(rotulos, rotulo, key=lambda r: -len(r)) # Empates mantêm a ordem de inserção
+
+    def _desindexar_rotulo(self, origem, rotulo):
+        """Remove um rótulo de saída de 'origem' do índice."""
+        rotulos = self.rotulos_por_origem.get(origem)
+        if rotulos and rotulo in rotulos:
+            rotulos.remove(rotulo)
+            if not rotulos: del self.rotulos_por_origem[origem]
 
     def adicionar_estado(self, nome, x, y, is_final=False, is_inicial=False):
         if nome in self.estados:
             raise ValueError(f"Estado '{nome}' já existe.")
         novo_estado = Estado(nome, x, y, is_final, is_inicial)
         self.estados[nome] = novo_estado
+        self.versao += 1
         if is_inicial:
             self.definir_estado_inicial(nome)
         if is_final:
@@ -28,6 +58,7 @@ class AutomatoFinito:
         estado_obj = self.estados.pop(nome_antigo)
         estado_obj.nome = nome_novo
         self.estados[nome_novo] = estado_obj
+        self.versao += 1
 
         novas_transicoes = {}
         for (origem, simbolo), destino_set in self.transicoes.items():
@@ -41,6 +72,9 @@ class AutomatoFinito:
                 novas_transicoes[(nova_origem, simbolo)] = novo_destino
         self.transicoes = novas_transicoes
 
+        if nome_antigo in self.rotulos_por_origem:
+            self.rotulos_por_origem[nome_novo] = self.rotulos_por_origem.pop(nome_antigo)
+
         if self.estado_inicial and self.estado_inicial.nome == nome_novo:
              self.estado_inicial = estado_obj
 
@@ -59,6 +93,7 @@ class AutomatoFinito:
 
         self.estado_inicial = self.estados[nome_estado]
         self.estados[nome_estado].is_inicial = True
+        self.versao += 1
 
 
     def alternar_estado_final(self, nome_estado):
@@ -67,10 +102,12 @@ class AutomatoFinito:
             estado.is_final = not estado.is_final
             if estado.is_final: self.estados_finais.add(estado)
             elif estado in self.estados_finais: self.estados_finais.remove(estado)
+            self.versao += 1
 
     def deletar_estado(self, nome_estado):
         if nome_estado not in self.estados: return
         estado_a_deletar = self.estados[nome_estado]
+        self.versao += 1
 
         novas_transicoes = {}
         for chave, destinos in self.transicoes.items():
@@ -80,15 +117,19 @@ class AutomatoFinito:
             if isinstance(destinos, set): # AFN
                 novos_destinos = destinos - {nome_estado}
                 if novos_destinos: novas_transicoes[chave] = novos_destinos
+                else: self._desindexar_rotulo(origem, simbolo)
             else: # AFD
                 if destinos != nome_estado: novas_transicoes[chave] = destinos
+                else: self._desindexar_rotulo(origem, simbolo)
         self.transicoes = novas_transicoes
+        self.rotulos_por_origem.pop(nome_estado, None)
 
         if self.estado_inicial and self.estado_inicial.nome == nome_estado: self.estado_inicial = None
         if estado_a_deletar in self.estados_finais: self.estados_finais.remove(estado_a_deletar)
         del self.estados[nome_estado]
 
     def deletar_transicoes_entre(self, origem, destino):
+        self.versao += 1
         chaves_para_remover = []
         chaves_para_modificar = {}
 
@@ -103,27 +144,113 @@ class AutomatoFinito:
                     if destinos_reais == destino: chaves_para_remover.append(chave)
 
         for chave in chaves_para_remover:
-            if chave in self.transicoes: del self.transicoes[chave]
+            if chave in self.transicoes:
+                del self.transicoes[chave]
+                self._desindexar_rotulo(*chave)
         for chave, destinos_a_remover in chaves_para_modificar.items():
              if chave in self.transicoes:
                  self.transicoes[chave].difference_update(destinos_a_remover)
-                 if not self.transicoes[chave]: del self.transicoes[chave]
+                 if not self.transicoes[chave]:
+                     del self.transicoes[chave]
+                     self._desindexar_rotulo(*chave)
 
 
 class AFD(AutomatoFinito):
     def adicionar_transicao(self, origem, simbolo, destino):
         if origem in self.estados and destino in self.estados:
+            if (origem, simbolo) not in self.transicoes: self._indexar_rotulo(origem, simbolo)
             self.transicoes[(origem, simbolo)] = destino
             if simbolo != EPSILON: self.alfabeto.add(simbolo)
+            self.versao += 1
+
+    def compilar(self):
+        """
+        Retorna a forma compilada (AFDCompilado) deste AFD para execução em lote.
+        A compilação é reaproveitada enquanto o autômato não for modificado.
+        """
+        if self._compilado is None or self._compilado.versao != self.versao:
+            self._compilado = AFDCompilado.de_afd(self)
+        return self._compilado
+
+    def minimizar(self):
+        """
+        Retorna um novo AFD mínimo equivalente (algoritmo de Hopcroft, O(n log n)).
+        Estados inalcançáveis são removidos e cada classe de equivalência mantém o nome e a posição do seu representante.
+        """
+        return minimizar_deterministico(self, AFD(), lambda estado: estado.is_final, sumidouro_separado=False)
 
 class AFN(AutomatoFinito):
     def adicionar_transicao(self, origem, simbolo, destino):
         if origem in self.estados and destino in self.estados:
             chave = (origem, simbolo)
-            if chave not in self.transicoes: self.transicoes[chave] = set()
+            if chave not in self.transicoes:
+                self.transicoes[chave] = set()
+                self._indexar_rotulo(origem, simbolo)
             elif not isinstance(self.transicoes[chave], set): self.transicoes[chave] = {self.transicoes[chave]}
             self.transicoes[chave].add(destino)
             if simbolo != EPSILON: self.alfabeto.add(simbolo)
+            self.versao += 1
+
+    def compilar(self):
+        """
+        Retorna o motor de bitsets (AFNCompilado) deste AFN, com os fechos-ε já calculados.
+        O motor é reaproveitado enquanto o autômato não for modificado.
+        """
+        if self._compilado is None or self._compilado.versao != self.versao:
+            self._compilado = AFNCompilado(self)
+        return self._compilado
+
+    def para_afd(self, max_estados=None):
+        """
+        Determiniza o AFN pela construção de subconjuntos, retornando um novo AFD equivalente.
+        Cada estado do AFD se chama '{q0,q1,...}' e fica na posição média dos estados que agrupa.
+        Rótulos de vários caracteres são preservados (o SimuladorAFD também casa o mais longo primeiro).
+        Se 'max_estados' for informado e a construção passar desse limite, lança ValueError.
+        """
+        motor = self.compilar()
+        afd = AFD()
+        if not motor.mascara_inicial: return afd
+
+        nomes_afd = {}
+        def registrar(mascara):
+            membros = [self.estados[motor.nomes[i]] for i in motor._bits(mascara)]
+            nome = "{" + ",".join(e.nome for e in membros) + "}"
+            x = sum(e.x for e in membros) / len(membros)
+            y = sum(e.y for e in membros) / len(membros)
+            afd.adicionar_estado(nome, x, y)
+            if mascara & motor.mascara_finais: afd.alternar_estado_final(nome)
+            nomes_afd[mascara] = nome
+            if max_estados is not None and len(nomes_afd) > max_estados:
+                raise ValueError(f"A determinização ultrapassou o limite de {max_estados} estados.")
+
+        registrar(motor.mascara_inicial)
+        afd.definir_estado_inicial(nomes_afd[motor.mascara_inicial])
+        fila = deque([motor.mascara_inicial])
+        while fila:
+            mascara = fila.popleft()
+            # Une, por rótulo, os sucessores (com fecho-ε) de todos os estados do subconjunto
+            destinos_por_rotulo = {}
+            for i in motor._bits(mascara):
+                for rotulo, destinos in motor.sucessores_fecho[i].items():
+                    destinos_por_rotulo[rotulo] = destinos_por_rotulo.get(rotulo, 0) | destinos
+            for rotulo, destinos in destinos_por_rotulo.items():
+                if destinos not in nomes_afd:
+                    registrar(destinos)
+                    fila.append(destinos)
+                afd.adicionar_transicao(nomes_afd[mascara], rotulo, nomes_afd[destinos])
+        return afd
+
+    def afd_preguicoso(self, max_estados=4096):
+        """
+        Retorna um AFDPreguicoso, que determiniza sob demanda durante a execução
+        e guarda no máximo 'max_estados' estados do AFD em cache (LRU).
+        Ele (e o seu cache) é reaproveitado enquanto o autômato não for modificado; depois de uma edição,
+        chame de novo para obter um que reflita o AFN atual.
+        """
+        if (self._preguicoso is None or self._preguicoso.versao != self.versao
+                or self._preguicoso.max_estados != max_estados):
+            self._preguicoso = AFDPreguicoso(self, max_estados=max_estados)
+        return self._preguicoso
 
     def fecho_epsilon(self, estados_nomes):
         pilha = list(estados_nomes)
@@ -1,4 +1,5 @@
 from .estado import Estado
+from .gramatica import gramatica_de_automato_pilha
 from automato import EPSILON # Importa EPSILON
 
 class AutomatoPilha:
@@ -8,10 +9,15 @@ class AutomatoPilha:
         self.estado_inicial = None
         self.estados_finais = set()
         self.simbolo_inicial_pilha = 'Z'
+        # Contador de modificações: toda edição incrementa, invalidando a gramática em cache
+        self.versao = 0
+        self._reconhecedor = None
+        self._pilha_do_reconhecedor = None # simbolo_inicial_pilha é um atributo simples: também entra na validação do cache
 
     def adicionar_estado(self, nome, x, y, is_final=False, is_inicial=False):
         if nome in self.estados: raise ValueError(f"Estado '{nome}' já existe.")
         self.estados[nome] = Estado(nome, x, y, is_final, is_inicial)
+        self.versao += 1
         if is_inicial: self.definir_estado_inicial(nome)
         if is_final: self.alternar_estado_final(nome)
 
@@ -21,6 +27,7 @@ class AutomatoPilha:
         if nome_antigo not in self.estados:
             raise ValueError(f"Estado '{nome_antigo}' não encontrado.")
 
+        self.versao += 1
         estado_obj = self.estados.pop(nome_antigo)
         estado_obj.nome = nome_novo
         self.estados[nome_novo] = estado_obj
@@ -49,6 +56,7 @@ class AutomatoPilha:
                  for state_obj in self.estados.values():
                      if state_obj == self.estado_inicial: state_obj.is_inicial = False; break
         self.estado_inicial = self.estados[nome_estado]; self.estados[nome_estado].is_inicial = True
+        self.versao += 1
 
     def alternar_estado_final(self, nome_estado):
         if nome_estado in self.estados:
@@ -56,6 +64,7 @@ class AutomatoPilha:
             estado.is_final = not estado.is_final
             if estado.is_final: self.estados_finais.add(estado)
             elif estado in self.estados_finais: self.estados_finais.remove(estado)
+            self.versao += 1
 
     def adicionar_transicao(self, origem, s_in, s_pop, destino, s_push):
         if origem not in self.estados or destino not in self.estados:
@@ -63,10 +72,12 @@ class AutomatoPilha:
         chave = (origem, s_in, s_pop)
         if chave not in self.transicoes: self.transicoes[chave] = set()
         self.transicoes[chave].add((destino, s_push))
+        self.versao += 1
 
     def deletar_estado(self, nome_estado):
         if nome_estado not in self.estados: return
         estado_a_deletar = self.estados[nome_estado]
+        self.versao += 1
 
         novas_transicoes = {}
         for chave, destinos_set in self.transicoes.items():
@@ -81,6 +92,7 @@ class AutomatoPilha:
         del self.estados[nome_estado]
 
     def deletar_transicoes_entre(self, origem, destino):
+        self.versao += 1
         chaves_para_remover = []
         chaves_para_modificar = {}
 
@@ -99,4 +111,19 @@ class AutomatoPilha:
                  self.transicoes[chave].difference_update(remover_set)
                  if not self.transicoes[chave]: chaves_para_remover.append(chave)
         for chave in chaves_para_remover:
-            if chave in self.transicoes: del self.transicoes[chave]
\ No newline at end of file
+            if chave in self.transicoes: del self.transicoes[chave]
+
+    def para_gramatica(self):
+        """Retorna uma Gramatica livre de contexto equivalente (ver gramatica_de_automato_pilha), já reduzida."""
+        return gramatica_de_automato_pilha(self)
+
+    def reconhecedor(self):
+        """
+        Retorna o ReconhecedorEarley da gramática equivalente, que decide a aceitação em tempo polinomial.
+        A gramática e as tabelas do reconhecedor são reaproveitadas enquanto o autômato não for modificado.
+        """
+        if (self._reconhecedor is None or self._reconhecedor.versao != self.versao
+                or self._pilha_do_reconhecedor != self.simbolo_inicial_pilha):
+            self._reconhecedor = self.para_gramatica().reconhecedor()
+            self._pilha_do_reconhecedor = self.simbolo_inicial_pilha
+        return self._reconhecedor
@@ -0,0 +1,236 @@
+# Arquivo: simulador_de_automatos/automato/binario.py
+"""
+Formato binário compacto (.autb) para os seis tipos de autômato, com leitura via mmap.
+
+Layout (little-endian), na ordem:
+    cabeçalho     CABECALHO (32 bytes): mágico, versão do formato, tipo, contagens, inicial e símbolo extra
+                  (id do símbolo inicial da pilha no AP ou do branco na MT; -1 se não usado,
+                  SEM_SIMBOLO_EXTRA se o AP não tem símbolo inicial)
+    posições      float64 x 2 por estado (x, y)
+    nomes         int32 por estado: id do nome na tabela de cadeias
+    saídas        int32 por estado: id da saída (Moore) ou -1
+    transições    int32 x 5 por transição: (origem, rotulo, destino, campo_a, campo_b)
+                  AFD/AFN/Moore: campos -1; Mealy: campo_a = saída; AP: campo_a = pop, campo_b = push;
+                  MT: campo_a = escrito, campo_b = direção
+    deslocamentos uint32 x (num_cadeias + 1): início de cada cadeia no bloco UTF-8
+    flags         uint8 por estado (bit 0: final)
+    cadeias       bloco UTF-8 com os nomes de estados e símbolos, sem repetição
+"""
+import gc
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from .automato_finito import AFD, AFN
+from .automato_pilha import AutomatoPilha
+from .maquinas_moore_mealy import MaquinaMoore, MaquinaMealy
+from .maquina_turing import MaquinaTuring
+from .afd_compilado import AFDCompilado
+from .afn_compilado import AFNCompilado
+
+EXTENSAO_BINARIO = ".autb"
+MAGICO = b"AUTB"
+VERSAO_FORMATO = 1
+CABECALHO = struct.Struct("<4sHBxiiiii4x") # mágico, versão, tipo, cadeias, estados, transições, inicial, extra
+TIPOS = ["AFD", "AFN", "AP", "Moore", "Mealy", "Turing"] # A posição é o código gravado no cabeçalho
+CLASSES = {"AFD": AFD, "AFN": AFN, "AP": AutomatoPilha, "Moore": MaquinaMoore, "Mealy": MaquinaMealy, "Turing": MaquinaTuring}
+_TIPOS_POR_CLASSE = {classe: tipo for tipo, classe in CLASSES.items()}
+_FINAL = 1
+SEM_SIMBOLO_EXTRA = -2 # 'extra' do AP com simbolo_inicial_pilha None (diferente de -1, campo não usado)
+
+def _little_endian(arr):
+    """Converte (no lugar) um array nativo para little-endian, se a máquina for big-endian."""
+    if sys.byteorder == "big": arr.byteswap()
+    return arr
+
+def salvar_binario(automato, caminho, tipo=None, posicoes=None):
+    """
+    Grava o autômato no formato binário. tipo: tipo do simulador (por padrão, deduzido da classe).
+    posicoes: nome -> (x, y) opcional; por padrão usa as coordenadas dos estados (como salvar_jff).
+    """
+    tipo = tipo or _TIPOS_POR_CLASSE.get(type(automato))
+    if tipo not in CLASSES: raise ValueError(f"Tipo de autômato '{tipo}' não suportado.")
+
+    cadeias = {}
+    def interna(texto):
+        if texto is None: return -1
+        id_cadeia = cadeias.get(texto)
+        if id_cadeia is None: id_cadeia = cadeias[texto] = len(cadeias)
+        return id_cadeia
+
+    ids = {nome: i for i, nome in enumerate(automato.estados)}
+    posicoes = posicoes or {}
+    coordenadas, nomes, saidas, flags = array("d"), array("i"), array("i"), bytearray()
+    for nome, estado in automato.estados.items():
+        x, y = posicoes.get(nome) or (estado.x, estado.y)
+        coordenadas.append(float(x)); coordenadas.append(float(y))
+        nomes.append(interna(nome))
+        saidas.append(interna(estado.output) if tipo == "Moore" and estado.output else -1)
+        flags.append(_FINAL if estado.is_final else 0)
+
+    registros = array("i")
+    def registrar(origem, rotulo, destino, campo_a=-1, campo_b=-1):
+        if origem in ids and destino in ids:
+            registros.extend((ids[origem], interna(rotulo), ids[destino], campo_a, campo_b))
+    for chave, valor in automato.transicoes.items():
+        if tipo in ("AFD", "AFN", "Moore"):
+            for destino in (valor if isinstance(valor, set) else (valor,)): registrar(chave[0], chave[1], destino)
+        elif tipo == "Mealy":
+            registrar(chave[0], chave[1], valor[0], interna(valor[1]))
+        elif tipo == "AP":
+            for destino, s_push in valor: registrar(chave[0], chave[1], destino, interna(chave[2]), interna(s_push))
+        elif tipo == "Turing":
+            registrar(chave[0], chave[1], valor[0], interna(valor[1]), interna(valor[2]))
+
+    extra = -1
+    if tipo == "AP":
+        simbolo = automato.simbolo_inicial_pilha
+        extra = SEM_SIMBOLO_EXTRA if simbolo is None else interna(simbolo)
+    elif tipo == "Turing": extra = interna(automato.simbolo_branco)
+    inicial = ids.get(automato.estado_inicial.nome, -1) if automato.estado_inicial else -1
+
+    blocos = [texto.encode("utf-8") for texto in cadeias] # Dicionários mantêm a ordem de inserção (= ids)
+    deslocamentos = array("I", [0])
+    for bloco in blocos: deslocamentos.append(deslocamentos[-1] + len(bloco))
+
+    with open(caminho, "wb") as arquivo:
+        arquivo.write(CABECALHO.pack(MAGICO, VERSAO_FORMATO, TIPOS.index(tipo), len(cadeias),
+                                     len(ids), len(registros) // 5, inicial, extra))
+        for secao in (coordenadas, nomes, saidas, registros, deslocamentos):
+            arquivo.write(_little_endian(secao).tobytes())
+        arquivo.write(flags)
+        arquivo.write(b"".join(blocos))
+
+
+class _NomesEstados(Sequence):
+    """Sequência preguiçosa dos nomes dos estados: cada nome é decodificado só quando pedido."""
+    def __init__(self, instantaneo):
+        self._instantaneo = instantaneo
+
+    def __len__(self):
+        return self._instantaneo.num_estados
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self): raise IndexError(i)
+        return self._instantaneo.cadeia(self._instantaneo.nomes[i])
+
+
+class InstantaneoBinario:
+    """
+    Arquivo binário aberto via mmap. As seções são lidas direto do buffer (memoryview), então
+    compilar() monta o motor de execução sem criar um Estado por estado; para_automato() materializa
+    o objeto completo (usado pela GUI). O mmap fica aberto enquanto o instantâneo ou o motor forem usados.
+    """
+    def __init__(self, caminho):
+        with open(caminho, "rb") as arquivo:
+            self._mmap = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        if len(buffer) < CABECALHO.size: raise ValueError("Arquivo binário inválido: cabeçalho incompleto.")
+        magico, versao, codigo_tipo, num_cadeias, num_estados, num_transicoes, inicial, extra = CABECALHO.unpack_from(buffer)
+        if magico != MAGICO: raise ValueError("Arquivo binário inválido: assinatura não reconhecida.")
+        if versao != VERSAO_FORMATO: raise ValueError(f"Versão do formato binário não suportada: {versao}.")
+        if codigo_tipo >= len(TIPOS): raise ValueError(f"Tipo de autômato desconhecido no arquivo: {codigo_tipo}.")
+        self.tipo = TIPOS[codigo_tipo]
+        self.num_estados, self.num_transicoes, self.inicial = num_estados, num_transicoes, inicial
+        self._extra = extra
+
+        inicio = CABECALHO.size
+        def secao(formato, quantidade):
+            nonlocal inicio
+            tamanho = quantidade * struct.calcsize(formato)
+            if inicio + tamanho > len(buffer): raise ValueError("Arquivo binário inválido: seção truncada.")
+            dados = buffer[inicio:inicio + tamanho]
+            inicio += tamanho
+            if sys.byteorder == "big": # O arquivo é little-endian: copia e inverte os bytes
+                copia = array(formato, dados.tobytes()); copia.byteswap(); return copia
+            return dados.cast(formato)
+        self.posicoes = secao("d", 2 * num_estados)
+        self.nomes = secao("i", num_estados)
+        self.saidas = secao("i", num_estados)
+        self.transicoes = secao("i", 5 * num_transicoes)
+        self._deslocamentos = secao("I", num_cadeias + 1)
+        self.flags = secao("B", num_estados)
+        self._cadeias_utf8 = buffer[inicio:]
+        self._cache_cadeias = {}
+
+    def cadeia(self, id_cadeia):
+        """Texto da cadeia 'id_cadeia' da tabela (None para -1)."""
+        if id_cadeia < 0: return None
+        texto = self._cache_cadeias.get(id_cadeia)
+        if texto is None:
+            texto = str(self._cadeias_utf8[self._deslocamentos[id_cadeia]:self._deslocamentos[id_cadeia + 1]], "utf-8")
+            self._cache_cadeias[id_cadeia] = texto
+        return texto
+
+    def _finais(self):
+        flags = self.flags
+        return [i for i in range(self.num_estados) if flags[i] & _FINAL]
+
+    def _arestas(self):
+        """(id_origem, rotulo, id_destino) de cada transição, lidos do buffer."""
+        t = self.transicoes
+        return zip(t[0::5], map(self.cadeia, t[1::5]), t[2::5])
+
+    def compilar(self):
+        """
+        Monta o motor de execução direto do buffer: AFDCompilado (AFD) ou AFNCompilado (AFN).
+        Os nomes dos estados só são decodificados quando necessários (AFD) ou uma única vez (AFN).
+        """
+        if self.tipo == "AFD":
+            return AFDCompilado(_NomesEstados(self), self.inicial, self._finais(), self._arestas())
+        if self.tipo == "AFN":
+            return AFNCompilado.de_arestas([self.cadeia(i) for i in self.nomes], self.inicial, self._finais(), self._arestas())
+        raise TypeError(f"Não há motor compilado para o tipo '{self.tipo}'.")
+
+    def para_automato(self):
+        """Materializa o autômato completo (com um Estado por estado), como carregar_jff faria."""
+        tipo = self.tipo
+        automato = MaquinaTuring(simbolo_branco=self.cadeia(self._extra)) if tipo == "Turing" and self._extra >= 0 else CLASSES[tipo]()
+        if tipo == "AP" and self._extra == SEM_SIMBOLO_EXTRA: automato.simbolo_inicial_pilha = None
+        elif tipo == "AP" and self._extra >= 0: automato.simbolo_inicial_pilha = self.cadeia(self._extra)
+
+        nomes = [self.cadeia(i) for i in self.nomes]
+        posicoes = self.posicoes
+        for i, nome in enumerate(nomes):
+            if tipo == "Moore": automato.adicionar_estado(nome, posicoes[2 * i], posicoes[2 * i + 1], output=self.cadeia(self.saidas[i]) or "")
+            else: automato.adicionar_estado(nome, posicoes[2 * i], posicoes[2 * i + 1])
+        if 0 <= self.inicial < len(nomes): automato.definir_estado_inicial(nomes[self.inicial])
+        for i in self._finais(): automato.alternar_estado_final(nomes[i])
+
+        t, cadeia = self.transicoes, self.cadeia
+        for k in range(0, len(t), 5):
+            origem, rotulo, destino = nomes[t[k]], cadeia(t[k + 1]), nomes[t[k + 2]]
+            if tipo in ("AFD", "AFN", "Moore"): automato.adicionar_transicao(origem, rotulo, destino)
+            elif tipo == "Mealy": automato.adicionar_transicao(origem, rotulo, destino, cadeia(t[k + 3]))
+            elif tipo == "AP": automato.adicionar_transicao(origem, rotulo, cadeia(t[k + 3]), destino, cadeia(t[k + 4]))
+            elif tipo == "Turing": automato.adicionar_transicao(origem, rotulo, destino, cadeia(t[k + 3]), cadeia(t[k + 4]))
+        return automato
+
+    def fechar(self):
+        """Libera as visões do buffer e fecha o mmap (o motor compilado de AFD deixa de poder nomear estados)."""
+        for nome in ("posicoes", "nomes", "saidas", "transicoes", "_deslocamentos", "flags", "_cadeias_utf8"):
+            visao = getattr(self, nome)
+            if isinstance(visao, memoryview): visao.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+
+def abrir_binario(caminho):
+    """Abre um arquivo .autb via mmap, sem materializar o autômato (ver InstantaneoBinario)."""
+    return InstantaneoBinario(caminho)
+
+def carregar_binario(caminho):
+    """Lê um arquivo .autb e retorna (tipo, automato), como carregar_jff."""
+    gc_ativo = gc.isenabled()
+    gc.disable() # Como em carregar_jff: a carga não cria ciclos e as coletas só percorreriam o autômato já montado
+    try:
+        with InstantaneoBinario(caminho) as instantaneo:
+            return instantaneo.tipo, instantaneo.para_automato()
+    finally:
+        if gc_ativo: gc.enable()
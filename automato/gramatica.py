@@ -0,0 +1,293 @@
+# Arquivo: simulador_de_automatos/automato/gramatica.py
+import time
+from automato import EPSILON
+
+FUNDO = None # Marcador do fundo da pilha na construção da gramática (nenhum símbolo de pilha é None)
+
+class Gramatica:
+    """
+    Gramática livre de contexto. Não terminais são inteiros (índices em 'nomes'), terminais são strings.
+    producoes[A] é a lista de corpos de A (tuplas de símbolos); o corpo vazio () representa A -> ε.
+    """
+    def __init__(self):
+        self.nomes = []
+        self.producoes = []
+        self.inicial = None
+        self.versao = None # Versão do autômato de origem, quando a gramática vem de uma conversão
+
+    def novo_nao_terminal(self, nome):
+        self.nomes.append(nome)
+        self.producoes.append([])
+        return len(self.nomes) - 1
+
+    def adicionar_producao(self, cabeca, corpo):
+        self.producoes[cabeca].append(tuple(corpo))
+
+    def __len__(self):
+        """Número de produções."""
+        return sum(map(len, self.producoes))
+
+    def __str__(self):
+        def simbolo(s): return self.nomes[s] if type(s) is int else s
+        linhas = []
+        for cabeca in self._alcancaveis():
+            corpos = (" ".join(map(simbolo, corpo)) or EPSILON for corpo in self.producoes[cabeca])
+            linhas.append(f"{self.nomes[cabeca]} -> {' | '.join(corpos)}")
+        return "\n".join(linhas)
+
+    def _alcancaveis(self):
+        """Não terminais alcançáveis a partir do inicial, na ordem em que são encontrados."""
+        if self.inicial is None: return []
+        vistos = {self.inicial}
+        ordem = [self.inicial]
+        for cabeca in ordem: # 'ordem' cresce durante o laço (busca em largura)
+            for corpo in self.producoes[cabeca]:
+                for s in corpo:
+                    if type(s) is int and s not in vistos:
+                        vistos.add(s); ordem.append(s)
+        return ordem
+
+    def produtivos(self):
+        """Conjunto dos não terminais que derivam alguma cadeia de terminais (ponto fixo)."""
+        produtivos = set()
+        # Para cada produção, quantos não terminais do corpo ainda não são produtivos
+        pendentes = []
+        usos = [[] for _ in self.nomes] # não terminal -> produções em que aparece no corpo
+        fila = []
+        for cabeca, corpos in enumerate(self.producoes):
+            for corpo in corpos:
+                indice = len(pendentes)
+                nts = {s for s in corpo if type(s) is int}
+                pendentes.append([cabeca, len(nts)])
+                for s in nts: usos[s].append(indice)
+                if not nts: fila.append(cabeca)
+        while fila:
+            cabeca = fila.pop()
+            if cabeca in produtivos: continue
+            produtivos.add(cabeca)
+            for indice in usos[cabeca]:
+                pendente = pendentes[indice]
+                pendente[1] -= 1
+                if pendente[1] == 0: fila.append(pendente[0])
+        return produtivos
+
+    def reduzida(self):
+        """
+        Retorna uma gramática equivalente sem símbolos inúteis (improdutivos ou inalcançáveis),
+        com os não terminais renumerados na ordem em que são alcançados a partir do inicial.
+        """
+        produtivos = self.produtivos()
+        nova = Gramatica()
+        nova.versao = self.versao
+        if self.inicial not in produtivos:
+            nova.inicial = nova.novo_nao_terminal(self.nomes[self.inicial] if self.inicial is not None else "S")
+            return nova # Linguagem vazia: só o inicial, sem produções
+
+        novo_id = {}
+        def mapear(s):
+            if type(s) is not int: return s
+            if s not in novo_id:
+                novo_id[s] = nova.novo_nao_terminal(self.nomes[s])
+                fila.append(s)
+            return novo_id[s]
+        fila = []
+        nova.inicial = mapear(self.inicial)
+        for cabeca in fila: # 'fila' cresce durante o laço
+            destino = novo_id[cabeca]
+            for corpo in self.producoes[cabeca]:
+                if all(type(s) is not int or s in produtivos for s in corpo):
+                    nova.adicionar_producao(destino, [mapear(s) for s in corpo])
+        return nova
+
+    def reconhecedor(self):
+        return ReconhecedorEarley(self)
+
+
+def gramatica_de_automato_pilha(ap):
+    """
+    Constrói uma gramática livre de contexto equivalente ao AP (aceitação por estado final após consumir a cadeia,
+    com a mesma semântica do SimuladorAP). Construção das triplas, com um marcador de fundo abaixo da pilha inicial:
+      [q,X,r]  deriva w se, de q com X no topo, o AP consome w e chega em r tendo desempilhado X;
+      <q,X>    deriva w se, de q com X no topo, o AP consome w e chega a um estado final sem desempilhar X.
+    Transições que não desempilham viram uma por símbolo de pilha (desempilham X e o empilham de volta).
+    Empilhamentos de vários símbolos usam não terminais intermediários, para que o número de produções
+    fique em O(|Q|³) por transição em vez de O(|Q|^k). Só a parte alcançável é gerada e a gramática
+    devolvida já está reduzida. Rótulos de entrada com vários caracteres são ignorados, como no SimuladorAP.
+    """
+    gramatica = Gramatica()
+    gramatica.versao = ap.versao
+    if not ap.estado_inicial: # Linguagem vazia
+        gramatica.inicial = gramatica.novo_nao_terminal("S")
+        return gramatica
+
+    estados = list(ap.estados)
+    finais = {e.nome for e in ap.estados_finais}
+    inicial_pilha = ap.simbolo_inicial_pilha or None
+
+    # Alfabeto de pilha: símbolo inicial, caracteres empilhados e o fundo
+    simbolos_pilha = {FUNDO}
+    if inicial_pilha: simbolos_pilha.add(inicial_pilha)
+    for destinos in ap.transicoes.values():
+        for _, s_push in destinos:
+            if s_push != EPSILON: simbolos_pilha.update(s_push)
+
+    # Transições normalizadas, sempre desempilhando exatamente um símbolo: (origem, topo) -> [(entrada, destino, empilhados)]
+    # 'entrada' é () para ε ou (símbolo,); 'empilhados' tem o novo topo primeiro
+    normalizadas = {}
+    for (origem, s_in, s_pop), destinos in ap.transicoes.items():
+        if s_in != EPSILON and len(s_in) != 1: continue
+        entrada = () if s_in == EPSILON else (s_in,)
+        for destino, s_push in destinos:
+            empilhados = () if s_push == EPSILON else tuple(s_push)
+            if s_pop != EPSILON:
+                normalizadas.setdefault((origem, s_pop), []).append((entrada, destino, empilhados))
+            else:
+                for topo in simbolos_pilha:
+                    normalizadas.setdefault((origem, topo), []).append((entrada, destino, empilhados + (topo,)))
+
+    ids = {}
+    pendentes = []
+    def nao_terminal(chave):
+        nt = ids.get(chave)
+        if nt is None:
+            nt = ids[chave] = gramatica.novo_nao_terminal(_nome(chave))
+            pendentes.append(chave)
+        return nt
+
+    def corpo_desempilha(p, simbolos, r):
+        """Corpo que desempilha 'simbolos' indo de p a r (None se impossível)."""
+        if not simbolos: return () if p == r else None
+        if len(simbolos) == 1: return (nao_terminal(("T", p, simbolos[0], r)),)
+        return (nao_terminal(("C", p, simbolos, r)),)
+
+    def corpo_aceita(p, simbolos):
+        """Corpo que, de p com 'simbolos' no topo, aceita sem descer abaixo deles (None se impossível)."""
+        if not simbolos: return () if p in finais else None
+        if len(simbolos) == 1: return (nao_terminal(("A", p, simbolos[0])),)
+        return (nao_terminal(("B", p, simbolos)),)
+
+    def adicionar(cabeca, corpo):
+        if corpo is not None: gramatica.adicionar_producao(cabeca, corpo)
+
+    pilha_inicial = (inicial_pilha, FUNDO) if inicial_pilha else (FUNDO,)
+    gramatica.inicial = gramatica.novo_nao_terminal("S")
+    adicionar(gramatica.inicial, corpo_aceita(ap.estado_inicial.nome, pilha_inicial))
+
+    while pendentes:
+        chave = pendentes.pop()
+        cabeca = ids[chave]
+        tipo = chave[0]
+        if tipo == "T": # [q,X,r]
+            _, q, topo, r = chave
+            for entrada, p, empilhados in normalizadas.get((q, topo), ()):
+                corpo = corpo_desempilha(p, empilhados, r)
+                if corpo is not None: adicionar(cabeca, entrada + corpo)
+        elif tipo == "A": # <q,X>
+            _, q, topo = chave
+            if q in finais: adicionar(cabeca, ())
+            for entrada, p, empilhados in normalizadas.get((q, topo), ()):
+                corpo = corpo_aceita(p, empilhados)
+                if corpo is not None: adicionar(cabeca, entrada + corpo)
+        elif tipo == "C": # Desempilha Y1..Yk de p até r
+            _, p, simbolos, r = chave
+            for s in estados:
+                resto = corpo_desempilha(s, simbolos[1:], r)
+                if resto is not None: adicionar(cabeca, (nao_terminal(("T", p, simbolos[0], s)),) + resto)
+        else: # "B": aceita com Y1..Yk no topo, sem descer abaixo deles
+            _, p, simbolos = chave
+            adicionar(cabeca, corpo_aceita(p, simbolos[:1]))
+            for s in estados:
+                resto = corpo_aceita(s, simbolos[1:])
+                if resto is not None: adicionar(cabeca, (nao_terminal(("T", p, simbolos[0], s)),) + resto)
+
+    return gramatica.reduzida()
+
+def _nome(chave):
+    def simbolo(x): return "⊥" if x is FUNDO else x
+    tipo = chave[0]
+    if tipo == "T": return f"[{chave[1]},{simbolo(chave[2])},{chave[3]}]"
+    if tipo == "A": return f"<{chave[1]},{simbolo(chave[2])}>"
+    pilha = "".join(map(simbolo, chave[2]))
+    if tipo == "C": return f"[{chave[1]},{pilha},{chave[3]}]"
+    return f"<{chave[1]},{pilha}>"
+
+
+class ReconhecedorEarley:
+    """
+    Reconhecedor de Earley (O(n³) no pior caso, O(n²) para gramáticas não ambíguas) com o tratamento de
+    produções vazias de Aycock e Horspool. As tabelas da gramática (produções por cabeça, anuláveis) são
+    calculadas uma vez; cada consulta só paga a análise da cadeia.
+    """
+    def __init__(self, gramatica):
+        self.versao = gramatica.versao
+        self.inicial = gramatica.inicial
+        self.cabecas = []
+        self.corpos = []
+        self.por_cabeca = []
+        for cabeca, corpos in enumerate(gramatica.producoes):
+            ids_producoes = []
+            for corpo in corpos:
+                ids_producoes.append(len(self.corpos))
+                self.cabecas.append(cabeca)
+                self.corpos.append(corpo)
+            self.por_cabeca.append(tuple(ids_producoes))
+        self.anulaveis = self._anulaveis(gramatica)
+
+    @staticmethod
+    def _anulaveis(gramatica):
+        anulaveis = set()
+        mudou = True
+        while mudou:
+            mudou = False
+            for cabeca, corpos in enumerate(gramatica.producoes):
+                if cabeca not in anulaveis and any(all(s in anulaveis for s in corpo) for corpo in corpos):
+                    anulaveis.add(cabeca); mudou = True
+        return anulaveis
+
+    def reconhecer(self, cadeia, prazo=None):
+        """
+        Retorna (aceita, consumidos): 'consumidos' é o tamanho do maior prefixo da cadeia que ainda pode ser
+        continuado em alguma cadeia da linguagem (igual a len(cadeia) quando a análise chega ao fim).
+        prazo: instante (time.perf_counter) depois do qual a análise desiste com TimeoutError, conferido a cada símbolo.
+        """
+        corpos, cabecas, por_cabeca, anulaveis = self.corpos, self.cabecas, self.por_cabeca, self.anulaveis
+        inicial = self.inicial
+        esperando = [] # esperando[i][A]: itens do conjunto i com o ponto antes do não terminal A
+        atual = {(p, 0, 0) for p in por_cabeca[inicial]}
+        n = len(cadeia)
+        for i in range(n + 1):
+            if prazo is not None and time.perf_counter() > prazo:
+                raise TimeoutError(f"Análise interrompida após {i} símbolos (limite de tempo).")
+            simbolo = cadeia[i] if i < n else None
+            esperando_i = {}
+            esperando.append(esperando_i)
+            proximo = set()
+            agenda = list(atual)
+            while agenda:
+                producao, ponto, origem = agenda.pop()
+                corpo = corpos[producao]
+                if ponto == len(corpo): # Completa: avança quem esperava pela cabeça no conjunto de origem
+                    for p2, d2, o2 in esperando[origem].get(cabecas[producao], ()):
+                        item = (p2, d2 + 1, o2)
+                        if item not in atual: atual.add(item); agenda.append(item)
+                    continue
+                x = corpo[ponto]
+                if type(x) is int: # Prediz
+                    lista = esperando_i.get(x)
+                    if lista is None:
+                        esperando_i[x] = lista = []
+                        for p in por_cabeca[x]:
+                            item = (p, 0, i)
+                            if item not in atual: atual.add(item); agenda.append(item)
+                    lista.append((producao, ponto, origem))
+                    if x in anulaveis: # Aycock-Horspool: pula o não terminal anulável
+                        item = (producao, ponto + 1, origem)
+                        if item not in atual: atual.add(item); agenda.append(item)
+                elif x == simbolo: # Lê
+                    proximo.add((producao, ponto + 1, origem))
+            if i == n:
+                aceita = any(o == 0 and cabecas[p] == inicial and d == len(corpos[p]) for p, d, o in atual)
+                return aceita, n
+            if not proximo: return False, i
+            atual = proximo
+        return False, n # Não alcançado
@@ -0,0 +1,253 @@
+# Arquivo: simulador_de_automatos/automato/jff.py
+import gc
+import time
+import xml.etree.ElementTree as ET
+from itertools import chain
+from .automato_finito import AFD, AFN
+from .automato_pilha import AutomatoPilha
+from .maquinas_moore_mealy import MaquinaMoore, MaquinaMealy
+from .maquina_turing import MaquinaTuring
+from automato import EPSILON
+
+# Tipos do simulador (os mesmos nomes usados na GUI) e suas classes
+CLASSES_POR_TIPO = {
+    "AFD": AFD, "AFN": AFN, "AP": AutomatoPilha,
+    "Moore": MaquinaMoore, "Mealy": MaquinaMealy, "Turing": MaquinaTuring,
+}
+TIPOS_POR_CLASSE = {classe: tipo for tipo, classe in CLASSES_POR_TIPO.items()}
+TIPOS_JFLAP = {"AFD": "fa", "AFN": "fa", "AP": "pda", "Moore": "mealy", "Mealy": "mealy", "Turing": "turing"}
+
+def _promover(automato, classe):
+    """
+    Troca a classe de um autômato finito em construção (AFD -> AFN, Moore -> Mealy),
+    reaproveitando os estados e índices já montados em vez de recarregar o arquivo.
+    """
+    novo = classe()
+    novo.estados = automato.estados
+    novo.estado_inicial = automato.estado_inicial
+    novo.estados_finais = automato.estados_finais
+    novo.alfabeto = automato.alfabeto
+    novo.rotulos_por_origem = automato.rotulos_por_origem
+    if classe is AFN: novo.transicoes = {chave: {destino} for chave, destino in automato.transicoes.items()}
+    else: novo.transicoes = automato.transicoes
+    novo.versao = automato.versao + 1
+    return novo
+
+def carregar_jff(origem, estatisticas=None):
+    """
+    Lê um arquivo JFLAP (.jff) a partir de um caminho ou objeto arquivo.
+    Retorna (tipo, automato), onde tipo é "AFD", "AFN", "AP", "Moore", "Mealy" ou "Turing".
+    Um 'fa' com transições épsilon ou repetidas para o mesmo (estado, símbolo) é carregado como AFN.
+    A leitura é incremental (ET.iterparse): cada <state>/<transition> vira parte do autômato e é descartado
+    em seguida, então a memória usada acompanha o tamanho do autômato, não o da árvore XML.
+    Se 'estatisticas' (dict) for informado, recebe elementos (filhos de <automaton>), segundos e elementos_por_segundo.
+    Lança ValueError para arquivos JFF inválidos e ET.ParseError para XML malformado.
+    """
+    inicio = time.perf_counter()
+    # A carga só cria objetos sem ciclos; com o coletor ativo, cada coleta percorreria o autômato inteiro
+    # já montado e, em arquivos grandes, isso custa tanto quanto a própria leitura
+    gc_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        tipo, automato, elementos = _ler_jff(origem)
+    finally:
+        if gc_ativo: gc.enable()
+
+    if estatisticas is not None:
+        segundos = time.perf_counter() - inicio
+        estatisticas.update(elementos=elementos, segundos=segundos,
+                            elementos_por_segundo=elementos / segundos if segundos > 0 else float("inf"))
+    return tipo, automato
+
+def _eventos(origem):
+    """
+    Eventos ("start"/"end", elemento) do ET.iterparse, com o <type> sempre antes do <automaton>.
+    O JFLAP escreve o <type> primeiro, mas a ordem dos filhos de <structure> é livre: se o <automaton> vier antes,
+    os eventos dele são guardados e repetidos logo depois do <type> (só nesse caso a árvore fica inteira na memória).
+    Lê adiantado só até o fim do <type>; o resto vem direto do iterparse, pelo chain, sem custo por evento.
+    """
+    eventos = ET.iterparse(origem, events=("start", "end"))
+    antes = []
+    adiados = [] # Eventos do <automaton> lido antes do <type>
+    profundidade = 0
+    for evento, elem in eventos:
+        if evento == "start":
+            profundidade += 1
+            nivel = profundidade
+        else:
+            nivel = profundidade
+            profundidade -= 1
+        if nivel == 2 and elem.tag == "type":
+            antes.append((evento, elem))
+            if evento == "end": return chain(antes, adiados, eventos)
+        elif adiados or (evento == "start" and nivel == 2 and elem.tag == "automaton"): adiados.append((evento, elem))
+        else: antes.append((evento, elem))
+    return chain(antes, adiados) # Sem <type>: a leitura acusa o erro ao chegar no <automaton>
+
+def _ler_jff(origem):
+    """Laço de leitura de carregar_jff. Retorna (tipo, automato, elementos lidos)."""
+    tipo = automato = None
+    automaton_node = None
+    profundidade = 0
+    elementos = 0
+
+    id_to_name = {}
+    usados = set()
+    contador = 0
+    tem_output = False # Algum estado com <output>: um 'mealy' do JFLAP é na verdade Moore
+    vistas = set() # (from, read) já vistos enquanto o 'fa' ainda parece AFD
+    pendentes = [] # Transições adiadas: estados ainda não lidos, ou 'mealy' antes de decidir entre Moore e Mealy
+
+    def adicionar_transicao(trans):
+        from_name = id_to_name.get(trans[0])
+        to_name = id_to_name.get(trans[1])
+        if not from_name or not to_name: return False
+        if tipo in ("AFD", "AFN", "Moore"): automato.adicionar_transicao(from_name, trans[2], to_name)
+        elif tipo == "AP": automato.adicionar_transicao(from_name, trans[2], trans[3], to_name, trans[4])
+        elif tipo == "Mealy": automato.adicionar_transicao(from_name, trans[2], to_name, trans[3])
+        elif tipo == "Turing": automato.adicionar_transicao(from_name, trans[2], to_name, trans[3], trans[4])
+        return True
+
+    for evento, elem in _eventos(origem):
+        if evento == "start":
+            profundidade += 1
+            if profundidade == 2 and elem.tag == "automaton":
+                if automato is None: raise ValueError("Arquivo JFF inválido: tag <type> não encontrada.")
+                automaton_node = elem
+            continue
+        profundidade -= 1
+        if profundidade != 2: # Só interessam <type> e os filhos diretos de <automaton>
+            if profundidade == 1 and elem.tag == "type": # 1. Tipo do autômato
+                jflap_type = (elem.text or "").strip().lower()
+                if jflap_type == "fa": tipo = "AFD" # Pode virar AFN ao longo da leitura
+                elif jflap_type == "pda": tipo = "AP"
+                elif jflap_type == "turing": tipo = "Turing"
+                elif jflap_type == "mealy": tipo = "Moore" # Decidido no fim, conforme os estados tenham <output>
+                else: raise ValueError(f"Tipo de autômato JFLAP '{jflap_type}' não suportado.")
+                automato = CLASSES_POR_TIPO[tipo]()
+            continue
+        if automaton_node is None: continue
+        elementos += 1
+        tag = elem.tag
+
+        if tag == "transition": # 3. Transições
+            origem_id = elem.findtext("from"); destino_id = elem.findtext("to")
+            if tipo == "AFD" or tipo == "AFN":
+                simbolo = elem.findtext("read") or EPSILON
+                if tipo == "AFD":
+                    chave = (origem_id, simbolo)
+                    if simbolo == EPSILON or chave in vistas:
+                        tipo = "AFN"; automato = _promover(automato, AFN); vistas = None
+                    else: vistas.add(chave)
+                from_name = id_to_name.get(origem_id); to_name = id_to_name.get(destino_id)
+                if from_name and to_name: automato.adicionar_transicao(from_name, simbolo, to_name) # Caso mais comum, sem tupla intermediária
+                else: pendentes.append((origem_id, destino_id, simbolo))
+                automaton_node.clear()
+                continue
+            elif tipo == "AP":
+                trans = (origem_id, destino_id, elem.findtext("read") or EPSILON, elem.findtext("pop") or EPSILON, elem.findtext("push") or EPSILON)
+            elif tipo == "Turing":
+                branco = automato.simbolo_branco
+                trans = (origem_id, destino_id, elem.findtext("read") or branco, elem.findtext("write") or branco, elem.findtext("move") or "R")
+            else: # 'mealy': ainda não se sabe se é Moore ou Mealy, então guarda os dois formatos para o fim
+                trans = (origem_id, destino_id, elem.findtext("read") or EPSILON, elem.findtext("transout") or EPSILON)
+            if tipo == "Moore" or not adicionar_transicao(trans): pendentes.append(trans)
+
+        elif tag == "state": # 2. Estados (nomes ausentes ou repetidos viram q0, q1, ...)
+            state_id = elem.get("id"); state_name = elem.get("name")
+            if not state_name: state_name = f"q{contador}"
+            while state_name in usados:
+                contador += 1; state_name = f"q{contador}"
+            usados.add(state_name)
+            id_to_name[state_id] = state_name
+            x_texto = elem.findtext("x"); y_texto = elem.findtext("y")
+            x_pos = float(x_texto) if x_texto else (50.0 + int(state_id) * 80)
+            y_pos = float(y_texto) if y_texto else 50.0
+            if tipo == "Moore":
+                output = elem.findtext("output")
+                if output is not None: tem_output = True
+                automato.adicionar_estado(state_name, x_pos, y_pos, output=output or "")
+            else: automato.adicionar_estado(state_name, x_pos, y_pos)
+            if elem.find("initial") is not None: automato.definir_estado_inicial(state_name)
+            if elem.find("final") is not None: automato.alternar_estado_final(state_name)
+
+        automaton_node.clear() # Descarta o elemento já processado (e os anteriores)
+
+    if automato is None: raise ValueError("Arquivo JFF inválido: tag <type> não encontrada.")
+    if automaton_node is None: raise ValueError("Arquivo JFF inválido: tag <automaton> não encontrada.")
+    if tipo == "Moore" and not tem_output:
+        tipo = "Mealy"; automato = _promover(automato, MaquinaMealy)
+    for trans in pendentes: adicionar_transicao(trans)
+    return tipo, automato, elementos
+
+
+def salvar_jff(automato, destino, tipo=None, posicoes=None):
+    """
+    Escreve o autômato no formato JFLAP (.jff) em 'destino' (caminho ou objeto arquivo de texto).
+    O XML é gerado em fluxo, elemento a elemento, sem montar a árvore na memória.
+    tipo: tipo do simulador (por padrão, deduzido da classe do autômato).
+    posicoes: nome -> (x, y) opcional; por padrão usa as coordenadas dos estados.
+    """
+    tipo = tipo or TIPOS_POR_CLASSE.get(type(automato))
+    if tipo not in TIPOS_JFLAP: raise ValueError(f"Tipo de autômato '{tipo}' não suportado.")
+    if isinstance(destino, str):
+        with open(destino, "w", encoding="utf-8") as arquivo:
+            _escrever_jff(automato, arquivo, tipo, posicoes or {})
+    else:
+        _escrever_jff(automato, destino, tipo, posicoes or {})
+
+def _escapar(texto):
+    """Escapa texto para XML (também serve para atributos entre aspas duplas)."""
+    return texto.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+def _elemento(nome, texto):
+    """Linha de um elemento simples; texto vazio (ε, branco) vira a tag vazia, como no JFLAP."""
+    return f"      <{nome}>{_escapar(texto)}</{nome}>\n" if texto else f"      <{nome}/>\n"
+
+def _escrever_jff(automato, arquivo, tipo, posicoes):
+    escrever = arquivo.write
+    escrever('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n')
+    escrever(f"<structure>\n  <type>{TIPOS_JFLAP[tipo]}</type>\n  <automaton>\n")
+
+    state_to_id = {name: str(i) for i, name in enumerate(automato.estados)}
+    for name, estado in automato.estados.items():
+        x_pos, y_pos = posicoes.get(name) or (estado.x, estado.y)
+        escrever(f"    <state id=\"{state_to_id[name]}\" name=\"{_escapar(name)}\">\n")
+        escrever(f"      <x>{float(x_pos)}</x>\n      <y>{float(y_pos)}</y>\n")
+        if estado.is_inicial: escrever("      <initial/>\n")
+        if estado.is_final: escrever("      <final/>\n")
+        if tipo == "Moore" and estado.output: escrever(_elemento("output", estado.output))
+        escrever("    </state>\n")
+
+    def transicao(origem, destino, *campos):
+        """campos: pares (tag, texto), já com ε/branco trocados por ''."""
+        escrever(f"    <transition>\n      <from>{origem}</from>\n      <to>{destino}</to>\n")
+        for nome, texto in campos: escrever(_elemento(nome, texto))
+        escrever("    </transition>\n")
+
+    def texto(simbolo, vazio=EPSILON):
+        return "" if simbolo == vazio else simbolo
+
+    for chave, valor in automato.transicoes.items():
+        origem_id = state_to_id.get(chave[0])
+        if origem_id is None: continue
+        if tipo in ("AFD", "AFN", "Moore"):
+            for destino in (valor if isinstance(valor, set) else {valor}):
+                if destino in state_to_id: transicao(origem_id, state_to_id[destino], ("read", texto(chave[1])))
+        elif tipo == "AP":
+            _, s_in, s_pop = chave
+            for destino, s_push in valor:
+                if destino in state_to_id:
+                    transicao(origem_id, state_to_id[destino], ("read", texto(s_in)), ("pop", texto(s_pop)), ("push", texto(s_push)))
+        elif tipo == "Mealy":
+            destino, output = valor
+            if destino in state_to_id:
+                transicao(origem_id, state_to_id[destino], ("read", texto(chave[1])), ("transout", texto(output)))
+        elif tipo == "Turing":
+            destino, escrito, direcao = valor
+            branco = automato.simbolo_branco
+            if destino in state_to_id:
+                transicao(origem_id, state_to_id[destino], ("read", texto(chave[1], branco)),
+                          ("write", texto(escrito, branco)), ("move", direcao))
+
+    escrever("  </automaton>\n</structure>\n")
@@ -14,6 +14,8 @@ class MaquinaTuring:
         self.estado_inicial = None
         self.estados_finais = set()
         self.simbolo_branco = simbolo_branco
+        # Contador de modificações: toda edição incrementa, invalidando o que foi calculado a partir da máquina
+        self.versao = 0
 
     def adicionar_estado(self, nome, x, y, is_final=False, is_inicial=False):
         if nome in self.estados:
@@ -21,6 +23,7 @@ class MaquinaTuring:
         # Reutiliza o objeto Estado (sem output)
         novo_estado = Estado(nome, x, y, is_final, is_inicial)
         self.estados[nome] = novo_estado
+        self.versao += 1
         if is_inicial:
             self.definir_estado_inicial(nome)
         if is_final:
@@ -37,6 +40,7 @@ class MaquinaTuring:
             raise ValueError("Direção deve ser 'R' ou 'L'.")
 
         self.transicoes[(origem, lido)] = (destino, escrito, direcao)
+        self.versao += 1
 
     def definir_estado_inicial(self, nome_estado):
         if nome_estado not in self.estados:
@@ -51,6 +55,7 @@ class MaquinaTuring:
                         break
         self.estado_inicial = self.estados[nome_estado]
         self.estados[nome_estado].is_inicial = True
+        self.versao += 1
 
     def alternar_estado_final(self, nome_estado):
         if nome_estado in self.estados:
@@ -60,6 +65,7 @@ class MaquinaTuring:
                 self.estados_finais.add(estado)
             elif estado in self.estados_finais:
                 self.estados_finais.remove(estado)
+            self.versao += 1
 
     def renomear_estado(self, nome_antigo, nome_novo):
         if nome_novo in self.estados and nome_antigo != nome_novo:
@@ -67,6 +73,7 @@ class MaquinaTuring:
         if nome_antigo not in self.estados:
             raise ValueError(f"Estado '{nome_antigo}' não encontrado.")
 
+        self.versao += 1
         estado_obj = self.estados.pop(nome_antigo)
         estado_obj.nome = nome_novo
         self.estados[nome_novo] = estado_obj
@@ -85,6 +92,7 @@ class MaquinaTuring:
     def deletar_estado(self, nome_estado):
         if nome_estado not in self.estados: return
         estado_a_deletar = self.estados[nome_estado]
+        self.versao += 1
 
         novas_transicoes = {}
         for chave, (destino, escrito, direcao) in self.transicoes.items():
@@ -99,6 +107,7 @@ class MaquinaTuring:
         del self.estados[nome_estado]
 
     def deletar_transicoes_entre(self, origem, destino):
+        self.versao += 1
         chaves_para_remover = []
         for chave, (d_real, esc, dir) in self.transicoes.items():
             o_real, s = chave
@@ -107,4 +116,90 @@ class MaquinaTuring:
 
         for chave in chaves_para_remover:
             if chave in self.transicoes:
-                del self.transicoes[chave]
\ No newline at end of file
+                del self.transicoes[chave]
+
+DIRECOES_MULTIFITA = ("R", "L", "S") # 'S': o cabeçote fica parado
+
+class MaquinaTuringMultifita(MaquinaTuring):
+    """
+    Máquina de Turing determinística com k fitas, cada uma com seu cabeçote.
+    transicoes: (origem, lidos) -> (destino, escritos, direcoes), onde lidos, escritos e direcoes são tuplas
+    com um item por fita. A entrada fica na primeira fita; as demais começam em branco.
+    """
+    def __init__(self, num_fitas=2, simbolo_branco='☐'):
+        if num_fitas < 1: raise ValueError("A máquina precisa de pelo menos uma fita.")
+        super().__init__(simbolo_branco)
+        self.num_fitas = num_fitas
+
+    def _validar_transicao(self, origem, lidos, destino, escritos, direcoes):
+        """Confere a transição e a devolve como tuplas (lidos, escritos, direcoes)."""
+        if origem not in self.estados or destino not in self.estados:
+            raise ValueError("Estado de origem ou destino inválido.")
+        lidos, escritos, direcoes = tuple(lidos), tuple(escritos), tuple(direcoes)
+        if not len(lidos) == len(escritos) == len(direcoes) == self.num_fitas:
+            raise ValueError(f"A transição precisa de um símbolo lido, um escrito e uma direção para cada uma das {self.num_fitas} fitas.")
+        if any(direcao not in DIRECOES_MULTIFITA for direcao in direcoes):
+            raise ValueError("Direção deve ser 'R', 'L' ou 'S'.")
+        return lidos, escritos, direcoes
+
+    def adicionar_transicao(self, origem, lidos, destino, escritos, direcoes):
+        """Adiciona (ou substitui, pois a máquina é determinística) a transição de (origem, lidos)."""
+        lidos, escritos, direcoes = self._validar_transicao(origem, lidos, destino, escritos, direcoes)
+        self.transicoes[(origem, lidos)] = (destino, escritos, direcoes)
+        self.versao += 1
+
+
+class MaquinaTuringND(MaquinaTuringMultifita):
+    """
+    Máquina de Turing não determinística com k fitas (1 por padrão).
+    transicoes: (origem, lidos) -> set((destino, escritos, direcoes)); cada escolha abre um ramo na simulação.
+    """
+    def __init__(self, num_fitas=1, simbolo_branco='☐'):
+        super().__init__(num_fitas, simbolo_branco)
+
+    def adicionar_transicao(self, origem, lidos, destino, escritos, direcoes):
+        lidos, escritos, direcoes = self._validar_transicao(origem, lidos, destino, escritos, direcoes)
+        chave = (origem, lidos)
+        if chave not in self.transicoes: self.transicoes[chave] = set()
+        self.transicoes[chave].add((destino, escritos, direcoes))
+        self.versao += 1
+
+    def renomear_estado(self, nome_antigo, nome_novo):
+        if nome_novo in self.estados and nome_antigo != nome_novo:
+            raise ValueError(f"O nome '{nome_novo}' já está em uso.")
+        if nome_antigo not in self.estados:
+            raise ValueError(f"Estado '{nome_antigo}' não encontrado.")
+
+        self.versao += 1
+        estado_obj = self.estados.pop(nome_antigo)
+        estado_obj.nome = nome_novo
+        self.estados[nome_novo] = estado_obj
+
+        trocar = lambda nome: nome_novo if nome == nome_antigo else nome
+        self.transicoes = {(trocar(origem), lidos): {(trocar(destino), escritos, direcoes) for destino, escritos, direcoes in escolhas}
+                           for (origem, lidos), escolhas in self.transicoes.items()}
+
+        if self.estado_inicial and self.estado_inicial.nome == nome_novo:
+            self.estado_inicial = estado_obj
+
+    def deletar_estado(self, nome_estado):
+        if nome_estado not in self.estados: return
+        estado_a_deletar = self.estados[nome_estado]
+        self.versao += 1
+
+        novas_transicoes = {}
+        for (origem, lidos), escolhas in self.transicoes.items():
+            if origem == nome_estado: continue
+            restantes = {escolha for escolha in escolhas if escolha[0] != nome_estado}
+            if restantes: novas_transicoes[(origem, lidos)] = restantes
+        self.transicoes = novas_transicoes
+
+        if self.estado_inicial and self.estado_inicial.nome == nome_estado: self.estado_inicial = None
+        if estado_a_deletar in self.estados_finais: self.estados_finais.remove(estado_a_deletar)
+        del self.estados[nome_estado]
+
+    def deletar_transicoes_entre(self, origem, destino):
+        self.versao += 1
+        for chave in [chave for chave in self.transicoes if chave[0] == origem]:
+            self.transicoes[chave] = {escolha for escolha in self.transicoes[chave] if escolha[0] != destino}
+            if not self.transicoes[chave]: del self.transicoes[chave]
@@ -1,5 +1,6 @@
 # Arquivo: simulador_de_automatos/automato/maquinas_moore_mealy.py
 from .automato_finito import AutomatoFinito
+from .minimizacao import minimizar_deterministico
 from .estado import Estado
 from automato import EPSILON
 
@@ -19,6 +20,7 @@ class MaquinaMoore(AutomatoFinito):
         # Note que o output é passado para o objeto Estado
         novo_estado = Estado(nome, x, y, is_final, is_inicial, output=output)
         self.estados[nome] = novo_estado
+        self.versao += 1
         if is_inicial:
             self.definir_estado_inicial(nome)
         if is_final:
@@ -30,8 +32,10 @@ class MaquinaMoore(AutomatoFinito):
         (origem, simbolo) -> destino
         """
         if origem in self.estados and destino in self.estados:
+            if (origem, simbolo) not in self.transicoes: self._indexar_rotulo(origem, simbolo)
             self.transicoes[(origem, simbolo)] = destino
             if simbolo != EPSILON: self.alfabeto.add(simbolo)
+            self.versao += 1
     
     def set_output_estado(self, nome_estado, output):
         """
@@ -40,6 +44,15 @@ class MaquinaMoore(AutomatoFinito):
         if nome_estado not in self.estados:
             raise ValueError(f"Estado '{nome_estado}' não encontrado.")
         self.estados[nome_estado].output = output
+        self.versao += 1
+
+    def minimizar(self):
+        """
+        Retorna uma nova Máquina de Moore mínima equivalente (Hopcroft).
+        Os estados são particionados inicialmente pela saída (Estado.output); como a máquina
+        emite saída em todo estado, nenhum estado é descartado por "não aceitar".
+        """
+        return minimizar_deterministico(self, MaquinaMoore(), lambda estado: (estado.is_final, estado.output or ""), sumidouro_separado=True)
 
 
 # -----------------
@@ -55,8 +68,10 @@ class MaquinaMealy(AutomatoFinito):
         (origem, simbolo) -> (destino, output)
         """
         if origem in self.estados and destino in self.estados:
+            if (origem, simbolo) not in self.transicoes: self._indexar_rotulo(origem, simbolo)
             self.transicoes[(origem, simbolo)] = (destino, output)
             if simbolo != EPSILON: self.alfabeto.add(simbolo)
+            self.versao += 1
     
     # --- Overrides para lidar com o formato de transição (destino, output) ---
     
@@ -69,6 +84,7 @@ class MaquinaMealy(AutomatoFinito):
         estado_obj = self.estados.pop(nome_antigo)
         estado_obj.nome = nome_novo
         self.estados[nome_novo] = estado_obj
+        self.versao += 1
 
         novas_transicoes = {}
         for (origem, simbolo), (destino, output) in self.transicoes.items():
@@ -78,6 +94,9 @@ class MaquinaMealy(AutomatoFinito):
             
         self.transicoes = novas_transicoes
 
+        if nome_antigo in self.rotulos_por_origem:
+            self.rotulos_por_origem[nome_novo] = self.rotulos_por_origem.pop(nome_antigo)
+
         if self.estado_inicial and self.estado_inicial.nome == nome_novo:
             self.estado_inicial = estado_obj
         # estados_finais é um set de objetos Estado, que já foi atualizado
@@ -86,20 +105,24 @@ class MaquinaMealy(AutomatoFinito):
     def deletar_estado(self, nome_estado):
         if nome_estado not in self.estados: return
         estado_a_deletar = self.estados[nome_estado]
+        self.versao += 1
 
         novas_transicoes = {}
         for chave, (destino, output) in self.transicoes.items():
             origem, simbolo = chave
             if origem == nome_estado or destino == nome_estado:
+                if origem != nome_estado: self._desindexar_rotulo(origem, simbolo)
                 continue
             novas_transicoes[chave] = (destino, output)
         self.transicoes = novas_transicoes
+        self.rotulos_por_origem.pop(nome_estado, None)
 
         if self.estado_inicial and self.estado_inicial.nome == nome_estado: self.estado_inicial = None
         if estado_a_deletar in self.estados_finais: self.estados_finais.remove(estado_a_deletar)
         del self.estados[nome_estado]
 
     def deletar_transicoes_entre(self, origem, destino):
+        self.versao += 1
         chaves_para_remover = []
         for chave, (d_real, output) in self.transicoes.items():
             o_real, s = chave
@@ -108,4 +131,5 @@ class MaquinaMealy(AutomatoFinito):
         
         for chave in chaves_para_remover:
             if chave in self.transicoes:
-                del self.transicoes[chave]
\ No newline at end of file
+                del self.transicoes[chave]
+                self._desindexar_rotulo(*chave)
\ No newline at end of file
@@ -0,0 +1,151 @@
+# Arquivo: simulador_de_automatos/automato/minimizacao.py
+from collections import deque, Counter
+from itertools import accumulate, groupby
+from automato import EPSILON
+
+def refinar_hopcroft(delta, particao_inicial, num_estados):
+    """
+    Algoritmo de Hopcroft (O(n log n) por símbolo) para refinamento de partições.
+    delta: uma lista por símbolo, com delta[c][q] = id do destino (função total).
+    particao_inicial: lista de listas de ids de estados.
+    Retorna bloco_de, onde bloco_de[q] é o bloco final do estado q.
+    """
+    # Inverso de cada símbolo em formato compacto: os predecessores de q são ordem[inicio[q]:inicio[q + 1]]
+    inversos = []
+    for delta_c in delta:
+        ordem = sorted(range(num_estados), key=delta_c.__getitem__)
+        contagem = Counter(delta_c)
+        inicio = [0]
+        inicio.extend(accumulate(contagem.get(q, 0) for q in range(num_estados)))
+        inversos.append((ordem, inicio))
+
+    blocos = [set(bloco) for bloco in particao_inicial if bloco]
+    bloco_de = [0] * num_estados
+    for b, bloco in enumerate(blocos):
+        for q in bloco: bloco_de[q] = b
+
+    # Basta começar com todos os blocos menos o maior
+    maior = max(range(len(blocos)), key=lambda b: len(blocos[b]), default=0)
+    pendentes = set(range(len(blocos))) - {maior}
+
+    bloco_do_estado = bloco_de.__getitem__
+    while pendentes:
+        divisor = list(blocos[pendentes.pop()])
+        unitario = divisor[0] if len(divisor) == 1 else None
+        for ordem, inicio in inversos:
+            if unitario is not None: # Caso mais comum no fim do refinamento: divisor com um só estado
+                predecessores = ordem[inicio[unitario]:inicio[unitario + 1]]
+            else:
+                predecessores = []
+                for q in divisor:
+                    if inicio[q] != inicio[q + 1]: predecessores.extend(ordem[inicio[q]:inicio[q + 1]])
+            if not predecessores: continue
+            if len(predecessores) == 1:
+                grupos = ((bloco_de[predecessores[0]], predecessores),)
+            else:
+                predecessores.sort(key=bloco_do_estado)
+                grupos = groupby(predecessores, key=bloco_do_estado)
+            for b, grupo in grupos:
+                bloco = blocos[b]
+                if len(bloco) == 1: continue
+                grupo = list(grupo)
+                if len(grupo) == len(bloco): continue
+                # Divide o bloco: os predecessores formam um bloco novo
+                novo = set(grupo)
+                bloco.difference_update(novo)
+                id_novo = len(blocos)
+                blocos.append(novo)
+                for q in novo: bloco_de[q] = id_novo
+                if b in pendentes or len(novo) <= len(bloco): pendentes.add(id_novo)
+                else: pendentes.add(b)
+    return bloco_de
+
+
+def minimizar_deterministico(automato, novo, chave_estado, sumidouro_separado):
+    """
+    Minimiza um autômato determinístico com transições (origem, simbolo) -> destino (AFD, Moore).
+    Remove os estados inalcançáveis, particiona os restantes por 'chave_estado(estado)' e refina com Hopcroft.
+    As transições ausentes vão para um estado sumidouro implícito; se 'sumidouro_separado' for falso
+    (e só houver rótulos de um caractere), ele fica junto dos não finais e os estados equivalentes
+    a ele (que nunca aceitam) são descartados.
+    O resultado é escrito em 'novo', que recebe o representante de cada bloco com sua posição.
+    """
+    if not automato.estado_inicial or automato.estado_inicial.nome not in automato.estados:
+        return novo
+
+    # 1. Estados alcançáveis a partir do inicial
+    inicial = automato.estado_inicial.nome
+    alcancaveis = {inicial: 0}
+    nomes = [inicial]
+    arestas = [] # (id_origem, rotulo, nome_destino)
+    fila = deque([inicial])
+    while fila:
+        origem = fila.popleft()
+        q = alcancaveis[origem]
+        for rotulo in automato.rotulos_por_origem.get(origem, ()):
+            if rotulo == EPSILON: continue
+            destino = automato.transicoes[(origem, rotulo)]
+            if destino not in automato.estados: continue
+            if destino not in alcancaveis:
+                alcancaveis[destino] = len(nomes)
+                nomes.append(destino)
+                fila.append(destino)
+            arestas.append((q, rotulo, destino))
+
+    # 2. Tabela de transições total (o sumidouro é o último id)
+    n = len(nomes)
+    sumidouro = n
+    simbolos = sorted({rotulo for _, rotulo, _ in arestas})
+    coluna = {simbolo: c for c, simbolo in enumerate(simbolos)}
+    delta = [[sumidouro] * (n + 1) for _ in simbolos]
+    for q, rotulo, destino in arestas:
+        delta[coluna[rotulo]][q] = alcancaveis[destino]
+
+    # Com rótulos de vários caracteres, "sem transição" não equivale a "vai para um estado morto"
+    # (o casamento do rótulo mais longo muda), então o sumidouro implícito precisa de um bloco próprio
+    if any(len(simbolo) > 1 for simbolo in simbolos): sumidouro_separado = True
+
+    # 3. Partição inicial
+    grupos = {}
+    for q, nome in enumerate(nomes):
+        grupos.setdefault(chave_estado(automato.estados[nome]), []).append(q)
+    particao = list(grupos.values())
+    if sumidouro_separado:
+        particao.append([sumidouro])
+    else:
+        chave_nao_final = next((c for c, qs in grupos.items() if not automato.estados[nomes[qs[0]]].is_final), None)
+        if chave_nao_final is None: particao.append([sumidouro])
+        else: grupos[chave_nao_final].append(sumidouro)
+
+    bloco_de = refinar_hopcroft(delta, particao, n + 1)
+
+    # 4. Monta o autômato mínimo com o primeiro estado (em ordem de alcance) de cada bloco como representante
+    bloco_descartado = bloco_de[sumidouro]
+    if bloco_de[0] == bloco_descartado: bloco_descartado = None # Linguagem vazia: mantém só o inicial
+    representante = {}
+    for q, nome in enumerate(nomes):
+        b = bloco_de[q]
+        if b == bloco_descartado or b in representante: continue
+        representante[b] = nome
+        estado = automato.estados[nome]
+        novo.adicionar_estado(nome, estado.x, estado.y)
+        if estado.output and hasattr(novo, 'set_output_estado'): novo.set_output_estado(nome, estado.output)
+        if estado.is_final: novo.alternar_estado_final(nome)
+    novo.definir_estado_inicial(representante[bloco_de[0]])
+
+    # As transições são gravadas direto nas estruturas de 'novo' (mesmo formato de adicionar_transicao),
+    # pois em autômatos grandes o custo por chamada domina a minimização
+    for b, nome in representante.items():
+        q = alcancaveis[nome]
+        rotulos = []
+        for c, simbolo in enumerate(simbolos):
+            destino = delta[c][q]
+            if destino != sumidouro and bloco_de[destino] in representante:
+                novo.transicoes[(nome, simbolo)] = representante[bloco_de[destino]]
+                rotulos.append(simbolo)
+        if rotulos:
+            rotulos.sort(key=len, reverse=True)
+            novo.rotulos_por_origem[nome] = rotulos
+            novo.alfabeto.update(rotulos)
+    novo.versao += 1
+    return novo
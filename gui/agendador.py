@@ -0,0 +1,66 @@
+# Arquivo: simulador_de_automatos/gui/agendador.py
+import math
+import time
+from collections import deque
+
+FPS_ALVO = 60
+
+class AgendadorQuadros:
+    """
+    Junta os pedidos de redesenho em no máximo um quadro a cada 1/fps_alvo segundos, pelo after/after_idle do Tk.
+    Cada pedido é uma tarefa com nome: pedir de novo uma tarefa já pendente só troca a função (vale o pedido mais
+    recente), então uma rajada de eventos custa um quadro. Pedir é O(1); o trabalho acontece em _quadro.
+    Também mede os quadros desenhados: quadros por segundo (no último segundo) e tempo médio de cada quadro.
+    """
+    def __init__(self, widget, fps_alvo=FPS_ALVO, ao_terminar_quadro=None):
+        self.widget = widget
+        self.intervalo = 1 / fps_alvo
+        self.ao_terminar_quadro = ao_terminar_quadro # Chamado após cada quadro (ex.: atualizar o overlay de FPS)
+        self.pendentes = {} # nome -> função, na ordem do primeiro pedido
+        self._agendado = None # id do after/after_idle do próximo quadro
+        self._ultimo_quadro = 0.0
+        self.inicios = deque() # Início dos quadros do último segundo
+        self.duracoes = deque(maxlen=30) # Duração (s) dos últimos quadros
+
+    def solicitar(self, nome, funcao):
+        """Marca a tarefa 'nome' para o próximo quadro e agenda o quadro, se ainda não houver um."""
+        self.pendentes[nome] = funcao
+        if self._agendado is not None: return
+        espera = self._ultimo_quadro + self.intervalo - time.perf_counter()
+        if espera <= 0: self._agendado = self.widget.after_idle(self._quadro)
+        else: self._agendado = self.widget.after(math.ceil(espera * 1000), self._quadro)
+
+    def executar_agora(self):
+        """Executa já as tarefas pendentes (para quem precisa do canvas em dia, como a exportação)."""
+        if self._agendado is not None:
+            self.widget.after_cancel(self._agendado)
+        self._quadro()
+
+    def cancelar(self, nome):
+        self.pendentes.pop(nome, None)
+
+    def _quadro(self):
+        self._agendado = None
+        if not self.pendentes: return
+        inicio = time.perf_counter()
+        tarefas, self.pendentes = self.pendentes, {}
+        for funcao in tarefas.values(): funcao()
+        fim = time.perf_counter()
+        self._ultimo_quadro = inicio
+        self.duracoes.append(fim - inicio)
+        self.inicios.append(inicio)
+        while self.inicios and self.inicios[0] < fim - 1: self.inicios.popleft()
+        if self.ao_terminar_quadro: self.ao_terminar_quadro()
+
+    # --- Estatísticas ---
+    def quadros_por_segundo(self):
+        agora = time.perf_counter()
+        return sum(1 for inicio in self.inicios if inicio >= agora - 1)
+
+    def tempo_medio_quadro(self):
+        """Tempo médio (s) dos últimos quadros, ou 0 se nenhum foi desenhado."""
+        return sum(self.duracoes) / len(self.duracoes) if self.duracoes else 0.0
+
+    def dentro_do_alvo(self):
+        """Se os quadros cabem no orçamento de 1/fps_alvo segundos."""
+        return self.tempo_medio_quadro() <= self.intervalo
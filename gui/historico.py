@@ -0,0 +1,213 @@
+# Arquivo: simulador_de_automatos/gui/historico.py
+"""
+Histórico de desfazer/refazer por deltas.
+
+Cada ação guarda duas capturas parciais: o "antes" e o "depois" só dos estados que ela toca (atributos,
+posição e transições de saída), em vez de cópias profundas do autômato inteiro. Desfazer aplica o "antes"
+e refazer aplica o "depois", sempre pelos métodos do autômato (que mantêm índices e o contador de versão).
+Uma captura é um dict com as partes presentes:
+    "estados":    nome -> (is_final, output) ou None (estado não existe)
+    "posicoes":   nome -> (x, y) ou None
+    "transicoes": origem -> tupla de transições individuais (resto da chave, item), onde
+                  adicionar_transicao(origem, *resto, *item) recria a transição e item[0] é o destino
+    "inicial":    nome do estado inicial ou None
+    "completa":   True se a captura descreve o autômato inteiro (estados ausentes não existem)
+"""
+import sys
+from collections import deque
+
+LIMITE_HISTORICO = 200 # Ações guardadas; as mais antigas são incorporadas à base
+INTERVALO_CHECKPOINT = 25 # A cada tantas ações, guarda uma captura completa do estado seguinte
+
+def _itens(valor):
+    if valor is None: return ()
+    return valor if isinstance(valor, set) else (valor,)
+
+def _transicoes_de(automato, origens=None):
+    """origem -> tupla ordenada das transições individuais (resto, item) que saem dela."""
+    resultado = {}
+    for chave, valor in getattr(automato, 'transicoes', {}).items():
+        origem, resto = chave[0], chave[1:]
+        if origens is not None and origem not in origens: continue
+        lista = resultado.setdefault(origem, [])
+        for item in _itens(valor):
+            lista.append((resto, item if isinstance(item, tuple) else (item,)))
+    return {origem: tuple(sorted(lista, key=repr)) for origem, lista in resultado.items()}
+
+def origens_para(automato, nomes):
+    """Estados com alguma transição para um dos 'nomes' (que mudam se esses estados forem removidos ou renomeados)."""
+    origens = set()
+    for chave, valor in getattr(automato, 'transicoes', {}).items():
+        for item in _itens(valor):
+            if (item[0] if isinstance(item, tuple) else item) in nomes:
+                origens.add(chave[0]); break
+    return origens
+
+def capturar(automato, posicoes, nomes=None, origens=None):
+    """Captura dos estados 'nomes' e das transições que saem de 'origens' (por padrão, de 'nomes'); sem nomes, do autômato inteiro."""
+    completa = nomes is None
+    if completa: nomes = origens = set(automato.estados)
+    elif origens is None: origens = set(nomes)
+    estados = {}
+    for nome in nomes:
+        estado = automato.estados.get(nome)
+        estados[nome] = (estado.is_final, getattr(estado, 'output', None)) if estado is not None else None
+    transicoes = _transicoes_de(automato, origens)
+    if not completa:
+        for origem in origens: transicoes.setdefault(origem, ())
+    return {"estados": estados, "posicoes": {nome: posicoes.get(nome) for nome in nomes}, "transicoes": transicoes,
+            "inicial": automato.estado_inicial.nome if automato.estado_inicial else None, "completa": completa}
+
+def aplicar(automato, posicoes, captura):
+    """Leva o autômato e as posições ao estado descrito pela captura (só nas partes que ela contém)."""
+    estados = captura.get("estados", {})
+    if captura.get("completa"):
+        for nome in [nome for nome in automato.estados if nome not in estados]:
+            automato.deletar_estado(nome)
+            posicoes.pop(nome, None)
+    for nome, atributos in estados.items():
+        if atributos is None and nome in automato.estados: automato.deletar_estado(nome)
+    for nome, atributos in estados.items():
+        if atributos is None: continue
+        is_final, output = atributos
+        tem_saida = hasattr(automato, 'set_output_estado') # Moore
+        if nome not in automato.estados:
+            x, y = captura.get("posicoes", {}).get(nome) or (0, 0)
+            if tem_saida: automato.adicionar_estado(nome, x, y, output=output or "")
+            else: automato.adicionar_estado(nome, x, y)
+        estado = automato.estados[nome]
+        if estado.is_final != is_final: automato.alternar_estado_final(nome)
+        if tem_saida and estado.output != output: automato.set_output_estado(nome, output)
+
+    transicoes = captura.get("transicoes", {})
+    origens = set(transicoes) | (set(estados) if captura.get("completa") else set())
+    atuais = _transicoes_de(automato, origens)
+    for origem in origens:
+        desejadas = transicoes.get(origem, ())
+        if origem not in automato.estados or atuais.get(origem, ()) == desejadas: continue
+        for destino in {item[0] for _, item in atuais.get(origem, ())}:
+            automato.deletar_transicoes_entre(origem, destino)
+        for resto, item in desejadas:
+            automato.adicionar_transicao(origem, *resto, *item)
+
+    if "inicial" in captura:
+        inicial = captura["inicial"]
+        atual = automato.estado_inicial.nome if automato.estado_inicial else None
+        if inicial != atual:
+            if inicial is not None: automato.definir_estado_inicial(inicial)
+            else: # Não há método para desmarcar o inicial: desfaz direto e avança a versão, como os métodos fariam
+                automato.estado_inicial.is_inicial = False
+                automato.estado_inicial = None
+                if hasattr(automato, 'versao'): automato.versao += 1
+
+    for nome, posicao in captura.get("posicoes", {}).items():
+        if posicao is None: posicoes.pop(nome, None)
+        else: posicoes[nome] = posicao
+
+def compor(base, captura):
+    """Incorpora (no lugar) uma captura parcial à captura completa 'base'."""
+    for parte in ("estados", "posicoes", "transicoes"):
+        destino = base[parte]
+        for chave, valor in captura.get(parte, {}).items():
+            if valor is None or valor == (): destino.pop(chave, None)
+            else: destino[chave] = valor
+    if "inicial" in captura: base["inicial"] = captura["inicial"]
+    return base
+
+def _copiar(captura):
+    return {parte: dict(valor) if isinstance(valor, dict) else valor for parte, valor in captura.items()}
+
+def tamanho_aproximado(objeto, vistos=None):
+    """Bytes ocupados por um objeto e pelos dicts, tuplas, listas e sets dentro dele (cada objeto contado uma vez)."""
+    vistos = set() if vistos is None else vistos
+    if id(objeto) in vistos: return 0
+    vistos.add(id(objeto))
+    tamanho = sys.getsizeof(objeto)
+    if isinstance(objeto, dict):
+        tamanho += sum(tamanho_aproximado(k, vistos) + tamanho_aproximado(v, vistos) for k, v in objeto.items())
+    elif isinstance(objeto, (list, tuple, set, frozenset, deque)):
+        tamanho += sum(tamanho_aproximado(item, vistos) for item in objeto)
+    return tamanho
+
+
+class Historico:
+    """
+    Pilhas de desfazer/refazer de ações {"antes", "depois", "checkpoint"}, com no máximo 'limite' ações.
+    A base é a captura completa do estado anterior à ação mais antiga guardada; quando uma ação sai do limite,
+    o "depois" dela é incorporado à base. A cada 'intervalo_checkpoint' ações registradas, a ação guarda também
+    uma captura completa do estado logo após ela, para reconstruir o estado atual sem repassar todas as ações
+    (ver reconstruir_atual, usado se aplicar um delta falhar).
+    O tamanho de cada ação é medido uma vez, ao registrá-la, para que tamanho_bytes não percorra o histórico todo.
+    """
+    def __init__(self, limite=LIMITE_HISTORICO, intervalo_checkpoint=INTERVALO_CHECKPOINT):
+        self.limite = limite
+        self.intervalo_checkpoint = intervalo_checkpoint
+        self.desfazer_pilha = deque()
+        self.refazer_pilha = []
+        self.base = None
+        self._registradas = 0
+        self._bytes_acoes = 0
+        self._bytes_base = 0
+
+    def reiniciar(self, base):
+        """Esvazia o histórico; 'base' é a captura completa do estado atual."""
+        self.desfazer_pilha.clear()
+        self.refazer_pilha.clear()
+        self.base = base
+        self._registradas = 0
+        self._bytes_acoes = 0
+        self._bytes_base = tamanho_aproximado(base)
+
+    def registrar(self, antes, depois, capturar_tudo=None):
+        """Empilha uma ação (e descarta o que havia para refazer). capturar_tudo() gera a captura completa dos checkpoints."""
+        self._registradas += 1
+        checkpoint = None
+        if capturar_tudo is not None and self._registradas % self.intervalo_checkpoint == 0: checkpoint = capturar_tudo()
+        acao = {"antes": antes, "depois": depois, "checkpoint": checkpoint}
+        acao["bytes"] = tamanho_aproximado(acao)
+        self.desfazer_pilha.append(acao)
+        self._bytes_acoes += acao["bytes"] - sum(descartada["bytes"] for descartada in self.refazer_pilha)
+        self.refazer_pilha.clear()
+        while len(self.desfazer_pilha) > self.limite:
+            antiga = self.desfazer_pilha.popleft()
+            self._bytes_acoes -= antiga["bytes"]
+            if self.base is None: continue
+            if antiga["checkpoint"]:
+                self.base = _copiar(antiga["checkpoint"])
+                self._bytes_base = tamanho_aproximado(self.base)
+            else:
+                compor(self.base, antiga["depois"])
+                self._bytes_base += tamanho_aproximado(antiga["depois"]) # Estimativa: a base só cresce até o próximo checkpoint
+
+    def desfazer(self):
+        """Move a última ação para refazer e retorna a captura a aplicar (ou None)."""
+        if not self.desfazer_pilha: return None
+        acao = self.desfazer_pilha.pop()
+        self.refazer_pilha.append(acao)
+        return acao["antes"]
+
+    def refazer(self):
+        if not self.refazer_pilha: return None
+        acao = self.refazer_pilha.pop()
+        self.desfazer_pilha.append(acao)
+        return acao["depois"]
+
+    def reconstruir_atual(self):
+        """Captura completa do estado após a última ação de desfazer_pilha: checkpoint (ou base) mais os deltas seguintes."""
+        inicio, estado = 0, self.base
+        for i in range(len(self.desfazer_pilha) - 1, -1, -1):
+            if self.desfazer_pilha[i]["checkpoint"]:
+                inicio, estado = i + 1, self.desfazer_pilha[i]["checkpoint"]
+                break
+        if estado is None: return None
+        estado = _copiar(estado)
+        for i in range(inicio, len(self.desfazer_pilha)):
+            compor(estado, self.desfazer_pilha[i]["depois"])
+        return estado
+
+    def tamanho_bytes(self):
+        """Memória aproximada do histórico (ações e base)."""
+        return self._bytes_acoes + self._bytes_base
+
+    def __len__(self):
+        return len(self.desfazer_pilha) + len(self.refazer_pilha)
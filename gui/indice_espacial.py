@@ -0,0 +1,142 @@
+# Arquivo: simulador_de_automatos/gui/indice_espacial.py
+import math
+
+class IndiceGrade:
+    """
+    Índice espacial em grade uniforme: cada chave tem uma caixa (x1, y1, x2, y2) e é registrada em todas
+    as células de lado 'tamanho_celula' que a caixa toca. Consultas por ponto e por retângulo só olham as
+    células cobertas pela consulta, então custam O(células + chaves próximas) em vez de O(total de chaves).
+    Um ponto é uma caixa degenerada (x, y, x, y).
+    """
+    def __init__(self, tamanho_celula=64):
+        self.tamanho_celula = tamanho_celula
+        self.celulas = {} # (i, j) -> set de chaves
+        self.caixas = {} # chave -> caixa
+
+    def __len__(self):
+        return len(self.caixas)
+
+    def __contains__(self, chave):
+        return chave in self.caixas
+
+    def _intervalo(self, x1, y1, x2, y2):
+        t = self.tamanho_celula
+        return math.floor(x1 / t), math.floor(y1 / t), math.floor(x2 / t), math.floor(y2 / t)
+
+    def _celulas_de(self, caixa):
+        i1, j1, i2, j2 = self._intervalo(*caixa)
+        for i in range(i1, i2 + 1):
+            for j in range(j1, j2 + 1):
+                yield (i, j)
+
+    def inserir(self, chave, caixa):
+        """Registra (ou move) 'chave' com a caixa dada."""
+        antiga = self.caixas.get(chave)
+        if antiga is not None:
+            if self._intervalo(*antiga) == self._intervalo(*caixa): # Mesmas células: só troca a caixa
+                self.caixas[chave] = caixa
+                return
+            self.remover(chave)
+        self.caixas[chave] = caixa
+        for celula in self._celulas_de(caixa):
+            self.celulas.setdefault(celula, set()).add(chave)
+
+    def remover(self, chave):
+        caixa = self.caixas.pop(chave, None)
+        if caixa is None: return
+        for celula in self._celulas_de(caixa):
+            chaves = self.celulas.get(celula)
+            if chaves is not None:
+                chaves.discard(chave)
+                if not chaves: del self.celulas[celula]
+
+    def limpar(self):
+        self.celulas.clear()
+        self.caixas.clear()
+
+    def no_retangulo(self, x1, y1, x2, y2):
+        """Chaves cujas caixas intersectam o retângulo (para pontos: os que estão dentro dele)."""
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        i1, j1, i2, j2 = self._intervalo(x1, y1, x2, y2)
+        resultado = set()
+        if (i2 - i1 + 1) * (j2 - j1 + 1) > len(self.celulas): # Retângulo maior que a parte ocupada: percorre só as células ocupadas
+            candidatas = (chaves for (i, j), chaves in self.celulas.items() if i1 <= i <= i2 and j1 <= j <= j2)
+        else:
+            candidatas = (self.celulas[(i, j)] for i in range(i1, i2 + 1) for j in range(j1, j2 + 1) if (i, j) in self.celulas)
+        for chaves in candidatas:
+            for chave in chaves:
+                if chave in resultado: continue
+                cx1, cy1, cx2, cy2 = self.caixas[chave]
+                if cx1 <= x2 and x1 <= cx2 and cy1 <= y2 and y1 <= cy2: resultado.add(chave)
+        return resultado
+
+    def no_ponto(self, x, y):
+        """Chaves cujas caixas contêm o ponto (x, y)."""
+        return self.no_retangulo(x, y, x, y)
+
+    def limites(self):
+        """Caixa (x1, y1, x2, y2) das células ocupadas, que contém todas as chaves, ou None se o índice está vazio. O(células)."""
+        if not self.celulas: return None
+        t = self.tamanho_celula
+        i1 = min(i for i, _ in self.celulas); i2 = max(i for i, _ in self.celulas)
+        j1 = min(j for _, j in self.celulas); j2 = max(j for _, j in self.celulas)
+        return i1 * t, j1 * t, (i2 + 1) * t, (j2 + 1) * t
+
+
+class PosicoesIndexadas(dict):
+    """
+    Dicionário nome -> (x, y) das posições dos estados que mantém um IndiceGrade sincronizado a cada alteração.
+    Cópias (copy/deepcopy, usadas pelo histórico) são dicts simples; o índice é refeito ao atribuir à tela.
+    """
+    def __init__(self, posicoes=(), tamanho_celula=64):
+        super().__init__()
+        self.indice = IndiceGrade(tamanho_celula)
+        self.update(posicoes)
+
+    def __setitem__(self, nome, posicao):
+        super().__setitem__(nome, posicao)
+        x, y = posicao
+        self.indice.inserir(nome, (x, y, x, y))
+
+    def __delitem__(self, nome):
+        super().__delitem__(nome)
+        self.indice.remover(nome)
+
+    def pop(self, nome, *padrao):
+        if nome in self: self.indice.remover(nome)
+        return super().pop(nome, *padrao)
+
+    def popitem(self):
+        nome, posicao = super().popitem()
+        self.indice.remover(nome)
+        return nome, posicao
+
+    def setdefault(self, nome, posicao=None):
+        if nome not in self: self[nome] = posicao
+        return self[nome]
+
+    def update(self, *args, **kwargs):
+        for nome, posicao in dict(*args, **kwargs).items(): self[nome] = posicao
+
+    def clear(self):
+        super().clear()
+        self.indice.limpar()
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return dict(self) # As posições são tuplas imutáveis
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+    def perto(self, x, y, raio):
+        """Nomes a no máximo 'raio' de (x, y)."""
+        return {nome for nome in self.indice.no_retangulo(x - raio, y - raio, x + raio, y + raio)
+                if (self[nome][0] - x)**2 + (self[nome][1] - y)**2 <= raio**2}
+
+    def no_retangulo(self, x1, y1, x2, y2):
+        """Nomes dos estados dentro do retângulo (bordas incluídas)."""
+        return self.indice.no_retangulo(x1, y1, x2, y2)
@@ -2,11 +2,10 @@ import tkinter as tk
 import customtkinter as ctk
 from tkinter import messagebox, filedialog # Adicionado filedialog
 import math
+import time
 import os # Adicionado os
 import xml.etree.ElementTree as ET # Adicionado ET para JFF
-from xml.dom import minidom # Adicionado minidom para JFF
 from PIL import ImageGrab, Image # Adicionado ImageGrab e Image para JPG
-import copy # Importa a biblioteca de cópia
 
 # --- Imports de módulos locais (simulados para o exemplo) ---
 # ... (Nenhuma mudança nesta seção de imports) ...
@@ -16,6 +15,8 @@ try:
     from automato.maquinas_moore_mealy import MaquinaMoore, MaquinaMealy
     from automato.maquina_turing import MaquinaTuring
     from automato import EPSILON
+    from automato.jff import carregar_jff, salvar_jff
+    from automato.binario import EXTENSAO_BINARIO, carregar_binario, salvar_binario
     from simulador.simulador_passos import (
         SimuladorAFD, SimuladorAFN, SimuladorAP,
         SimuladorMoore, SimuladorMealy, SimuladorMT
@@ -55,7 +56,7 @@ except ImportError:
     class MaquinaMealy(BaseAutomato): pass
     class MaquinaTuring(BaseAutomato): simbolo_branco = '☐'
     class BaseSimulador:
-        def __init__(self, automato, cadeia): self.automato = automato; self.cadeia = cadeia; self.passos = iter([])
+        def __init__(self, automato, cadeia, **kwargs): self.automato = automato; self.cadeia = cadeia; self.passos = iter([])
         def proximo_passo(self): return next(self.passos, None)
     class SimuladorAFD(BaseSimulador): pass
     class SimuladorAFN(BaseSimulador): pass
@@ -67,9 +68,18 @@ except ImportError:
 
 
 from collections import defaultdict
+from gui.indice_espacial import IndiceGrade, PosicoesIndexadas
+from gui.historico import Historico, capturar, aplicar, origens_para
+from gui.agendador import AgendadorQuadros
 
 STATE_RADIUS = 25
+MAX_PASSOS_EXECUCAO_RAPIDA = 10_000_000 # Limite de transições do "Até parar" (MT)
+INTERVALO_PONTO_CONTROLE = 200_000 # Transições entre atualizações da GUI durante o "Até parar"
 FONT = ("Segoe UI", 10)
+MAX_PASSOS_SIMULACAO = 1_000_000 # Limite de passos do AP e da MT na simulação passo a passo (e no modo Play)
+TEMPO_TIQUE_REPRODUCAO = 0.012 # Tempo máximo (s) de passos consumidos por tique do modo Play
+ZOOM_LOD = 0.5 # Abaixo deste zoom o desenho é simplificado: estados como pontos, arestas retas e sem labels
+MARGEM_ROLAGEM = 200 # Margem lógica da área rolável em volta dos estados
 
 class TelaPrincipal:
     """Classe principal que gerencia a interface gráfica do simulador."""
@@ -83,8 +93,17 @@ class TelaPrincipal:
         self.automato = None
         self.tipo_automato = tk.StringVar(value="AFD")
         self.contador_estados = 0
-        self.positions = {}
+        self.positions = {} # Vira PosicoesIndexadas (ver a propriedade positions)
         self.label_hitboxes = {}
+        self.indice_labels = IndiceGrade() # (origem, destino) -> caixa da label (coordenadas VISUAIS)
+        # Itens do canvas do último desenho completo (ver desenhar_automato)
+        self.itens_estados = {} # nome -> {"circulo"/"texto"/"final"/"inicial": id do item}
+        self.itens_arestas = {} # (origem, destino) -> (forma, id da linha, id da label, tag da label)
+        self.arestas_por_estado = defaultdict(set) # nome -> arestas (origem, destino) ligadas ao estado
+        self.estados_ativos_desenho = None
+        # Cache de _agrupar_transicoes: (chave de versão, agrupado) e o texto de cada label
+        self._cache_agrupamento = None
+        self._cache_labels = {} # (origem, destino, forma) -> texto
         
         # --- NOVAS VARIÁVEIS DE ZOOM ---
         self.zoom_level = 1.5 # Modificado: Inicia em 150%
@@ -132,18 +151,31 @@ class TelaPrincipal:
         self.origem_transicao = None
         self.estado_movendo = None
         self.simulador = None
+        self.execucao_rapida = None # Gerador da execução rápida da MT ("Até parar")
+        self.reproduzindo = False # Modo Play: a simulação avança sozinha (ver _tique_reproducao)
+        self._id_reproducao = None # id do after do próximo tique
+        self._passos_acumulados = 0.0 # Fração de passo que sobrou do último tique (velocidades baixas)
 
         # --- NOVAS VARIÁVEIS PARA SELEÇÃO MÚLTIPLA ---
         self.selection_box_start = None
         self.selection_box_id = None    
         self.selection_group = set()    
         self.drag_start_pos = None
+        self._arraste_pendente = (0.0, 0.0) # Deslocamento lógico acumulado até o próximo quadro
+        self._caixa_selecao_fim = None # Ponto (visual) atual da caixa de seleção
+
+        # Redesenhos agrupados em quadros (ver AgendadorQuadros) e overlay de FPS (F3)
+        self.agendador = AgendadorQuadros(master, ao_terminar_quadro=self._desenhar_overlay_fps)
+        self.mostrar_fps = False
+        self._ultimo_desenho = (None, None, None) # Argumentos do último desenhar_automato (ver redesenhar_vista)
 
         # --- NOVO: Variáveis do Histórico Undo/Redo ---
-        self.history_undo_stack = []
-        self.history_redo_stack = []
+        self.historico = Historico() # Ações como deltas (antes/depois) dos estados afetados
+        self._edicao_pendente = None # (nomes, origens, captura "antes") da edição em andamento
+        self._posicoes_antes_arraste = {} # Posição de cada estado no início do arraste atual
         self.btn_undo = None
         self.btn_redo = None
+        self.lbl_historico = None
 
         # --- Layout Principal ---
         self.master.grid_columnconfigure(0, weight=1)
@@ -188,6 +220,8 @@ class TelaPrincipal:
                                     hover_color=self.cor_ferramenta_hover,
                                     **self.style_top_widget)
         self.btn_redo.pack(side="left", padx=5)
+        self.lbl_historico = ctk.CTkLabel(top_bar, text="", font=ctk.CTkFont(size=11))
+        self.lbl_historico.pack(side="left", padx=5)
         # --- FIM NOVO ---
 
         self.btn_theme_toggle = ctk.CTkButton(top_bar, text="",
@@ -283,8 +317,8 @@ class TelaPrincipal:
         frame_simulacao = ctk.CTkFrame(master, fg_color=self.app_bg_color) # MUDANÇA: Fundo
         frame_simulacao.grid(row=4, column=0, padx=10, pady=(5,10), sticky="sew")
         frame_simulacao.grid_columnconfigure(1, weight=1)
-        frame_simulacao.grid_columnconfigure(4, weight=1)
-        frame_simulacao.grid_columnconfigure(5, weight=0)
+        frame_simulacao.grid_columnconfigure(5, weight=1)
+        frame_simulacao.grid_columnconfigure(6, weight=0)
         ctk.CTkLabel(frame_simulacao, text="Entrada:").grid(row=0, column=0, padx=(10,5), pady=10)
         self.entrada_cadeia = ctk.CTkEntry(frame_simulacao,
                                         placeholder_text="Digite a cadeia para simular...",
@@ -302,14 +336,39 @@ class TelaPrincipal:
                                             hover_color=self.cor_simulacao_hover,
                                             **self.style_sim_button)
         self.btn_proximo_passo.grid(row=0, column=3, padx=5, pady=10)
+        # Executa a MT até parar sem desenhar os passos intermediários (visível só para Turing)
+        self.btn_ate_parar = ctk.CTkButton(frame_simulacao, text="⏩ Até parar",
+                                           command=self.executar_ate_parar, width=100,
+                                           fg_color=self.cor_simulacao_fg,
+                                           hover_color=self.cor_simulacao_hover,
+                                           **self.style_sim_button)
+        self.btn_ate_parar.grid(row=0, column=4, padx=5, pady=10)
         cadeia_status_frame = ctk.CTkFrame(frame_simulacao, fg_color="transparent") # MUDANÇA: Transparente
-        cadeia_status_frame.grid(row=0, column=4, padx=10, pady=10, sticky="w")
+        cadeia_status_frame.grid(row=0, column=5, padx=10, pady=10, sticky="w")
         self.lbl_cadeia_consumida = ctk.CTkLabel(cadeia_status_frame, text="", text_color=self.cor_consumida, font=ctk.CTkFont(size=24, weight="bold"))
         self.lbl_cadeia_consumida.pack(side="left")
         self.lbl_cadeia_restante = ctk.CTkLabel(cadeia_status_frame, text="", font=ctk.CTkFont(size=24, weight="bold"))
         self.lbl_cadeia_restante.pack(side="left")
         self.lbl_status_simulacao = ctk.CTkLabel(frame_simulacao, text="Status: Aguardando", font=ctk.CTkFont(size=20, weight="bold"))
-        self.lbl_status_simulacao.grid(row=0, column=5, padx=10, pady=10, sticky="e")
+        self.lbl_status_simulacao.grid(row=0, column=6, padx=10, pady=10, sticky="e")
+        # Modo Play: velocidade em escala logarítmica, de 1 a 1.000.000 passos por segundo
+        frame_reproducao = ctk.CTkFrame(frame_simulacao, fg_color="transparent")
+        frame_reproducao.grid(row=1, column=0, columnspan=7, padx=5, pady=(0, 10), sticky="w")
+        self.btn_reproduzir = ctk.CTkButton(frame_reproducao, text="▶▶ Play",
+                                            command=self.alternar_reproducao, width=100,
+                                            fg_color=self.cor_simulacao_fg,
+                                            hover_color=self.cor_simulacao_hover,
+                                            **self.style_sim_button)
+        self.btn_reproduzir.pack(side="left", padx=5)
+        ctk.CTkLabel(frame_reproducao, text="Velocidade:").pack(side="left", padx=(10, 5))
+        self.slider_velocidade = ctk.CTkSlider(frame_reproducao, from_=0, to=6, number_of_steps=60, width=200,
+                                               command=self._atualizar_label_velocidade,
+                                               button_color=self.cor_simulacao_fg, button_hover_color=self.cor_simulacao_hover)
+        self.slider_velocidade.set(1)
+        self.slider_velocidade.pack(side="left", padx=5)
+        self.lbl_velocidade = ctk.CTkLabel(frame_reproducao, text="")
+        self.lbl_velocidade.pack(side="left", padx=5)
+        self._atualizar_label_velocidade()
 
 
         # --- Bindings e Inicialização ---
@@ -317,6 +376,15 @@ class TelaPrincipal:
         self.canvas.bind("<Double-Button-1>", self.duplo_clique_canvas)
         self.canvas.bind("<B1-Motion>", self.arrastar_canvas)
         self.canvas.bind("<ButtonRelease-1>", self.soltar_canvas)
+        self.master.bind("<F3>", self.alternar_overlay_fps)
+        # Navegação: arrastar com o botão do meio, roda do mouse (Shift: horizontal) e redimensionar a janela
+        self.canvas.bind("<ButtonPress-2>", lambda e: self.canvas.scan_mark(e.x, e.y))
+        self.canvas.bind("<B2-Motion>", self.arrastar_vista)
+        self.canvas.bind("<MouseWheel>", lambda e: self.rolar_vista(0, -1 if e.delta > 0 else 1))
+        self.canvas.bind("<Shift-MouseWheel>", lambda e: self.rolar_vista(-1 if e.delta > 0 else 1, 0))
+        self.canvas.bind("<Button-4>", lambda e: self.rolar_vista(0, -1)) # Roda do mouse no X11
+        self.canvas.bind("<Button-5>", lambda e: self.rolar_vista(0, 1))
+        self.canvas.bind("<Configure>", lambda e: self.redesenhar_vista())
 
         self.mudar_tipo_automato(save_history=False) # <--- MODIFICADO
         self.set_active_mode("MOVER")
@@ -325,71 +393,155 @@ class TelaPrincipal:
 
         self.sync_theme()
         
-        # --- NOVO: Salva o estado inicial e atualiza botões ---
-        self._save_history_state()
         self._update_history_buttons()
 
 
+    # --- Posições dos estados com índice espacial ---
+    @property
+    def positions(self):
+        return self._posicoes
+
+    @positions.setter
+    def positions(self, posicoes):
+        """Qualquer dict atribuído (limpar tela, desfazer, importar) passa a manter o índice em grade das posições."""
+        self._posicoes = posicoes if isinstance(posicoes, PosicoesIndexadas) else PosicoesIndexadas(posicoes)
+
     # --- NOVO: Funções de Histórico (Undo/Redo) ---
 
-    def _save_history_state(self):
-        """Salva o estado atual no histórico e limpa o 'redo'."""
-        # Cria um snapshot profundo do estado atual
-        snapshot = (copy.deepcopy(self.automato), copy.deepcopy(self.positions))
-        self.history_undo_stack.append(snapshot)
-        # Qualquer nova ação limpa o stack de "refazer"
-        self.history_redo_stack.clear()
-        # Atualiza o estado dos botões
+    def _capturar_tudo(self):
+        return capturar(self.automato, self.positions)
+
+    def _iniciar_edicao(self, *nomes, completa=False):
+        """
+        Guarda o "antes" de uma ação que vai alterar os estados 'nomes' (e as transições que saem deles ou chegam a eles).
+        completa=True captura o autômato inteiro (limpar a tela).
+        """
+        if completa: self._edicao_pendente = (None, None, self._capturar_tudo())
+        else:
+            nomes = set(nomes)
+            origens = nomes | origens_para(self.automato, nomes)
+            self._edicao_pendente = (nomes, origens, capturar(self.automato, self.positions, nomes, origens))
+
+    def _concluir_edicao(self):
+        """Captura o "depois" da edição em andamento e a registra no histórico, se algo mudou."""
+        if self._edicao_pendente is None: return
+        nomes, origens, antes = self._edicao_pendente
+        self._edicao_pendente = None
+        depois = capturar(self.automato, self.positions, nomes, origens) if nomes is not None else self._capturar_tudo()
+        if depois != antes:
+            self.historico.registrar(antes, depois, self._capturar_tudo)
         self._update_history_buttons()
 
-    def _load_history_state(self, state_snapshot):
-        """Carrega um estado do histórico."""
-        # Carrega o snapshot
-        self.automato, self.positions = copy.deepcopy(state_snapshot) # Copia para evitar referência
+    def _aplicar_historico(self, captura):
+        """
+        Leva o autômato à captura; se um delta falhar, reconstrói o estado pelo checkpoint mais próximo.
+        Sem checkpoint (ou se ele também falhar), o histórico recomeça do autômato como ficou.
+        """
+        try:
+            aplicar(self.automato, self.positions, captura)
+        except Exception as e:
+            completa = self.historico.reconstruir_atual()
+            try:
+                if completa is not None: aplicar(self.automato, self.positions, completa)
+            except Exception:
+                completa = None
+            if completa is not None:
+                messagebox.showwarning("Histórico", f"Não foi possível aplicar a alteração do histórico:\n{e}\n\n"
+                                       "O autômato foi reconstruído a partir do último checkpoint.", parent=self.master)
+            else:
+                self.historico.reiniciar(self._capturar_tudo())
+                messagebox.showwarning("Histórico", f"Não foi possível aplicar a alteração do histórico:\n{e}\n\n"
+                                       "Não há checkpoint para reconstruir o estado; o desfazer/refazer foi reiniciado "
+                                       "a partir do autômato atual.", parent=self.master)
+        self.selection_group.intersection_update(self.automato.estados)
         self.parar_simulacao(final_state=False) # Garante que a simulação pare
-        self.desenhar_automato()
+        self.solicitar_desenho()
         self._update_history_buttons()
 
     def undo_action(self):
         """Desfaz a última ação."""
-        if not self.history_undo_stack:
-            return
-        
-        # Salva o estado ATUAL para o stack de 'redo'
-        current_snapshot = (copy.deepcopy(self.automato), copy.deepcopy(self.positions))
-        self.history_redo_stack.append(current_snapshot)
-        
-        # Remove e carrega o estado anterior do stack 'undo'
-        previous_snapshot = self.history_undo_stack.pop()
-        self._load_history_state(previous_snapshot)
+        captura = self.historico.desfazer()
+        if captura is not None: self._aplicar_historico(captura)
 
     def redo_action(self):
         """Refaz a última ação desfeita."""
-        if not self.history_redo_stack:
-            return
-            
-        # Salva o estado ATUAL de volta para o stack 'undo'
-        current_snapshot = (copy.deepcopy(self.automato), copy.deepcopy(self.positions))
-        self.history_undo_stack.append(current_snapshot)
-        
-        # Remove e carrega o próximo estado (que foi desfeito)
-        next_snapshot = self.history_redo_stack.pop()
-        self._load_history_state(next_snapshot)
+        captura = self.historico.refazer()
+        if captura is not None: self._aplicar_historico(captura)
 
     def _update_history_buttons(self):
-        """Ativa/desativa os botões de undo/redo."""
+        """Ativa/desativa os botões de undo/redo e mostra o tamanho do histórico."""
         if self.btn_undo:
-            self.btn_undo.configure(state="normal" if self.history_undo_stack else "disabled")
+            self.btn_undo.configure(state="normal" if self.historico.desfazer_pilha else "disabled")
         if self.btn_redo:
-            self.btn_redo.configure(state="normal" if self.history_redo_stack else "disabled")
+            self.btn_redo.configure(state="normal" if self.historico.refazer_pilha else "disabled")
+        if self.lbl_historico:
+            self.lbl_historico.configure(text=f"Histórico: {len(self.historico)} ações, {self.historico.tamanho_bytes() / 1024:.1f} KB")
 
     # --- FIM DAS FUNÇÕES DE HISTÓRICO ---
 
 
+    # --- Quadros: redesenhos agrupados e overlay de FPS ---
+    def solicitar_desenho(self, estados_ativos=None, transicoes_ativas=None, extra_info_str=None):
+        """Pede um desenhar_automato para o próximo quadro; vários pedidos no mesmo quadro viram um (vale o último)."""
+        self.agendador.solicitar("desenho", lambda: self.desenhar_automato(estados_ativos, transicoes_ativas, extra_info_str))
+
+    def alternar_overlay_fps(self, event=None):
+        self.mostrar_fps = not self.mostrar_fps
+        self._desenhar_overlay_fps()
+
+    def _desenhar_overlay_fps(self):
+        """Canto superior direito do canvas: quadros por segundo e tempo médio de quadro (verde dentro do alvo, vermelho fora)."""
+        self.canvas.delete("overlay_fps")
+        if not self.mostrar_fps: return
+        agendador = self.agendador
+        cor = self.cor_verde_fg if agendador.dentro_do_alvo() else self.cor_vermelha_fg
+        current_theme = 0 if ctk.get_appearance_mode() == "Light" else 1
+        texto = (f"{agendador.quadros_por_segundo()} quadros/s · {agendador.tempo_medio_quadro() * 1000:.1f} ms "
+                 f"(alvo {agendador.intervalo * 1000:.1f} ms)")
+        _, y1, x2, _ = self._viewport()
+        self.canvas.create_text(x2 - 10, y1 + 10, text=texto, anchor="ne", font=(FONT[0], 9),
+                                fill=cor[current_theme], tags="overlay_fps")
+
+    # --- Vista: rolagem do canvas e recorte ---
+    # As coordenadas VISUAIS são as do canvas (lógicas * zoom); a janela mostra a parte delas que começa em
+    # (canvasx(0), canvasy(0)). O desenho só cria itens do que está nessa parte (ver desenhar_automato).
+    def _ponto_evento(self, event):
+        """Coordenadas VISUAIS (do canvas, já considerando a rolagem) de um evento do mouse."""
+        return self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+
+    def _viewport(self):
+        """Retângulo visível (x1, y1, x2, y2) em coordenadas VISUAIS."""
+        x1, y1 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        return x1, y1, x1 + self.canvas.winfo_width(), y1 + self.canvas.winfo_height()
+
+    def redesenhar_vista(self):
+        """Pede um novo desenho com os mesmos destaques do último (a parte visível ou o zoom mudaram)."""
+        self.solicitar_desenho(*self._ultimo_desenho)
+
+    def arrastar_vista(self, event):
+        self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self.redesenhar_vista()
+
+    def rolar_vista(self, dx, dy):
+        if dx: self.canvas.xview_scroll(dx, "units")
+        if dy: self.canvas.yview_scroll(dy, "units")
+        self.redesenhar_vista()
+
+    def _atualizar_scrollregion(self, viewport):
+        """Área rolável: os estados (pelas células do índice) com uma margem, mais a parte visível atual."""
+        x1, y1, x2, y2 = viewport
+        limites = self.positions.indice.limites()
+        if limites:
+            margem = MARGEM_ROLAGEM * self.zoom_level
+            z = self.zoom_level
+            x1, y1 = min(x1, limites[0] * z - margem), min(y1, limites[1] * z - margem)
+            x2, y2 = max(x2, limites[2] * z + margem), max(y2, limites[3] * z + margem)
+        self.canvas.configure(scrollregion=(min(x1, 0), min(y1, 0), x2, y2))
+
     # --- NOVAS FUNÇÕES DE ZOOM ... (Nenhuma mudança nesta seção) ...
     def on_zoom_change(self, value):
         self.zoom_level = float(value)
-        self.desenhar_automato()
+        self.redesenhar_vista()
     def _logical_to_view(self, x, y):
         view_x = x * self.zoom_level
         view_y = y * self.zoom_level
@@ -430,7 +582,7 @@ class TelaPrincipal:
         self.default_fg_color = (ctk.ThemeManager.theme["CTkLabel"]["text_color"][0], ctk.ThemeManager.theme["CTkLabel"]["text_color"][1])
         self.update_button_styles()
         self.canvas.configure(bg=self.canvas_bg[current_theme_index])
-        self.desenhar_automato()
+        self.solicitar_desenho()
     def toggle_theme(self):
         current_mode = ctk.get_appearance_mode()
         new_mode = "Light" if current_mode == "Dark" else "Dark"
@@ -470,6 +622,8 @@ class TelaPrincipal:
         elif tipo == "Turing":
             self.lbl_tape_tag.grid(row=0, column=0, padx=(10,5), pady=5, sticky="w")
             self.lbl_tape_valor.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+        if tipo == "Turing": self.btn_ate_parar.grid()
+        else: self.btn_ate_parar.grid_remove()
 
         # Esconde o frame inteiro se não for Moore, Mealy ou Turing
         if tipo in ["AFD", "AFN", "AP"]:
@@ -490,8 +644,8 @@ class TelaPrincipal:
         Reseta o autômato, posições e estado da simulação.
         MODIFICADO: Salva o estado antes de limpar (para undo) ou reseta o histórico.
         """
-        if save_current_state:
-            self._save_history_state()
+        if save_current_state and not reset_history:
+            self._iniciar_edicao(completa=True)
 
         self.contador_estados = 0
         tipo = self.tipo_automato.get()
@@ -510,11 +664,12 @@ class TelaPrincipal:
         
         # --- NOVO: Reseta o histórico se solicitado ---
         if reset_history:
-            self.history_undo_stack = []
-            self.history_redo_stack = []
-            self._save_history_state() # Salva o estado em branco como o novo estado inicial
+            self._edicao_pendente = None
+            self.historico.reiniciar(self._capturar_tudo()) # O estado em branco é a nova base
+        elif save_current_state:
+            self._concluir_edicao()
         
-        self.desenhar_automato() # Limpa e redesenha o canvas
+        self.solicitar_desenho() # Limpa e redesenha o canvas
         self._atualizar_widgets_extra_info() # Atualiza widgets extras
         self._update_history_buttons() # Atualiza botões
 
@@ -524,9 +679,10 @@ class TelaPrincipal:
         """Processa um clique no canvas de acordo com o modo ativo."""
         mode = self.current_mode
         
-        logical_x, logical_y = self._view_to_logical(event.x, event.y)
+        ex, ey = self._ponto_evento(event)
+        logical_x, logical_y = self._view_to_logical(ex, ey)
         estado_clicado = self._get_estado_em(logical_x, logical_y)
-        transicao_clicada = self._get_transicao_label_em(event.x, event.y) 
+        transicao_clicada = self._get_transicao_label_em(ex, ey) 
 
         # --- LÓGICA DO MODO MOVER (SELEÇÃO E GRUPO) ---
         if mode == "MOVER":
@@ -535,39 +691,40 @@ class TelaPrincipal:
                     self.selection_group.clear()
                     self.selection_group.add(estado_clicado.nome)
                 self.estado_movendo = estado_clicado # Indica que o drag começou *sobre* um estado
-                self.drag_start_pos = (event.x, event.y) # Armazena início do drag
+                self.drag_start_pos = (ex, ey) # Armazena início do drag
             elif not estado_clicado and not transicao_clicada: # Clicou no vazio
                 self.estado_movendo = None
                 self.selection_group.clear() # Limpa seleção anterior
-                self.selection_box_start = (event.x, event.y) # Inicia o box-select
-                self.drag_start_pos = (event.x, event.y) # Armazena início do drag
+                self.selection_box_start = (ex, ey) # Inicia o box-select
+                self.drag_start_pos = (ex, ey) # Armazena início do drag
                 if self.selection_box_id: self.canvas.delete(self.selection_box_id)
                 self.selection_box_id = self.canvas.create_rectangle(
-                    event.x, event.y, event.x, event.y, 
+                    ex, ey, ex, ey, 
                     fill="#007acc", stipple="gray25", outline="#007acc"
                 )
-            self.desenhar_automato() 
+            self._atualizar_cores_estados() # Só a seleção mudou
             return 
 
         # --- OUTROS MODOS ---
         self.selection_group.clear() 
 
         if mode == "ESTADO" and not estado_clicado and not transicao_clicada:
-            self._save_history_state() # <--- NOVO: Salva antes de adicionar
             nome_estado = f"q{self.contador_estados}"
             while nome_estado in self.automato.estados:
                 self.contador_estados += 1; nome_estado = f"q{self.contador_estados}"
+            self._iniciar_edicao(nome_estado)
             if self.tipo_automato.get() == "Moore":
                 dialog = ctk.CTkInputDialog(text="Símbolo de Saída do Estado (vazio=default):", title="Criar Estado Moore")
                 output = dialog.get_input()
-                if output is None: 
-                    self.undo_action() # <--- NOVO: Desfaz o save se o usuário cancelar
+                if output is None: # Usuário cancelou: nada a registrar
+                    self._edicao_pendente = None
                     return
                 self.automato.adicionar_estado(nome_estado, logical_x, logical_y, output=output)
             else:
                 self.automato.adicionar_estado(nome_estado, logical_x, logical_y)
             self.positions[nome_estado] = (logical_x, logical_y) 
             self.contador_estados += 1
+            self._concluir_edicao()
             
         elif estado_clicado:
             if mode == "TRANSICAO":
@@ -577,66 +734,68 @@ class TelaPrincipal:
                     self._criar_transicao(self.origem_transicao, estado_clicado)
                     self.origem_transicao = None
             elif mode == "INICIAL": 
-                self._save_history_state() # <--- NOVO
+                self._iniciar_edicao(estado_clicado.nome)
                 self.automato.definir_estado_inicial(estado_clicado.nome)
+                self._concluir_edicao()
             elif mode == "FINAL": 
-                self._save_history_state() # <--- NOVO
+                self._iniciar_edicao(estado_clicado.nome)
                 self.automato.alternar_estado_final(estado_clicado.nome)
+                self._concluir_edicao()
             elif mode == "DELETAR":
-                self._save_history_state() # <--- NOVO
                 nome_a_deletar = estado_clicado.nome
+                self._iniciar_edicao(nome_a_deletar)
                 self.automato.deletar_estado(nome_a_deletar)
                 self.positions.pop(nome_a_deletar, None)
+                self._concluir_edicao()
                 
         elif transicao_clicada and mode == "DELETAR":
-            self._save_history_state() # <--- NOVO
             origem, destino = transicao_clicada
+            versao = self._versao_agrupamento()
             if hasattr(self.automato, 'deletar_transicoes_entre'):
+                self._iniciar_edicao(origem)
                 self.automato.deletar_transicoes_entre(origem, destino)
+                self._concluir_edicao()
+                self._atualizar_aresta_agrupada(origem, destino, versao)
             else:
                 print(f"Aviso: Método 'deletar_transicoes_entre' não implementado para {type(self.automato)}")
         
         elif not estado_clicado and not transicao_clicada:
             self.origem_transicao = None
 
-        self.desenhar_automato() # Redesenha o autômato
+        self.solicitar_desenho() # Redesenha o autômato
 
     def duplo_clique_canvas(self, event):
         """Processa um duplo clique no canvas (renomear estado ou editar transição no modo MOVER)."""
         mode = self.current_mode
 
-        logical_x, logical_y = self._view_to_logical(event.x, event.y)
+        ex, ey = self._ponto_evento(event)
+        logical_x, logical_y = self._view_to_logical(ex, ey)
         estado_clicado = self._get_estado_em(logical_x, logical_y)
-        transicao_clicada = self._get_transicao_label_em(event.x, event.y)
+        transicao_clicada = self._get_transicao_label_em(ex, ey)
 
         # Se deu duplo clique num estado no modo MOVER: renomeia
         if estado_clicado and mode == "MOVER":
-            self._save_history_state() # <--- NOVO: Salva antes de qualquer edição
             novo_nome = ctk.CTkInputDialog(text="Digite o novo nome do estado:", title="Renomear Estado").get_input()
-            
-            nome_mudou = False
-            output_mudou = False
-
+            novo_output = None
             if self.tipo_automato.get() == "Moore":
                 novo_output = ctk.CTkInputDialog(text="Digite a nova saída do estado:", title="Editar Saída Moore").get_input()
-                if novo_output is not None:
-                    self.automato.set_output_estado(estado_clicado.nome, novo_output)
-                    output_mudou = True
+
+            # O histórico só registra a ação se o nome ou a saída realmente mudarem
+            self._iniciar_edicao(estado_clicado.nome, *([novo_nome] if novo_nome else []))
+            if novo_output is not None:
+                self.automato.set_output_estado(estado_clicado.nome, novo_output)
 
             if novo_nome and novo_nome != estado_clicado.nome:
                 try:
                     pos = self.positions.pop(estado_clicado.nome)
                     self.automato.renomear_estado(estado_clicado.nome, novo_nome)
                     self.positions[novo_nome] = pos
-                    nome_mudou = True
                 except ValueError as e:
                     messagebox.showerror("Erro ao Renomear", str(e))
                     if estado_clicado.nome in self.automato.estados: self.positions[estado_clicado.nome] = pos
+            self._concluir_edicao()
             
-            if not nome_mudou and not output_mudou:
-                self.undo_action() # <--- NOVO: Desfaz o save se nada mudou
-            
-            self.desenhar_automato()
+            self.solicitar_desenho()
         
         elif transicao_clicada and mode == "MOVER":
             # --- LÓGICA DE EDIÇÃO DE TRANSIÇÃO MODIFICADA ---
@@ -656,40 +815,55 @@ class TelaPrincipal:
         if self.current_mode != "MOVER" or not self.drag_start_pos:
             return 
 
-        delta_x = event.x - self.drag_start_pos[0]
-        delta_y = event.y - self.drag_start_pos[1]
+        ex, ey = self._ponto_evento(event)
+        delta_x = ex - self.drag_start_pos[0]
+        delta_y = ey - self.drag_start_pos[1]
         logical_delta_x = delta_x / self.zoom_level
         logical_delta_y = delta_y / self.zoom_level
 
         if self.selection_box_start:
             start_x, start_y = self.selection_box_start
-            self.canvas.coords(self.selection_box_id, start_x, start_y, event.x, event.y)
+            self.canvas.coords(self.selection_box_id, start_x, start_y, ex, ey)
+            self._caixa_selecao_fim = (ex, ey)
+
+        # O evento só acumula o deslocamento; seleção, posições e itens são atualizados uma vez por quadro
+        dx, dy = self._arraste_pendente
+        self._arraste_pendente = (dx + logical_delta_x, dy + logical_delta_y)
+        self.drag_start_pos = (ex, ey)
+        self.agendador.solicitar("arraste", self._aplicar_arraste)
+
+    def _aplicar_arraste(self):
+        """Tarefa de quadro do arraste: atualiza a seleção da caixa e move o grupo pelo deslocamento acumulado."""
+        if self.selection_box_start and self._caixa_selecao_fim:
+            start_x, start_y = self.selection_box_start
             log_start_x, log_start_y = self._view_to_logical(start_x, start_y)
-            log_end_x, log_end_y = self._view_to_logical(event.x, event.y)
+            log_end_x, log_end_y = self._view_to_logical(*self._caixa_selecao_fim)
             log_box_x1 = min(log_start_x, log_end_x); log_box_y1 = min(log_start_y, log_end_y)
             log_box_x2 = max(log_start_x, log_end_x); log_box_y2 = max(log_start_y, log_end_y)
+            selecao_anterior = set(self.selection_group)
             self.selection_group.clear()
-            for nome, (sx, sy) in self.positions.items():
-                if (log_box_x1 <= sx <= log_box_x2) and (log_box_y1 <= sy <= log_box_y2):
-                    self.selection_group.add(nome)
-        
+            self.selection_group.update(self.positions.no_retangulo(log_box_x1, log_box_y1, log_box_x2, log_box_y2))
+            if self.selection_group != selecao_anterior: self._atualizar_cores_estados()
+
         # Move *todos* os estados no grupo de seleção
+        logical_delta_x, logical_delta_y = self._arraste_pendente
+        self._arraste_pendente = (0.0, 0.0)
         for nome in self.selection_group:
             if nome in self.positions:
                 old_log_x, old_log_y = self.positions[nome]
+                self._posicoes_antes_arraste.setdefault(nome, (old_log_x, old_log_y))
                 self.positions[nome] = (old_log_x + logical_delta_x, old_log_y + logical_delta_y)
 
-        self.drag_start_pos = (event.x, event.y)
-        self.desenhar_automato() 
+        # Só os estados movidos e suas arestas são atualizados; o canvas não é recriado
+        self._mover_itens_estados(self.selection_group)
 
     def soltar_canvas(self, event):
         """
         Finaliza o arraste do estado ou da seleção.
-        MODIFICADO: Salva o estado no histórico *após* mover.
+        O histórico registra só as posições que mudaram durante o arraste.
         """
-        # --- NOVO: Verifica se uma ação de movimento ocorreu ---
-        movimento_ocorrreu = self.estado_movendo is not None or self.selection_box_start is not None
-
+        self.agendador.executar_agora() # Aplica o que o arraste ainda tinha pendente
+        self._caixa_selecao_fim = None
         # Reseta os estados de drag/seleção
         self.estado_movendo = None
         self.drag_start_pos = None
@@ -699,11 +873,13 @@ class TelaPrincipal:
             self.canvas.delete(self.selection_box_id)
             self.selection_box_id = None
         
-        # --- NOVO: Salva o estado APÓS o movimento ---
-        if movimento_ocorrreu:
-            self._save_history_state()
+        antes = {nome: pos for nome, pos in self._posicoes_antes_arraste.items() if self.positions.get(nome) != pos}
+        self._posicoes_antes_arraste = {}
+        if antes:
+            self.historico.registrar({"posicoes": antes}, {"posicoes": {nome: self.positions.get(nome) for nome in antes}}, self._capturar_tudo)
+            self._update_history_buttons()
         
-        self.desenhar_automato() # Redesenha no estado final
+        self._atualizar_cores_estados() # As posições já foram atualizadas durante o arraste
 
     # --- INÍCIO DA FUNÇÃO CORRIGIDA (USA NOVO DIÁLOGO) ---
     def _editar_label_transicao(self, origem, destino):
@@ -738,7 +914,8 @@ class TelaPrincipal:
 
         # 5. Processa o resultado (lógica idêntica à anterior)
         if simbolo_input is not None and simbolo_input != label_atual:
-            self._save_history_state() # Salva o estado anterior
+            self._iniciar_edicao(origem)
+            versao = self._versao_agrupamento()
             
             # Deleta todas as transições entre os dois nós
             if hasattr(self.automato, 'deletar_transicoes_entre'):
@@ -752,7 +929,9 @@ class TelaPrincipal:
                 simbolo_final = EPSILON if s == 'e' or s == '' else s # Usa EPSILON para 'e' ou vazio
                 self.automato.adicionar_transicao(origem, simbolo_final, destino)
                 
-            self.desenhar_automato()
+            self._concluir_edicao()
+            self._atualizar_aresta_agrupada(origem, destino, versao)
+            self.solicitar_desenho()
         elif simbolo_input is None:
             pass # Usuário cancelou
     # --- FIM DA FUNÇÃO CORRIGIDA ---
@@ -886,7 +1065,8 @@ class TelaPrincipal:
 
         if novo_resultado:
             # Usuário confirmou a edição
-            self._save_history_state() # Salva o estado ANTES da modificação
+            self._iniciar_edicao(origem_nome)
+            versao = self._versao_agrupamento()
 
             # Pega a lista de todas as transições, *exceto* a que foi editada
             outras_transicoes = [t for i, t in enumerate(transicoes_encontradas) if i != index_selecionado]
@@ -902,7 +1082,9 @@ class TelaPrincipal:
             # Adiciona a nova transição (editada)
             self._adicionar_transicao_via_dict(origem_nome, destino_nome, novo_resultado, tipo_override=tipo)
             
-            self.desenhar_automato()
+            self._concluir_edicao()
+            self._atualizar_aresta_agrupada(origem_nome, destino_nome, versao)
+            self.solicitar_desenho()
         else:
             # Usuário cancelou a edição, não faz nada
             pass
@@ -912,13 +1094,14 @@ class TelaPrincipal:
     def _criar_transicao(self, origem, destino):
         """Abre o diálogo apropriado para criar uma transição entre dois estados."""
         tipo = self.tipo_automato.get()
+        versao = self._versao_agrupamento()
 
         if tipo in ["AFD", "AFN", "Moore"]:
             # A criação ainda pode usar o CTkInputDialog, pois não precisa pré-preencher
             dialog = ctk.CTkInputDialog(text="Símbolo(s) (use 'e' para ε, vírgula para separar):", title=f"Criar Transição {tipo}")
             simbolo_input = dialog.get_input()
             if simbolo_input is not None:
-                self._save_history_state() # <--- NOVO
+                self._iniciar_edicao(origem.nome)
                 simbolos = [s.strip() for s in simbolo_input.split(',') if s.strip()]
                 for s in simbolos:
                     simbolo_final = EPSILON if s == 'e' or s == '' else s
@@ -928,153 +1111,185 @@ class TelaPrincipal:
             dlg = TransicaoPilhaDialog(self.master, origem.nome, destino.nome, self.style_dialog_widget)
             self.master.wait_window(dlg)
             if dlg.resultado:
-                self._save_history_state() # <--- NOVO
+                self._iniciar_edicao(origem.nome)
                 self.automato.adicionar_transicao(origem.nome, dlg.resultado['entrada'], dlg.resultado['pop'], destino.nome, dlg.resultado['push'])
 
         elif tipo == "Mealy":
             dlg = TransicaoMealyDialog(self.master, origem.nome, destino.nome, self.style_dialog_widget)
             self.master.wait_window(dlg)
             if dlg.resultado:
-                self._save_history_state() # <--- NOVO
+                self._iniciar_edicao(origem.nome)
                 self.automato.adicionar_transicao(origem.nome, dlg.resultado['simbolo'], destino.nome, dlg.resultado['output'])
 
         elif tipo == "Turing":
             dlg = TransicaoTuringDialog(self.master, origem.nome, destino.nome, self.style_dialog_widget)
             self.master.wait_window(dlg)
             if dlg.resultado:
-                self._save_history_state() # <--- NOVO
+                self._iniciar_edicao(origem.nome)
                 self.automato.adicionar_transicao(origem.nome, dlg.resultado['lido'], destino.nome, dlg.resultado['escrito'], dlg.resultado['dir'])
 
-        self.desenhar_automato()
+        self._concluir_edicao()
+        self._atualizar_aresta_agrupada(origem.nome, destino.nome, versao)
+        self.solicitar_desenho()
 
 
     def _get_estado_em(self, x, y):
-        """Verifica se as coordenadas (x, y) estão dentro de algum estado desenhado.
+        """Verifica se as coordenadas (x, y) estão dentro de algum estado desenhado (o mais próximo, se houver vários).
            NOTA: Recebe coordenadas LÓGICAS."""
-        for nome, (sx, sy) in self.positions.items():
-            if (sx - x)**2 + (sy - y)**2 <= (STATE_RADIUS + 2)**2: 
-                if nome in self.automato.estados: return self.automato.estados[nome]
-        return None
+        candidatos = [nome for nome in self.positions.perto(x, y, STATE_RADIUS + 2) if nome in self.automato.estados]
+        if not candidatos: return None
+        nome = min(candidatos, key=lambda n: ((self.positions[n][0] - x)**2 + (self.positions[n][1] - y)**2, n))
+        return self.automato.estados[nome]
 
     def _get_transicao_label_em(self, x, y):
         """Verifica se as coordenadas (x, y) estão sobre alguma label de transição.
-           NOTA: Recebe coordenadas VISUAIS (event.x, event.y)."""
-        items = self.canvas.find_overlapping(x-1, y-1, x+1, y+1)
-        for item_id in reversed(items):
-            tags = self.canvas.gettags(item_id)
-            if "transition_label_text" in tags: 
-                for tag in tags:
-                    if tag.startswith("label_"):
-                        parts = tag.split('_')
-                        if len(parts) == 3: return parts[1], parts[2] # Retorna (origem, destino)
-        return None
+           NOTA: Recebe coordenadas VISUAIS (do canvas, ver _ponto_evento)."""
+        arestas = [par for par in self.indice_labels.no_retangulo(x-1, y-1, x+1, y+1) if par in self.itens_arestas]
+        if not arestas: return None
+        return max(arestas, key=lambda par: self.itens_arestas[par][2]) # A label criada por último fica por cima
+
+    # --- FUNÇÕES DE DESENHO ---
+    # desenhar_automato recria o canvas inteiro (mudanças de estrutura, zoom, tema, simulação) e guarda os ids
+    # dos itens de cada estado e de cada aresta; durante o arraste, _mover_itens_estados só reposiciona esses
+    # itens com canvas.coords, usando as mesmas funções de geometria do desenho completo.
+    def _geometria_estado(self, x, y):
+        """Coordenadas visuais dos itens de um estado centrado em (x, y) (coordenadas VISUAIS)."""
+        scaled_radius = STATE_RADIUS * self.zoom_level
+        final_inner_radius = max(1, scaled_radius - (5 * self.zoom_level))
+        dot_radius = max(2, scaled_radius / 2)
+        return {"ponto": (x - dot_radius, y - dot_radius, x + dot_radius, y + dot_radius),
+                "circulo": (x - scaled_radius, y - scaled_radius, x + scaled_radius, y + scaled_radius),
+                "texto": (x, y),
+                "final": (x - final_inner_radius, y - final_inner_radius, x + final_inner_radius, y + final_inner_radius),
+                "inicial": (x - scaled_radius - (20 * self.zoom_level), y, x - scaled_radius, y)}
+
+    def _geometria_aresta(self, origem_nome, destino_nome, forma):
+        """Coordenadas visuais (linha, posição da label) da aresta; forma: "laco", "curva" (transição dupla), "reta" ou "lod" (centro a centro, sem label)."""
+        x1, y1 = self._logical_to_view(*self.positions[origem_nome])
+        if forma == "lod": return (x1, y1) + self._logical_to_view(*self.positions[destino_nome]), None
+        scaled_radius = STATE_RADIUS * self.zoom_level
+        if forma == "laco":
+            linha = (x1 - (10*self.zoom_level), y1 - scaled_radius,
+                     x1 - (40*self.zoom_level), y1 - (scaled_radius + 35*self.zoom_level),
+                     x1 + (40*self.zoom_level), y1 - (scaled_radius + 35*self.zoom_level),
+                     x1 + (10*self.zoom_level), y1 - scaled_radius)
+            return linha, (x1, y1 - (75 * self.zoom_level))
+        x2, y2 = self._logical_to_view(*self.positions[destino_nome])
+        dx, dy = x2 - x1, y2 - y1
+        dist = math.hypot(dx, dy) or 1
+        ux, uy = dx/dist, dy/dist
+        nx, ny = -uy, ux
+        start_x, start_y = x1 + ux * scaled_radius, y1 + uy * scaled_radius
+        end_x, end_y = x2 - ux * scaled_radius, y2 - uy * scaled_radius
+        mid_x, mid_y = (start_x + end_x) / 2, (start_y + end_y) / 2
+        scaled_text_offset = 15 * self.zoom_level
+        if forma == "curva":
+            ctrl_x, ctrl_y = mid_x + nx * 30 * self.zoom_level, mid_y + ny * 30 * self.zoom_level
+            return (start_x, start_y, ctrl_x, ctrl_y, end_x, end_y), (ctrl_x + nx * scaled_text_offset, ctrl_y + ny * scaled_text_offset)
+        return (start_x, start_y, end_x, end_y), (mid_x + nx * scaled_text_offset, mid_y + ny * scaled_text_offset)
+
+    def _cor_borda_estado(self, nome, current_theme):
+        """Cor da borda do estado e se ela é a padrão (a largura da borda depende disso)."""
+        cor_borda_padrao = self.canvas_fg_color[current_theme]
+        if self.estados_ativos_desenho and nome in self.estados_ativos_desenho:
+            return self.canvas_estado_ativo[current_theme], False # Vermelho (simulação)
+        if self.origem_transicao and nome == self.origem_transicao.nome:
+            return self.cor_selecao_grupo[current_theme], False # Azul (origem da transição)
+        if nome in self.selection_group:
+            return self.cor_selecao_grupo[current_theme], False # Azul (selecionado)
+        return cor_borda_padrao, True
 
-    # --- FUNÇÕES DE DESENHO ... (Nenhuma mudança nesta seção) ...
     def desenhar_automato(self, estados_ativos=None, transicoes_ativas=None, extra_info_str=None):
+            """
+            Recria os itens do canvas, só para o que está na parte visível (com uma margem para laços, curvas e labels):
+            os estados vêm de uma consulta ao índice das posições e as arestas passam por um teste de caixa contra a vista.
+            Com zoom abaixo de ZOOM_LOD, estados viram pontos e arestas viram linhas retas sem label nem seta.
+            """
             try:
                 self.canvas.delete("all") # Limpa o canvas
                 self.label_hitboxes.clear() # Limpa áreas clicáveis das labels
+                self.indice_labels.limpar()
+                self.itens_estados.clear()
+                self.itens_arestas.clear()
+                self.arestas_por_estado.clear()
+                self.estados_ativos_desenho = estados_ativos
+                self._ultimo_desenho = (estados_ativos, transicoes_ativas, extra_info_str)
                 transicoes_ativas = transicoes_ativas or set()
                 agrupado = self._agrupar_transicoes() # Agrupa transições com formato JFLAP
                 pares_processados = set() # Para evitar desenhar transições duplas duas vezes
                 tipo = self.tipo_automato.get()
                 current_theme = 0 if ctk.get_appearance_mode() == "Light" else 1
-                scaled_radius = STATE_RADIUS * self.zoom_level
                 scaled_font = (FONT[0], max(1, int(FONT[1] * self.zoom_level)))
-                bold_scaled_font = (FONT[0], max(1, int(FONT[1] * self.zoom_level)), "bold")
-                
+                lod = self.zoom_level < ZOOM_LOD
+
+                # --- RECORTE: parte visível em coordenadas lógicas, com margem ---
+                viewport = self._viewport()
+                self._atualizar_scrollregion(viewport)
+                margem = STATE_RADIUS + 80 # Laço e label do laço acima do estado
+                lx1, ly1 = self._view_to_logical(viewport[0], viewport[1])
+                lx2, ly2 = self._view_to_logical(viewport[2], viewport[3])
+                lx1, ly1, lx2, ly2 = lx1 - margem, ly1 - margem, lx2 + margem, ly2 + margem
+                visiveis = self.positions.no_retangulo(lx1, ly1, lx2, ly2)
+                posicoes = self.positions
+
                 # --- DESENHAR TRANSIÇÕES ---
                 for origem_nome, destino_info in agrupado.items():
-                    if origem_nome not in self.automato.estados or origem_nome not in self.positions: continue
-                    origem = self.automato.estados[origem_nome]
-                    x1, y1 = self._logical_to_view(*self.positions[origem_nome])
+                    if origem_nome not in self.automato.estados or origem_nome not in posicoes: continue
+                    ox, oy = posicoes[origem_nome]
                     for destino_nome, simbolos in destino_info.items():
-                        if destino_nome not in self.automato.estados or destino_nome not in self.positions: continue
-                        destino = self.automato.estados[destino_nome]
-                        x2, y2 = self._logical_to_view(*self.positions[destino_nome])
+                        if destino_nome not in self.automato.estados or destino_nome not in posicoes: continue
+                        if origem_nome not in visiveis and destino_nome not in visiveis: # Só desenha se a caixa da aresta cruza a vista
+                            dx, dy = posicoes[destino_nome]
+                            if (ox < lx1 and dx < lx1) or (ox > lx2 and dx > lx2) or (oy < ly1 and dy < ly1) or (oy > ly2 and dy > ly2): continue
                         par = tuple(sorted((origem_nome, destino_nome)))
                         cor_linha = self.canvas_transicao_ativa[current_theme] if (origem_nome, destino_nome) in transicoes_ativas else self.canvas_fg_color[current_theme]
                         largura = 2.5 if (origem_nome, destino_nome) in transicoes_ativas else 1.5
-                        label_exibicao = "\n".join(sorted(list(simbolos))) 
-                        label_tag = f"label_{origem_nome}_{destino_nome}"
-                        transicao_font = bold_scaled_font
-                        transicao_color = self.canvas_fg_color[current_theme] # MUDANÇA
-                        if origem_nome == destino_nome: # Loop
-                            text_id = self.canvas.create_text(
-                                x1, y1 - (75 * self.zoom_level), # Posição Y com zoom
-                                text=label_exibicao, fill=transicao_color, 
-                                font=transicao_font, anchor=tk.CENTER,
-                                tags=("transition_label_text", label_tag))
-                            p1_x, p1_y = x1 - (10*self.zoom_level), y1 - scaled_radius
-                            c1_x, c1_y = x1 - (40*self.zoom_level), y1 - (scaled_radius + 35*self.zoom_level)
-                            c2_x, c2_y = x1 + (40*self.zoom_level), y1 - (scaled_radius + 35*self.zoom_level)
-                            p2_x, p2_y = x1 + (10*self.zoom_level), y1 - scaled_radius
-                            self.canvas.create_line(p1_x, p1_y, c1_x, c1_y, c2_x, c2_y, p2_x, p2_y,
-                                                    smooth=True, arrow=tk.LAST,
-                                                    fill=cor_linha, width=largura, tags="linha_transicao")
-                            bbox = self.canvas.bbox(text_id)
-                            if bbox: self.label_hitboxes[label_tag] = bbox
+                        if lod: # Uma linha reta por par de estados; laços não aparecem
+                            if origem_nome == destino_nome or (par in pares_processados and (origem_nome, destino_nome) not in transicoes_ativas): continue
+                            self._desenhar_aresta(origem_nome, destino_nome, "lod", None, cor_linha, 1 if largura == 1.5 else largura)
+                            pares_processados.add(par)
+                        elif origem_nome == destino_nome: # Loop
+                            self._desenhar_aresta(origem_nome, destino_nome, "laco", self._label_exibicao(origem_nome, destino_nome, simbolos, "reta"), cor_linha, largura)
                         elif agrupado.get(destino_nome, {}).get(origem_nome): # Transição dupla
                             if par in pares_processados: continue
                             cor_linha_volta = self.canvas_transicao_ativa[current_theme] if (destino_nome, origem_nome) in transicoes_ativas else self.canvas_fg_color[current_theme]
                             largura_volta = 2.5 if (destino_nome, origem_nome) in transicoes_ativas else 1.5
-                            label_tag_volta = f"label_{destino_nome}_{origem_nome}"
-                            label_volta_interna = ",".join(sorted(list(agrupado[destino_nome][origem_nome]))) 
-                            label_ida_interna = ",".join(sorted(list(simbolos))) 
-                            self._desenhar_linha_curva(origem, destino, label_ida_interna, 30, cor_linha, largura, label_tag)
-                            self._desenhar_linha_curva(destino, origem, label_volta_interna, 30, cor_linha_volta, largura_volta, label_tag_volta)
+                            label_volta = self._label_exibicao(destino_nome, origem_nome, agrupado[destino_nome][origem_nome], "curva")
+                            self._desenhar_aresta(origem_nome, destino_nome, "curva", self._label_exibicao(origem_nome, destino_nome, simbolos, "curva"), cor_linha, largura)
+                            self._desenhar_aresta(destino_nome, origem_nome, "curva", label_volta, cor_linha_volta, largura_volta)
                             pares_processados.add(par)
                         else: # Transição reta simples
-                            dx, dy = x2 - x1, y2 - y1
-                            dist = math.hypot(dx, dy) or 1
-                            ux, uy = dx/dist, dy/dist
-                            start_x, start_y = x1 + ux * scaled_radius, y1 + uy * scaled_radius
-                            end_x, end_y = x2 - ux * scaled_radius, y2 - uy * scaled_radius
-                            self.canvas.create_line(start_x, start_y, end_x, end_y,
-                                                    arrow=tk.LAST,
-                                                    fill=cor_linha, width=largura, tags="linha_transicao")
-                            text_x = (start_x+end_x)/2 - uy*(15*self.zoom_level)
-                            text_y = (start_y+end_y)/2 + ux*(15*self.zoom_level)
-                            text_id = self.canvas.create_text(
-                                text_x, text_y, text=label_exibicao,
-                                fill=transicao_color, font=transicao_font,
-                                anchor=tk.CENTER, tags=("transition_label_text", label_tag))
-                            bbox = self.canvas.bbox(text_id)
-                            if bbox: self.label_hitboxes[label_tag] = bbox
+                            self._desenhar_aresta(origem_nome, destino_nome, "reta", self._label_exibicao(origem_nome, destino_nome, simbolos, "reta"), cor_linha, largura)
 
                 # --- DESENHAR ESTADOS ---
                 for nome, estado in self.automato.estados.items():
-                    if nome not in self.positions: continue
-                    x, y = self._logical_to_view(*self.positions[nome])
-                    cor_borda_padrao = self.canvas_fg_color[current_theme]
-                    if estados_ativos and nome in estados_ativos:
-                        cor_borda = self.canvas_estado_ativo[current_theme] # Vermelho (simulação)
-                    elif self.origem_transicao and nome == self.origem_transicao.nome:
-                        cor_borda = self.cor_selecao_grupo[current_theme] # Azul (origem da transição)
-                    elif nome in self.selection_group:
-                        cor_borda = self.cor_selecao_grupo[current_theme] # Azul (selecionado)
-                    else:
-                        cor_borda = cor_borda_padrao
-                    self.canvas.create_oval(x - scaled_radius, y - scaled_radius, x + scaled_radius, y + scaled_radius,
+                    if nome not in visiveis: continue
+                    x, y = self._logical_to_view(*posicoes[nome])
+                    geometria = self._geometria_estado(x, y)
+                    cor_borda, borda_padrao = self._cor_borda_estado(nome, current_theme)
+                    itens = self.itens_estados[nome] = {}
+                    if lod:
+                        itens["ponto"] = self.canvas.create_oval(*geometria["ponto"], fill=cor_borda, outline="",
+                                                                 tags=("estado_ponto", f"estado_{nome}"))
+                        continue
+                    itens["circulo"] = self.canvas.create_oval(*geometria["circulo"],
                                             fill=self.canvas_estado_fill[current_theme], # MUDANÇA
                                             outline=cor_borda, 
-                                            width=3 if (cor_borda != cor_borda_padrao) else 2, # MUDANÇA
+                                            width=2 if borda_padrao else 3, # MUDANÇA
                                             tags=("estado_circulo", f"estado_{nome}"))
                     texto_estado = nome
                     if tipo == "Moore" and estado.output:
                         texto_estado = f"{nome}\n({estado.output})"
-                    self.canvas.create_text(x, y, text=texto_estado, font=scaled_font,
+                    itens["texto"] = self.canvas.create_text(*geometria["texto"], text=texto_estado, font=scaled_font,
                                             fill=self.canvas_estado_text[current_theme], # MUDANÇA
                                             justify=tk.CENTER,
                                             tags=("estado_texto", f"estado_{nome}_texto"))
                     if estado.is_final:
-                        final_inner_radius = max(1, scaled_radius - (5 * self.zoom_level))
-                        self.canvas.create_oval(x - final_inner_radius, y - final_inner_radius,
-                                                x + final_inner_radius, y + final_inner_radius,
+                        itens["final"] = self.canvas.create_oval(*geometria["final"],
                                                 outline=cor_borda, width=1,
                                                 tags=("estado_final_circulo", f"estado_{nome}"))
                     if estado.is_inicial:
-                        self.canvas.create_line(x - scaled_radius - (20 * self.zoom_level), y, x - scaled_radius, y,
+                        itens["inicial"] = self.canvas.create_line(*geometria["inicial"],
                                                 arrow=tk.LAST,
                                                 width=2, fill=self.canvas_fg_color[current_theme], # MUDANÇA
                                                 tags=("estado_inicial_seta", f"estado_{nome}"))
@@ -1083,56 +1298,108 @@ class TelaPrincipal:
                     scaled_info_font = (FONT[0], max(1, int(FONT[1] * self.zoom_level)))
                     tag = "Pilha: " if tipo == "AP" else ("Fita: " if tipo == "Turing" else "")
                     if tag:
-                        bg_rect = self.canvas.create_rectangle(10, 10, 10 + len(tag + extra_info_str) * 8 + 10, 40,
+                        vx, vy = viewport[0], viewport[1] # Fica no canto da parte visível
+                        bg_rect = self.canvas.create_rectangle(vx + 10, vy + 10, vx + 10 + len(tag + extra_info_str) * 8 + 10, vy + 40,
                                                                 fill=self.app_bg_color[current_theme], outline="", tags="extra_info_bg") # MUDANÇA
-                        info_text = self.canvas.create_text(15, 25, text=f"{tag}{extra_info_str}", font=scaled_info_font,
+                        info_text = self.canvas.create_text(vx + 15, vy + 25, text=f"{tag}{extra_info_str}", font=scaled_info_font,
                                                             fill=self.canvas_fg_color[current_theme], anchor="w", tags="extra_info_text") # MUDANÇA
                         text_bbox = self.canvas.bbox(info_text)
                         if text_bbox:
-                            self.canvas.coords(bg_rect, 10, 10, text_bbox[2] + 5, 40)
+                            self.canvas.coords(bg_rect, vx + 10, vy + 10, text_bbox[2] + 5, vy + 40)
             except Exception as e:
                 print(f"Erro crítico ao desenhar automato: {e}")
 
-    def _desenhar_linha_curva(self, origem, destino, label_original_virgula, fator, cor_linha, largura, label_tag):
-            """Desenha uma linha curva entre dois estados com a label empilhada, preta e negrito."""
-            if origem.nome not in self.positions or destino.nome not in self.positions: return
+    def _desenhar_aresta(self, origem_nome, destino_nome, forma, label, cor_linha, largura):
+            """Cria a linha e a label (preta e em negrito) de uma aresta e guarda os ids para o arraste."""
             current_theme = 0 if ctk.get_appearance_mode() == "Light" else 1
-            x1, y1 = self._logical_to_view(*self.positions[origem.nome])
-            x2, y2 = self._logical_to_view(*self.positions[destino.nome])
-            scaled_radius = STATE_RADIUS * self.zoom_level
             bold_scaled_font = (FONT[0], max(1, int(FONT[1] * self.zoom_level)), "bold")
-            scaled_fator = fator * self.zoom_level
-            scaled_text_offset = 15 * self.zoom_level
-            dx, dy = x2 - x1, y2 - y1
-            dist = math.hypot(dx, dy) or 1
-            nx, ny = -dy/dist, dx/dist
-            ux, uy = dx/dist, dy/dist
-            start_x, start_y = x1 + ux * scaled_radius, y1 + uy * scaled_radius
-            end_x, end_y = x2 - ux * scaled_radius, y2 - uy * scaled_radius
-            mid_x, mid_y = (start_x + end_x) / 2, (start_y + end_y) / 2
-            ctrl_x, ctrl_y = mid_x + nx * scaled_fator, mid_y + ny * scaled_fator
-            self.canvas.create_line(start_x, start_y, ctrl_x, ctrl_y, end_x, end_y,
-                                    smooth=True, arrow=tk.LAST,
-                                    fill=cor_linha, width=largura, tags="linha_transicao")
-            text_x = ctrl_x + nx * scaled_text_offset
-            text_y = ctrl_y + ny * scaled_text_offset
-            transicao_font = bold_scaled_font
-            transicao_color = self.canvas_fg_color[current_theme] # MUDANÇA
-            simbolos_lista = label_original_virgula.split(',') 
-            label_empilhada = "\n".join(sorted(simbolos_lista)) 
+            label_tag = f"label_{origem_nome}_{destino_nome}"
+            coords_linha, posicao_label = self._geometria_aresta(origem_nome, destino_nome, forma)
+            if forma == "lod": # Nível de detalhe baixo: só a linha, sem seta nem label
+                linha_id = self.canvas.create_line(*coords_linha, fill=cor_linha, width=largura, tags="linha_transicao")
+                self.itens_arestas[(origem_nome, destino_nome)] = (forma, linha_id, None, label_tag)
+                self.arestas_por_estado[origem_nome].add((origem_nome, destino_nome))
+                self.arestas_por_estado[destino_nome].add((origem_nome, destino_nome))
+                return
+            criar_linha = lambda: self.canvas.create_line(*coords_linha, smooth=(forma != "reta"), arrow=tk.LAST,
+                                                          fill=cor_linha, width=largura, tags="linha_transicao")
+            if forma != "laco": linha_id = criar_linha()
             text_id = self.canvas.create_text(
-                text_x, text_y, text=label_empilhada,
-                fill=transicao_color, font=transicao_font,
+                *posicao_label, text=label,
+                fill=self.canvas_fg_color[current_theme], font=bold_scaled_font, # MUDANÇA
                 anchor=tk.CENTER, tags=("transition_label_text", label_tag))
+            if forma == "laco": linha_id = criar_linha() # No laço a label é criada antes (fica por baixo da linha)
             bbox = self.canvas.bbox(text_id)
-            if bbox: self.label_hitboxes[label_tag] = bbox
+            if bbox:
+                self.label_hitboxes[label_tag] = bbox
+                self.indice_labels.inserir((origem_nome, destino_nome), bbox)
+            self.itens_arestas[(origem_nome, destino_nome)] = (forma, linha_id, text_id, label_tag)
+            self.arestas_por_estado[origem_nome].add((origem_nome, destino_nome))
+            self.arestas_por_estado[destino_nome].add((origem_nome, destino_nome))
+
+    def _mover_itens_estados(self, nomes):
+        """
+        Reposiciona, sem recriar nada, os itens dos estados 'nomes' e das arestas ligadas a eles (usado no arraste).
+        Um estado sem itens (fora da parte visível no último desenho) pede um desenho completo.
+        """
+        arestas = set()
+        for nome in nomes:
+            itens = self.itens_estados.get(nome)
+            if nome not in self.positions: continue
+            if itens is None:
+                self.redesenhar_vista()
+                continue
+            geometria = self._geometria_estado(*self._logical_to_view(*self.positions[nome]))
+            for parte, item_id in itens.items():
+                self.canvas.coords(item_id, *geometria[parte])
+            arestas |= self.arestas_por_estado.get(nome, set())
+        for chave in arestas:
+            forma, linha_id, text_id, label_tag = self.itens_arestas[chave]
+            coords_linha, posicao_label = self._geometria_aresta(*chave, forma)
+            self.canvas.coords(linha_id, *coords_linha)
+            if text_id is None: continue
+            self.canvas.coords(text_id, *posicao_label)
+            bbox = self.canvas.bbox(text_id)
+            if bbox:
+                self.label_hitboxes[label_tag] = bbox
+                self.indice_labels.inserir(chave, bbox)
+
+    def _atualizar_cores_estados(self):
+        """Recolore as bordas dos estados já desenhados (ex.: mudança da seleção), sem redesenhar o canvas."""
+        current_theme = 0 if ctk.get_appearance_mode() == "Light" else 1
+        for nome, itens in self.itens_estados.items():
+            cor_borda, borda_padrao = self._cor_borda_estado(nome, current_theme)
+            if "ponto" in itens:
+                self.canvas.itemconfigure(itens["ponto"], fill=cor_borda)
+                continue
+            self.canvas.itemconfigure(itens["circulo"], outline=cor_borda, width=2 if borda_padrao else 3)
+            if "final" in itens: self.canvas.itemconfigure(itens["final"], outline=cor_borda)
 
 
     def _agrupar_transicoes(self):
         """Agrupa múltiplas transições entre os mesmos dois estados sob uma única label,
-           formatada similarmente ao JFLAP."""
+           formatada similarmente ao JFLAP.
+           O resultado fica em cache até a versão do autômato (ou o autômato, ou o tipo) mudar."""
+        chave = self._chave_agrupamento()
+        if chave is not None and self._cache_agrupamento is not None and self._cache_agrupamento[0] == chave:
+            return self._cache_agrupamento[1]
         agrupado = defaultdict(lambda: defaultdict(set))
-        if not hasattr(self.automato, 'transicoes'): return agrupado
+        for origem, destino, label in self._labels_transicoes():
+            agrupado[origem][destino].add(label)
+        self._cache_agrupamento = (chave, agrupado) if chave is not None else None
+        self._cache_labels.clear()
+        return agrupado
+
+    def _chave_agrupamento(self):
+        """Identifica o conteúdo das transições agrupadas; None se o autômato não tem contador de versão.
+           Guarda o próprio autômato (não o id), que é comparado por identidade."""
+        versao = getattr(self.automato, 'versao', None)
+        if versao is None: return None
+        return (self.automato, versao, self.tipo_automato.get(), getattr(self.automato, 'simbolo_branco', None))
+
+    def _labels_transicoes(self, somente_origem=None):
+        """Gera (origem, destino, label) de cada transição; com somente_origem, só as que saem desse estado."""
+        if not hasattr(self.automato, 'transicoes'): return
         trans_dict = self.automato.transicoes
         tipo = self.tipo_automato.get()
         epsilon_char = "ε" 
@@ -1140,36 +1407,74 @@ class TelaPrincipal:
 
         if tipo == "AP":
             for (origem, s_in, s_pop), destinos_set in trans_dict.items():
-                if destinos_set is None: continue
+                if destinos_set is None or (somente_origem is not None and origem != somente_origem): continue
                 for destino, s_push in destinos_set:
                     in_char = epsilon_char if s_in == EPSILON else s_in
                     pop_char = epsilon_char if s_pop == EPSILON else s_pop
                     push_char = epsilon_char if s_push == EPSILON else s_push
-                    label = f"{in_char},{pop_char};{push_char}"
-                    agrupado[origem][destino].add(label)
+                    yield origem, destino, f"{in_char},{pop_char};{push_char}"
         elif tipo == "Mealy":
                 for (origem, simbolo), (destino, output) in trans_dict.items():
+                    if somente_origem is not None and origem != somente_origem: continue
                     in_char = epsilon_char if simbolo == EPSILON else simbolo
                     out_char = epsilon_char if output == EPSILON else output
-                    label = f"{in_char} ; {out_char}" # MUDANÇA: ;
-                    agrupado[origem][destino].add(label)
+                    yield origem, destino, f"{in_char} ; {out_char}" # MUDANÇA: ;
         elif tipo == "Turing":
                 simbolo_branco_automato = getattr(self.automato, 'simbolo_branco', '☐')
                 for (origem, lido), (destino, escrito, direcao) in trans_dict.items():
+                    if somente_origem is not None and origem != somente_origem: continue
                     read_char = blank_char if lido == simbolo_branco_automato else lido
                     write_char = blank_char if escrito == simbolo_branco_automato else escrito
-                    label = f"{read_char} ; {write_char} , {direcao}" # MUDANÇA: ;
-                    agrupado[origem][destino].add(label)
+                    yield origem, destino, f"{read_char} ; {write_char} , {direcao}" # MUDANÇA: ;
         else: # AFD, AFN, Moore
             for (origem, simbolo), destinos in trans_dict.items():
+                if somente_origem is not None and origem != somente_origem: continue
                 label_sym = epsilon_char if simbolo == EPSILON else simbolo
                 if isinstance(destinos, set): # AFN
                     for destino in destinos:
-                        agrupado[origem][destino].add(label_sym)
+                        yield origem, destino, label_sym
                 else: # AFD, Moore
                     if destinos:
-                        agrupado[origem][destinos].add(label_sym)
-        return agrupado
+                        yield origem, destinos, label_sym
+
+    def _versao_agrupamento(self):
+        """Versão do autômato no cache de agrupamento, se o cache ainda vale (chamar antes de editar uma aresta)."""
+        chave = self._chave_agrupamento()
+        if chave is not None and self._cache_agrupamento is not None and self._cache_agrupamento[0] == chave: return chave[1]
+        return None
+
+    def _atualizar_aresta_agrupada(self, origem, destino, versao_anterior):
+        """
+        Depois de editar só as transições que saem de 'origem' (ex.: a aresta origem -> destino), refaz no cache
+        apenas as arestas desse estado em vez de reagrupar tudo. Todas, e não só a editada: nos tipos
+        determinísticos, adicionar (origem, símbolo) substitui a transição anterior, que podia ir para outro destino.
+        versao_anterior vem de _versao_agrupamento, lida antes da edição.
+        """
+        chave = self._chave_agrupamento()
+        if versao_anterior is None or chave is None or self._cache_agrupamento is None: return
+        chave_antiga, agrupado = self._cache_agrupamento
+        if chave_antiga != chave[:1] + (versao_anterior,) + chave[2:]: return # Outras mudanças: reagrupa tudo no próximo desenho
+        antigos = set(agrupado.get(origem, ()))
+        novas = defaultdict(set)
+        for _, d, label in self._labels_transicoes(origem): novas[d].add(label)
+        if novas: agrupado[origem] = novas
+        else: agrupado.pop(origem, None)
+        for d in antigos | set(novas) | {destino}: # A aresta de volta pode mudar de forma (reta <-> curva)
+            for par in ((origem, d), (d, origem)):
+                for forma in ("reta", "curva"): self._cache_labels.pop(par + (forma,), None)
+        self._cache_agrupamento = (chave, agrupado)
+
+    def _label_exibicao(self, origem, destino, simbolos, forma):
+        """Texto (em cache) da label da aresta: uma transição por linha, em ordem."""
+        chave = (origem, destino, forma)
+        label = self._cache_labels.get(chave)
+        if label is None:
+            if forma == "curva": # Label empilhada a partir da versão com vírgulas
+                label = "\n".join(sorted(",".join(sorted(simbolos)).split(',')))
+            else:
+                label = "\n".join(sorted(simbolos))
+            self._cache_labels[chave] = label
+        return label
 
     # --- FUNÇÕES DE SIMULAÇÃO ... (Nenhuma mudança nesta seção) ...
     def iniciar_simulacao(self):
@@ -1189,14 +1494,14 @@ class TelaPrincipal:
                     first_state_name = next(iter(self.automato.estados))
                     print(f"Aviso: Estado inicial não definido. Usando '{first_state_name}' como inicial.")
                     self.automato.definir_estado_inicial(first_state_name)
-                    self.desenhar_automato() 
+                    self.solicitar_desenho() 
                 else: raise ValueError("Estado inicial não definido e autômato vazio.")
             if tipo == "AFD": self.simulador = SimuladorAFD(self.automato, cadeia)
             elif tipo == "AFN": self.simulador = SimuladorAFN(self.automato, cadeia)
-            elif tipo == "AP": self.simulador = SimuladorAP(self.automato, cadeia)
+            elif tipo == "AP": self.simulador = SimuladorAP(self.automato, cadeia, max_passos=MAX_PASSOS_SIMULACAO)
             elif tipo == "Moore": self.simulador = SimuladorMoore(self.automato, cadeia)
             elif tipo == "Mealy": self.simulador = SimuladorMealy(self.automato, cadeia)
-            elif tipo == "Turing": self.simulador = SimuladorMT(self.automato, cadeia)
+            elif tipo == "Turing": self.simulador = SimuladorMT(self.automato, cadeia, max_passos=MAX_PASSOS_SIMULACAO)
         except Exception as e: 
             messagebox.showerror("Erro ao Iniciar", str(e)); return
         self.btn_simular.configure(text="⏹ Parar", command=self.parar_simulacao)
@@ -1205,7 +1510,11 @@ class TelaPrincipal:
         self.executar_proximo_passo() 
     def parar_simulacao(self, final_state=False):
         """Para a simulação atual e reseta a UI para o estado inicial."""
+        self.pausar_reproducao()
         self.simulador = None 
+        self.execucao_rapida = None
+        self.btn_ate_parar.configure(state="normal")
+        self.btn_reproduzir.configure(state="normal")
         current_theme = 0 if ctk.get_appearance_mode() == "Light" else 1 
         self.btn_simular.configure(text="▶ Iniciar", command=self.iniciar_simulacao)
         self.btn_proximo_passo.configure(state="disabled")
@@ -1215,12 +1524,94 @@ class TelaPrincipal:
             self.lbl_cadeia_restante.configure(text="", text_color=self.default_fg_color[current_theme])
             self.lbl_output_valor.configure(text="")
             self.lbl_tape_valor.configure(text="")
-            self.desenhar_automato() 
+            self.solicitar_desenho() 
+    def executar_ate_parar(self):
+        """
+        Executa a MT desde o início pela execução rápida do SimuladorMT, sem desenhar os passos intermediários.
+        A cada ponto de controle a GUI só atualiza o status (passos e taxa) e devolve o controle ao Tk;
+        ao parar, desenha apenas a configuração final.
+        """
+        if self.tipo_automato.get() != "Turing": return
+        self.iniciar_simulacao() # Valida o autômato e prepara a UI (desenha a configuração inicial)
+        if not self.simulador: return
+        self.simulador = SimuladorMT(self.automato, self.entrada_cadeia.get(), max_passos=MAX_PASSOS_EXECUCAO_RAPIDA)
+        self.execucao_rapida = self.simulador.executar_rapido(intervalo=INTERVALO_PONTO_CONTROLE, detectar_ciclos=True)
+        self.btn_proximo_passo.configure(state="disabled")
+        self.btn_ate_parar.configure(state="disabled")
+        self.btn_reproduzir.configure(state="disabled") # O gerador da execução rápida não é o dos passos
+        self._continuar_execucao_rapida()
+
+    def _continuar_execucao_rapida(self):
+        if self.execucao_rapida is None: return # Parada pelo usuário
+        passo_info = next(self.execucao_rapida, None)
+        if passo_info and passo_info["status"] == "executando":
+            current_theme = 0 if ctk.get_appearance_mode() == "Light" else 1
+            self.lbl_status_simulacao.configure(text=f"Executando... {passo_info['passos']:,} passos ({passo_info['passos_por_segundo']:,.0f}/s)".replace(",", "."),
+                                                text_color=self.default_fg_color[current_theme])
+            self.master.after(1, self._continuar_execucao_rapida)
+            return
+        self.execucao_rapida = None
+        self._mostrar_passo(passo_info)
+
     def executar_proximo_passo(self):
         """Executa o próximo passo da simulação e atualiza a UI."""
         if not self.simulador: return 
+        self._mostrar_passo(self.simulador.proximo_passo())
+
+    # --- Modo Play ---
+    def passos_por_segundo(self):
+        return 10 ** self.slider_velocidade.get()
+
+    def _atualizar_label_velocidade(self, value=None):
+        self.lbl_velocidade.configure(text=f"{self.passos_por_segundo():,.0f} passos/s".replace(",", "."))
+
+    def alternar_reproducao(self):
+        """Play/Pausa. Sem simulação em andamento, inicia uma (o primeiro passo já aparece) antes de reproduzir."""
+        if self.reproduzindo:
+            self.pausar_reproducao()
+            return
+        if not self.simulador:
+            self.iniciar_simulacao()
+            if not self.simulador: return # Erro ao iniciar, ou a simulação já terminou no primeiro passo
+        self.reproduzindo = True
+        self._passos_acumulados = 0.0
+        self.btn_reproduzir.configure(text="⏸ Pausar")
+        self.btn_proximo_passo.configure(state="disabled")
+        self._id_reproducao = self.master.after(int(self.agendador.intervalo * 1000), self._tique_reproducao)
+
+    def pausar_reproducao(self):
+        if self._id_reproducao is not None:
+            self.master.after_cancel(self._id_reproducao)
+            self._id_reproducao = None
+        if self.reproduzindo:
+            self.reproduzindo = False
+            self.btn_reproduzir.configure(text="▶▶ Play")
+            if self.simulador: self.btn_proximo_passo.configure(state="normal")
+
+    def _tique_reproducao(self):
+        """
+        Um tique por quadro: consome do gerador os passos que a velocidade pede para um quadro (limitados a
+        TEMPO_TIQUE_REPRODUCAO segundos de trabalho) e mostra só o último; um passo final é sempre mostrado.
+        """
+        self._id_reproducao = None
+        if not self.reproduzindo or not self.simulador: return
+        self._passos_acumulados += self.passos_por_segundo() * self.agendador.intervalo
+        quantidade = int(self._passos_acumulados)
+        self._passos_acumulados -= quantidade
+        ultimo = None
+        if quantidade:
+            prazo = time.perf_counter() + TEMPO_TIQUE_REPRODUCAO
+            for i in range(quantidade):
+                ultimo = self.simulador.proximo_passo()
+                if not ultimo or ultimo["status"] != "executando": break
+                if i % 64 == 63 and time.perf_counter() > prazo: break
+            self._mostrar_passo(ultimo) # Um passo final (ou None) encerra a simulação e a reprodução
+        if self.reproduzindo and self.simulador:
+            self._id_reproducao = self.master.after(int(self.agendador.intervalo * 1000), self._tique_reproducao)
+
+    def _mostrar_passo(self, passo_info):
+        """Atualiza a UI com um passo da simulação (None indica que o gerador terminou)."""
         current_theme = 0 if ctk.get_appearance_mode() == "Light" else 1 
-        passo_info = self.simulador.proximo_passo() 
         tipo = self.tipo_automato.get()
         if not passo_info:
             current_status_text = self.lbl_status_simulacao.cget("text")
@@ -1257,7 +1648,10 @@ class TelaPrincipal:
         if "output" in passo_info and passo_info["output"] is not None:
             self.lbl_output_valor.configure(text=passo_info["output"])
         if "pilha" in passo_info and passo_info["pilha"] is not None:
-                extra_info_canvas = passo_info["pilha"]
+                pilha = passo_info["pilha"] # No AP, o nó da pilha persistente: o texto só é montado para o passo exibido
+                extra_info_canvas = pilha if isinstance(pilha, str) else (pilha.como_texto() or "(vazia)")
+        if "indice_cadeia" in passo_info: # AP: a posição na cadeia, em vez do resto já recortado
+            passo_info = dict(passo_info, cadeia_restante=self.entrada_cadeia.get()[passo_info["indice_cadeia"]:])
         if "cadeia_restante" in passo_info and tipo != "Turing":
             cadeia_restante = passo_info['cadeia_restante']
             cadeia_original = self.entrada_cadeia.get()
@@ -1274,24 +1668,24 @@ class TelaPrincipal:
                 self.lbl_cadeia_consumida.configure(text="")
                 self.lbl_cadeia_restante.configure(text="")
         if status == "executando":
-            self.desenhar_automato(passo_info["estado_atual"], passo_info.get("transicao_ativa"), extra_info_canvas)
+            self.solicitar_desenho(passo_info["estado_atual"], passo_info.get("transicao_ativa"), extra_info_canvas)
         elif status == "aceita":
             self.lbl_status_simulacao.configure(text="Palavra Aceita", text_color=self.cor_aceita[current_theme])
             if tipo != "Turing": 
                 self.lbl_cadeia_consumida.configure(text=self.entrada_cadeia.get(), text_color=self.cor_aceita[current_theme])
                 self.lbl_cadeia_restante.configure(text="")
-            self.desenhar_automato(passo_info.get("estado_atual"), passo_info.get("transicao_ativa"), extra_info_canvas)
+            self.solicitar_desenho(passo_info.get("estado_atual"), passo_info.get("transicao_ativa"), extra_info_canvas)
             self.parar_simulacao(final_state=True) 
         elif status == "rejeita":
             self.lbl_status_simulacao.configure(text="Palavra Não Aceita", text_color=self.cor_rejeita[current_theme])
-            self.desenhar_automato(passo_info.get("estado_atual"), passo_info.get("transicao_ativa"), extra_info_canvas)
+            self.solicitar_desenho(passo_info.get("estado_atual"), passo_info.get("transicao_ativa"), extra_info_canvas)
             self.parar_simulacao(final_state=True)
         elif status == "finalizado": # Usado por Moore/Mealy
             self.lbl_status_simulacao.configure(text="Processamento Concluído", text_color=self.cor_finalizado[current_theme])
             if tipo != "Turing": 
                 self.lbl_cadeia_consumida.configure(text=self.entrada_cadeia.get(), text_color=self.cor_consumida[current_theme]) 
                 self.lbl_cadeia_restante.configure(text="")
-            self.desenhar_automato(passo_info.get("estado_atual"), passo_info.get("transicao_ativa"), extra_info_canvas)
+            self.solicitar_desenho(passo_info.get("estado_atual"), passo_info.get("transicao_ativa"), extra_info_canvas)
             self.parar_simulacao(final_state=True)
         elif status == "erro": # Erro durante a simulação
             messagebox.showerror("Erro", passo_info["mensagem"])
@@ -1303,132 +1697,35 @@ class TelaPrincipal:
     def importar_de_jff(self):
         """
         Abre um arquivo .jff e carrega o autômato no simulador.
-        MODIFICADO: Reseta o histórico de undo/redo.
+        MODIFICADO: Reseta o histórico de undo/redo. A leitura fica em automato.jff.
         """
         try:
             filepath = filedialog.askopenfilename(
-                filetypes=[("JFLAP files", "*.jff"), ("All files", "*.*")],
+                filetypes=[("JFLAP files", "*.jff"), ("Instantâneo binário", "*" + EXTENSAO_BINARIO), ("All files", "*.*")],
                 title="Abrir Arquivo JFF",
                 parent=self.master
             )
             if not filepath: return 
 
-            tree = ET.parse(filepath)
-            root = tree.getroot()
-
-            # 1. Obter o tipo de autômato
-            jflap_type_node = root.find("type")
-            if jflap_type_node is None: raise ValueError("Arquivo JFF inválido: tag <type> não encontrada.")
-            jflap_type = jflap_type_node.text.lower()
-            automaton_node = root.find("automaton")
-            if automaton_node is None: raise ValueError("Arquivo JFF inválido: tag <automaton> não encontrada.")
-
-            tipo_simulador = ""
-            if jflap_type == "fa": tipo_simulador = "AFD" 
-            elif jflap_type == "pda": tipo_simulador = "AP"
-            elif jflap_type == "turing": tipo_simulador = "Turing"
-            elif jflap_type == "mealy":
-                if automaton_node.find("state/output") is not None: tipo_simulador = "Moore"
-                else: tipo_simulador = "Mealy"
-            else:
-                raise ValueError(f"Tipo de autômato JFLAP '{jflap_type}' não suportado.")
+            # O formato binário (.autb) abre bem mais rápido que o XML em autômatos grandes
+            if filepath.endswith(EXTENSAO_BINARIO): tipo_simulador, automato = carregar_binario(filepath)
+            else: tipo_simulador, automato = carregar_jff(filepath)
 
-            # 2. Limpar a tela e configurar o novo tipo (MODIFICADO)
+            # Limpa a tela, configura o novo tipo e troca o autômato pelo carregado
             self.tipo_automato.set(tipo_simulador)
             # Reseta a tela E o histórico, sem salvar o estado anterior
             self.limpar_tela(save_current_state=False, reset_history=True) 
+            self.automato = automato
+            self.positions = {nome: (estado.x, estado.y) for nome, estado in automato.estados.items()}
+            self._atualizar_widgets_extra_info()
 
-            # 3. Mapear IDs de estado ... (Lógica de importação normal) ...
-            id_to_name = {}
-            states_nodes = automaton_node.findall("state")
-            state_data_map = {} 
-            self.contador_estados = 0 
-            for state in states_nodes:
-                state_id = state.get("id"); state_name = state.get("name")
-                if not state_name: state_name = f"q{self.contador_estados}"
-                while state_name in self.automato.estados or state_name in (d['name'] for d in state_data_map.values()):
-                        self.contador_estados += 1; state_name = f"q{self.contador_estados}"
-                id_to_name[state_id] = state_name
-                x_node = state.find("x"); y_node = state.find("y")
-                x_pos = float(x_node.text) if x_node is not None and x_node.text else (50.0 + int(state_id) * 80)
-                y_pos = float(y_node.text) if y_node is not None and y_node.text else 50.0
-                state_data_map[state_id] = {
-                    'name': state_name, 'x': x_pos, 'y': y_pos,
-                    'is_initial': state.find("initial") is not None,
-                    'is_final': state.find("final") is not None,
-                    'output': state.find("output").text if state.find("output") is not None else ""
-                }
-            # 4. Adicionar Estados
-            for state_id, data in state_data_map.items():
-                self.positions[data['name']] = (data['x'], data['y'])
-                output_val = data['output'] if tipo_simulador == "Moore" else ""
-                if tipo_simulador == "Moore": self.automato.adicionar_estado(data['name'], data['x'], data['y'], output=output_val)
-                else: self.automato.adicionar_estado(data['name'], data['x'], data['y'])
-            # 5. Definir estados Iniciais e Finais
-            for state_id, data in state_data_map.items():
-                    if data['is_initial']: self.automato.definir_estado_inicial(data['name'])
-                    if data['is_final']:
-                        if hasattr(self.automato, 'adicionar_estado_final'): self.automato.adicionar_estado_final(data['name'])
-                        else: self.automato.alternar_estado_final(data['name'])
-            # 6. Adicionar Transições
-            transition_nodes = automaton_node.findall("transition")
-            if tipo_simulador == "AFD":
-                transitions_check = {}; is_afn = False
-                for trans in transition_nodes:
-                    from_id = trans.find("from").text
-                    read_node = trans.find("read")
-                    simbolo = EPSILON if read_node is None or read_node.text is None else read_node.text
-                    chave = (from_id, simbolo)
-                    if chave in transitions_check: is_afn = True; break
-                    transitions_check[chave] = True
-                    if simbolo == EPSILON: is_afn = True; break
-                if is_afn:
-                    print("Autômato 'fa' detectado como AFN. Recarregando como AFN.")
-                    tipo_simulador = "AFN"; self.tipo_automato.set("AFN")
-                    self.limpar_tela(save_current_state=False, reset_history=True) # <--- MODIFICADO
-                    for state_id, data in state_data_map.items():
-                        self.positions[data['name']] = (data['x'], data['y'])
-                        self.automato.adicionar_estado(data['name'], data['x'], data['y'])
-                    for state_id, data in state_data_map.items():
-                            if data['is_initial']: self.automato.definir_estado_inicial(data['name'])
-                            if data['is_final']:
-                                if hasattr(self.automato, 'adicionar_estado_final'): self.automato.adicionar_estado_final(data['name'])
-                                else: self.automato.alternar_estado_final(data['name'])
-            # Processa as transições
-            for trans in transition_nodes:
-                from_name = id_to_name.get(trans.find("from").text)
-                to_name = id_to_name.get(trans.find("to").text)
-                if not from_name or not to_name: continue 
-                if tipo_simulador in ["AFD", "AFN", "Moore"]:
-                    read_node = trans.find("read")
-                    simbolo = EPSILON if read_node is None or read_node.text is None else read_node.text
-                    self.automato.adicionar_transicao(from_name, simbolo, to_name)
-                elif tipo_simulador == "AP":
-                    read_node = trans.find("read"); pop_node = trans.find("pop"); push_node = trans.find("push")
-                    s_in = EPSILON if read_node is None or read_node.text is None else read_node.text
-                    s_pop = EPSILON if pop_node is None or pop_node.text is None else pop_node.text
-                    s_push = EPSILON if push_node is None or push_node.text is None else push_node.text
-                    self.automato.adicionar_transicao(from_name, s_in, s_pop, to_name, s_push)
-                elif tipo_simulador == "Mealy":
-                    read_node = trans.find("read"); transout_node = trans.find("transout")
-                    simbolo = EPSILON if read_node is None or read_node.text is None else read_node.text
-                    output = EPSILON if transout_node is None or transout_node.text is None else transout_node.text
-                    self.automato.adicionar_transicao(from_name, simbolo, to_name, output)
-                elif tipo_simulador == "Turing":
-                    read_node = trans.find("read"); write_node = trans.find("write"); move_node = trans.find("move")
-                    simbolo_branco_auto = self.automato.simbolo_branco
-                    lido = simbolo_branco_auto if read_node is None or read_node.text is None else read_node.text
-                    escrito = simbolo_branco_auto if write_node is None or write_node.text is None else write_node.text
-                    direcao = move_node.text if move_node is not None else "R"
-                    self.automato.adicionar_transicao(from_name, lido, to_name, escrito, direcao)
-
-            # 7. Redesenhar e Salvar Estado (MODIFICADO)
+            # Redesenhar e Salvar Estado
             self.zoom_slider.set(1.0) 
-            self.desenhar_automato()
+            self.solicitar_desenho()
             
-            # --- NOVO: Salva o estado recém-carregado no histórico ---
-            self._save_history_state()
-            self._update_history_buttons() # Atualiza botões (redo será desabilitado)
+            # O autômato carregado é a base do histórico
+            self.historico.reiniciar(self._capturar_tudo())
+            self._update_history_buttons()
             
             messagebox.showinfo("Importar JFF", f"Autômato carregado com sucesso de:\n{filepath}", parent=self.master)
 
@@ -1453,6 +1750,9 @@ class TelaPrincipal:
                 parent=self.master
             )
             if not filepath: return 
+            self.agendador.executar_agora() # O canvas precisa estar em dia (e sem o overlay de FPS) na captura
+            self.canvas.delete("overlay_fps")
+            self.canvas.update_idletasks()
             x = self.canvas.winfo_rootx(); y = self.canvas.winfo_rooty()
             x1 = x + self.canvas.winfo_width(); y1 = y + self.canvas.winfo_height()
             margin = 2 
@@ -1465,100 +1765,20 @@ class TelaPrincipal:
 
 
     def exportar_para_jff(self):
-        """Converte o autômato atual para o formato JFLAP (.jff) e salva em arquivo."""
-        # ... (Nenhuma mudança nesta função) ...
+        """Converte o autômato atual para o formato JFLAP (.jff) e salva em arquivo (a escrita fica em automato.jff)."""
         if not self.automato or not self.automato.estados:
             messagebox.showwarning("Exportar JFF", "Não há autômato para exportar.", parent=self.master)
             return
-        automato_tipo = self.tipo_automato.get().lower()
-        jflap_type = "fa" 
-        if automato_tipo == "ap": jflap_type = "pda"
-        elif automato_tipo == "turing": jflap_type = "turing"
-        elif automato_tipo in ["moore", "mealy"]: jflap_type = "mealy" 
         try:
             filepath = filedialog.asksaveasfilename(
                 defaultextension=".jff",
-                filetypes=[("JFLAP files", "*.jff"), ("All files", "*.*")],
+                filetypes=[("JFLAP files", "*.jff"), ("Instantâneo binário", "*" + EXTENSAO_BINARIO), ("All files", "*.*")],
                 title="Salvar Autômato como JFF",
                 parent=self.master
             )
             if not filepath: return 
-            root = ET.Element("structure")
-            ET.SubElement(root, "type").text = jflap_type
-            automaton_element = ET.SubElement(root, "automaton")
-            state_to_id = {name: str(i) for i, name in enumerate(self.automato.estados.keys())}
-            for name, estado in self.automato.estados.items():
-                state_id = state_to_id[name]
-                state_element = ET.SubElement(automaton_element, "state", id=state_id, name=name)
-                x_pos, y_pos = self.positions.get(name, (50.0 + int(state_id)*80, 50.0))
-                ET.SubElement(state_element, "x").text = str(float(x_pos))
-                ET.SubElement(state_element, "y").text = str(float(y_pos))
-                if estado.is_inicial: ET.SubElement(state_element, "initial")
-                if estado.is_final: ET.SubElement(state_element, "final")
-                if automato_tipo == "moore" and hasattr(estado, 'output') and estado.output:
-                        ET.SubElement(state_element, "output").text = estado.output
-            if jflap_type == "fa": # AFD/AFN
-                for (origem, simbolo), destinos in self.automato.transicoes.items():
-                    origem_id = state_to_id.get(origem)
-                    if origem_id is None: continue
-                    destinos_set = destinos if isinstance(destinos, set) else {destinos}
-                    for destino in destinos_set:
-                        destino_id = state_to_id.get(destino)
-                        if destino_id is None: continue
-                        trans_element = ET.SubElement(automaton_element, "transition")
-                        ET.SubElement(trans_element, "from").text = origem_id
-                        ET.SubElement(trans_element, "to").text = destino_id
-                        read_element = ET.SubElement(trans_element, "read")
-                        if simbolo != EPSILON: read_element.text = simbolo 
-            elif jflap_type == "pda": # AP
-                    for (origem, s_in, s_pop), destinos_push in self.automato.transicoes.items():
-                        origem_id = state_to_id.get(origem)
-                        if origem_id is None: continue
-                        for destino, s_push in destinos_push:
-                            destino_id = state_to_id.get(destino)
-                            if destino_id is None: continue
-                            trans_element = ET.SubElement(automaton_element, "transition")
-                            ET.SubElement(trans_element, "from").text = origem_id
-                            ET.SubElement(trans_element, "to").text = destino_id
-                            read_element = ET.SubElement(trans_element, "read")
-                            if s_in != EPSILON: read_element.text = s_in
-                            pop_element = ET.SubElement(trans_element, "pop")
-                            if s_pop != EPSILON: pop_element.text = s_pop
-                            push_element = ET.SubElement(trans_element, "push")
-                            if s_push != EPSILON: push_element.text = s_push
-            elif jflap_type == "turing": # Turing
-                    simbolo_branco_automato = getattr(self.automato, 'simbolo_branco', 'B') 
-                    for (origem, lido), (destino, escrito, direcao) in self.automato.transicoes.items():
-                        origem_id = state_to_id.get(origem)
-                        destino_id = state_to_id.get(destino)
-                        if origem_id is None or destino_id is None: continue
-                        trans_element = ET.SubElement(automaton_element, "transition")
-                        ET.SubElement(trans_element, "from").text = origem_id
-                        ET.SubElement(trans_element, "to").text = destino_id
-                        read_element = ET.SubElement(trans_element, "read")
-                        if lido != simbolo_branco_automato: read_element.text = lido
-                        write_element = ET.SubElement(trans_element, "write")
-                        if escrito != simbolo_branco_automato: write_element.text = escrito
-                        move_element = ET.SubElement(trans_element, "move")
-                        move_element.text = direcao
-            elif jflap_type == "mealy": # Mealy (e Moore)
-                    for (origem, simbolo), (destino, output) in self.automato.transicoes.items():
-                        origem_id = state_to_id.get(origem)
-                        destino_id = state_to_id.get(destino)
-                        if origem_id is None or destino_id is None: continue
-                        trans_element = ET.SubElement(automaton_element, "transition")
-                        ET.SubElement(trans_element, "from").text = origem_id
-                        ET.SubElement(trans_element, "to").text = destino_id
-                        read_element = ET.SubElement(trans_element, "read")
-                        if simbolo != EPSILON: read_element.text = simbolo
-                        output_element = ET.SubElement(trans_element, "transout") 
-                        if output != EPSILON: output_element.text = output
-            xml_str = ET.tostring(root, encoding='unicode')
-            dom = minidom.parseString(xml_str)
-            pretty_xml_str = dom.toprettyxml(indent="  ")
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n')
-                f.write(pretty_xml_str.split('\n', 1)[1])
+            if filepath.endswith(EXTENSAO_BINARIO): salvar_binario(self.automato, filepath, tipo=self.tipo_automato.get(), posicoes=self.positions)
+            else: salvar_jff(self.automato, filepath, tipo=self.tipo_automato.get(), posicoes=self.positions)
             messagebox.showinfo("Exportar JFF", f"Autômato salvo como JFF em:\n{filepath}", parent=self.master)
         except Exception as e: 
             messagebox.showerror("Erro ao Exportar JFF", f"Ocorreu um erro:\n{e}", parent=self.master)
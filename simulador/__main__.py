@@ -0,0 +1,84 @@
+# Arquivo: simulador_de_automatos/simulador/__main__.py
+"""
+Execução sem interface gráfica:
+
+    python -m simulador automato.jff [cadeia ...] [-e entradas.txt] [-p processos]
+    python -m simulador automato.jff --salvar-binario automato.autb
+
+O autômato pode ser um .jff ou um instantâneo binário (.autb, ver automato.binario), bem mais rápido de abrir.
+
+As cadeias vêm dos argumentos, de um arquivo (-e, uma por linha; '-' é a entrada padrão)
+ou, se nenhuma for informada, da entrada padrão. Cada veredito é escrito como uma linha JSON.
+Este módulo não importa tkinter, customtkinter nem PIL.
+"""
+import argparse
+import json
+import os
+import sys
+from itertools import chain
+from automato.jff import carregar_jff
+from automato.binario import EXTENSAO_BINARIO, carregar_binario, salvar_binario
+from simulador.lote import MAX_PASSOS_AP, executar_lote
+from simulador.simulador_passos import SimuladorAP
+
+def _linhas(arquivo):
+    for linha in arquivo:
+        yield linha.rstrip("\r\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m simulador", description="Simula um autômato JFLAP (.jff) sem interface gráfica.")
+    parser.add_argument("arquivo", help="arquivo .jff (ou .autb) do autômato")
+    parser.add_argument("cadeias", nargs="*", help="cadeias de entrada (padrão: lidas da entrada padrão)")
+    parser.add_argument("-e", "--entradas", help="arquivo com uma cadeia por linha ('-' para a entrada padrão)")
+    parser.add_argument("-p", "--processos", type=int, default=1, help="processos trabalhadores (0 usa todos os núcleos; padrão: 1)")
+    parser.add_argument("--max-passos", type=int, default=None,
+                        help=f"limite de passos por cadeia (AP, MT, Moore/Mealy; padrão: o de cada motor, {MAX_PASSOS_AP} no AP; 0 desativa)")
+    parser.add_argument("--tempo-limite", type=float, default=None, help="limite de tempo por cadeia, em segundos")
+    parser.add_argument("--ap-gramatica", action="store_true",
+                        help="decide AP pela gramática equivalente (Earley, sempre termina) em vez da busca de configurações")
+    parser.add_argument("--estrategia", choices=SimuladorAP.ESTRATEGIAS, default="largura",
+                        help="estratégia da busca de configurações do AP (padrão: largura)")
+    parser.add_argument("--estatisticas", action="store_true", help="mostra na saída de erro o tempo e a vazão (elementos/s) da leitura do .jff")
+    parser.add_argument("--salvar-binario", metavar="DESTINO", help="grava o autômato no formato binário (.autb) e termina")
+    args = parser.parse_args(argv)
+
+    estatisticas = {}
+    try:
+        if args.arquivo.endswith(EXTENSAO_BINARIO): _, automato = carregar_binario(args.arquivo)
+        else: _, automato = carregar_jff(args.arquivo, estatisticas)
+    except (OSError, ValueError, SyntaxError) as e: # ET.ParseError é subclasse de SyntaxError
+        print(f"Erro ao carregar '{args.arquivo}': {e}", file=sys.stderr)
+        return 2
+    if args.estatisticas and estatisticas:
+        print(f"Leitura: {estatisticas['elementos']} elementos em {estatisticas['segundos']:.3f} s "
+              f"({estatisticas['elementos_por_segundo']:.0f} elementos/s)", file=sys.stderr)
+    if args.salvar_binario:
+        salvar_binario(automato, args.salvar_binario)
+        return 0
+
+    arquivo_entradas = None
+    if args.entradas and args.entradas != "-":
+        arquivo_entradas = open(args.entradas, encoding="utf-8")
+        cadeias = _linhas(arquivo_entradas)
+    elif args.entradas == "-" or not args.cadeias:
+        cadeias = _linhas(sys.stdin)
+    else:
+        cadeias = args.cadeias
+    if args.entradas and args.cadeias:
+        cadeias = chain(args.cadeias, cadeias)
+
+    try:
+        for veredito in executar_lote(automato, cadeias, processos=args.processos or None,
+                                      max_passos=args.max_passos, tempo_limite=args.tempo_limite,
+                                      motor_ap="gramatica" if args.ap_gramatica else "busca", estrategia=args.estrategia):
+            sys.stdout.write(json.dumps(veredito, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+    except BrokenPipeError: # Ex.: saída ligada a 'head'; evita o erro ao fechar o stdout na saída
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if arquivo_entradas: arquivo_entradas.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# Arquivo: simulador_de_automatos/simulador/ciclos.py
+MODULO = (1 << 61) - 1 # Primo de Mersenne
+BASE = 0x2545F4914F6CDD1D % MODULO
+BASE_INVERSA = pow(BASE, -1, MODULO)
+# Inverso de (fator - 1) para somar a progressão geométrica de uma varredura em cada sentido
+_INVERSO_SOMA = {1: pow(BASE - 1, -1, MODULO), -1: pow(BASE_INVERSA - 1, -1, MODULO)}
+
+class HashFita:
+    """
+    Hash polinomial da fita: soma de codigo(simbolo) * BASE^posicao (mod MODULO) sobre as células.
+    O branco vale 0, então células nunca escritas e brancos escritos contam igual.
+    Guarda também BASE^cabecote, para que cada passo (escrever e mover) custe O(1).
+    """
+    __slots__ = ("branco", "codigos", "valor", "potencia")
+
+    def __init__(self, conteudo, branco):
+        self.branco = branco
+        self.codigos = {branco: 0}
+        self.valor = 0
+        potencia = 1
+        for simbolo in conteudo:
+            self.valor = (self.valor + self.codigo(simbolo) * potencia) % MODULO
+            potencia = potencia * BASE % MODULO
+        self.potencia = 1 # Cabeçote na posição 0
+
+    def codigo(self, simbolo):
+        codigo = self.codigos.get(simbolo)
+        if codigo is None: codigo = self.codigos[simbolo] = hash(simbolo) % (MODULO - 1) + 1
+        return codigo
+
+    def passo(self, lido, escrito, sentido):
+        """Troca 'lido' por 'escrito' no cabeçote e move 'sentido' (+1, -1 ou 0) células."""
+        if escrito != lido:
+            self.valor = (self.valor + (self.codigo(escrito) - self.codigo(lido)) * self.potencia) % MODULO
+        if sentido > 0: self.potencia = self.potencia * BASE % MODULO
+        elif sentido < 0: self.potencia = self.potencia * BASE_INVERSA % MODULO
+
+    def varrer(self, lido, escrito, k, sentido):
+        """k passos seguidos que leem 'lido', escrevem 'escrito' e movem no mesmo sentido (um macro-passo)."""
+        fator = BASE if sentido > 0 else BASE_INVERSA
+        salto = pow(fator, k, MODULO)
+        if escrito != lido:
+            soma = (salto - 1) * _INVERSO_SOMA[sentido] % MODULO # fator^0 + ... + fator^(k-1)
+            self.valor = (self.valor + (self.codigo(escrito) - self.codigo(lido)) * self.potencia * soma) % MODULO
+        self.potencia = self.potencia * salto % MODULO
+
+
+class DetectorCiclos:
+    """
+    Detecção de ciclos de Brent sobre as configurações (estado, cabeçote, fita) de uma MT determinística.
+    Guarda uma configuração de referência, trocada sempre que a distância até ela chega a uma potência de 2.
+    Quando a impressão digital atual (estado, cabeçote, HashFita) coincide com a da referência, as fitas são
+    comparadas por inteiro: um ciclo informado é sempre real, e uma MT que repete uma configuração nunca para.
+    Memória O(tamanho da fita); custo amortizado O(1) por configuração.
+    """
+    def __init__(self, branco):
+        self.branco = branco
+        self.potencia = 1
+        self.distancia = 0
+        self.chave = None
+        self.passos_salvo = None
+        self.fita_salva = None
+
+    def _normalizar(self, fita):
+        """(posição do primeiro símbolo não branco, símbolos até o último não branco) da fita."""
+        simbolos = fita.fatia(fita.inicio, fita.fim)
+        a, b = 0, len(simbolos)
+        while a < b and simbolos[a] == self.branco: a += 1
+        while b > a and simbolos[b - 1] == self.branco: b -= 1
+        return (fita.inicio + a if a < b else 0, tuple(simbolos[a:b]))
+
+    def verificar(self, estado, cabecote, hash_fita, fita, passos):
+        """Registra a configuração do passo 'passos'; retorna o passo em que ela já tinha ocorrido, ou None."""
+        chave = (estado, cabecote, hash_fita)
+        if chave == self.chave and self._normalizar(fita) == self.fita_salva: return self.passos_salvo
+        self.distancia += 1
+        if self.distancia >= self.potencia:
+            self.potencia *= 2
+            self.distancia = 0
+            self.chave, self.passos_salvo, self.fita_salva = chave, passos, self._normalizar(fita)
+        return None
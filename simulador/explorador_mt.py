@@ -0,0 +1,210 @@
+# Arquivo: simulador_de_automatos/simulador/explorador_mt.py
+import time
+from collections import deque
+from automato.maquina_turing import MaquinaTuringMultifita, MaquinaTuringND
+from simulador.pilha_persistente import TabelaPilhas
+from simulador.fita import formatar_janela
+
+MOTIVOS = {
+    "aceita": "Cadeia aceita! Um dos ramos chegou a um estado final.",
+    "esgotada": "Todos os ramos pararam (ou repetiram configurações) sem chegar a um estado final.",
+    "limite_passos": "Simulação interrompida (limite de passos atingido - possível loop infinito).",
+    "limite_tempo": "Simulação interrompida (limite de tempo atingido).",
+    "limite_configuracoes": "Simulação interrompida (limite de configurações pendentes atingido).",
+}
+# Ordem de prioridade ao juntar os motivos das subárvores exploradas em paralelo
+_PRIORIDADE = ("aceita", "limite_tempo", "limite_passos", "limite_configuracoes", "esgotada")
+
+
+class ExploradorMT:
+    """
+    Busca em largura nas configurações de uma MT (de uma fita, multifita ou não determinística).
+    Cada fita é um zíper (esquerda, símbolo do cabeçote, direita): as duas metades são pilhas persistentes
+    da TabelaPilhas, com o topo junto ao cabeçote. Um passo troca só os topos, então os ramos compartilham
+    todo o resto da fita (cópia na escrita) e cada passo custa O(número de fitas).
+    Um branco empilhado numa pilha vazia não é guardado, o que deixa cada fita com uma única representação:
+    configurações iguais têm os mesmos nós, e o conjunto de visitadas descarta as repetidas pela identidade.
+    Limites (None desativa): max_passos (configurações expandidas), max_configuracoes (fronteira) e tempo_limite (segundos).
+    """
+    def __init__(self, automato, cadeia, max_passos=100_000, max_configuracoes=None, tempo_limite=None):
+        self.automato = automato
+        self.cadeia = cadeia
+        self.multifita = isinstance(automato, MaquinaTuringMultifita) # Chaves e valores das transições em tuplas
+        self.num_fitas = automato.num_fitas if self.multifita else 1
+        self.nao_deterministica = isinstance(automato, MaquinaTuringND)
+        self.max_passos = max_passos
+        self.max_configuracoes = max_configuracoes
+        self.tempo_limite = tempo_limite
+        self.pilhas = TabelaPilhas()
+        self.passos = 0
+        self.motivo_parada = None
+
+    # --- Configurações ---
+    def configuracao_inicial(self):
+        branco = self.automato.simbolo_branco
+        vazia = self.pilhas.vazia
+        direita = vazia
+        for simbolo in reversed(self.cadeia[1:]): direita = self._empilhar(direita, simbolo)
+        entrada = (vazia, self.cadeia[0] if self.cadeia else branco, direita)
+        return (self.automato.estado_inicial.nome, (entrada,) + ((vazia, branco, vazia),) * (self.num_fitas - 1))
+
+    def _empilhar(self, pilha, simbolo):
+        if simbolo == self.automato.simbolo_branco and not pilha: return pilha
+        return self.pilhas.empilhar(pilha, simbolo)
+
+    def _mover(self, esquerda, escrito, direita, direcao):
+        """Zíper de uma fita depois de escrever 'escrito' no cabeçote e mover em 'direcao'."""
+        if direcao == 'R':
+            if direita: return (self._empilhar(esquerda, escrito), direita.topo, direita.abaixo)
+            return (self._empilhar(esquerda, escrito), self.automato.simbolo_branco, direita)
+        if direcao == 'L':
+            if esquerda: return (esquerda.abaixo, esquerda.topo, self._empilhar(direita, escrito))
+            return (esquerda, self.automato.simbolo_branco, self._empilhar(direita, escrito))
+        return (esquerda, escrito, direita)
+
+    def _escolhas(self, estado, lidos):
+        """Transições (destino, escritos, direcoes) aplicáveis, já no formato multifita."""
+        if not self.multifita:
+            escolha = self.automato.transicoes.get((estado, lidos[0]))
+            if escolha is None: return ()
+            destino, escrito, direcao = escolha
+            return ((destino, (escrito,), (direcao,)),)
+        escolhas = self.automato.transicoes.get((estado, lidos))
+        if escolhas is None: return ()
+        return escolhas if self.nao_deterministica else (escolhas,)
+
+    def sucessores(self, configuracao):
+        estado, fitas = configuracao
+        for destino, escritos, direcoes in self._escolhas(estado, tuple(fita[1] for fita in fitas)):
+            yield (destino, tuple(self._mover(esquerda, escrito, direita, direcao)
+                                  for (esquerda, _, direita), escrito, direcao in zip(fitas, escritos, direcoes)))
+
+    def fitas_texto(self, fitas, raio=20):
+        """Janela de cada fita em torno do seu cabeçote, uma fita por linha."""
+        branco = self.automato.simbolo_branco
+        linhas = []
+        for esquerda, simbolo, direita in fitas:
+            a = [s for _, s in zip(range(raio), esquerda)]
+            d = [s for _, s in zip(range(raio), direita)]
+            linhas.append(formatar_janela([branco] * (raio - len(a)) + a[::-1], simbolo, d + [branco] * (raio - len(d))))
+        return "\n".join(linhas)
+
+    # --- Busca ---
+    def _e_final(self, estado):
+        return estado in self.automato.estados and self.automato.estados[estado] in self.automato.estados_finais
+
+    def explorar(self, iniciais=None, gerar_passos=True):
+        """
+        Gerador da busca a partir de 'iniciais' (por padrão, a configuração inicial). Com gerar_passos, produz um
+        passo "executando" por configuração expandida; sempre termina com o passo final ("aceita" ou "rejeita",
+        com "motivo"), que também fica em self.motivo_parada.
+        """
+        if not self.automato.estado_inicial:
+            yield {"status": "erro", "mensagem": "Estado inicial não definido."}; return
+        fronteira = deque(iniciais if iniciais is not None else [self.configuracao_inicial()])
+        visitadas = set(fronteira)
+        prazo = time.perf_counter() + self.tempo_limite if self.tempo_limite is not None else None
+        motivo = "esgotada"
+        while fronteira:
+            if self.max_passos is not None and self.passos >= self.max_passos: motivo = "limite_passos"; break
+            if prazo is not None and time.perf_counter() > prazo: motivo = "limite_tempo"; break
+            configuracao = fronteira.popleft()
+            self.passos += 1
+            estado, fitas = configuracao
+            if self._e_final(estado):
+                self.motivo_parada = "aceita"
+                yield {"status": "aceita", "mensagem": MOTIVOS["aceita"], "estado_atual": {estado}, "tape": self.fitas_texto(fitas),
+                       "transicao_ativa": set(), "passos": self.passos, "motivo": "aceita"}
+                return
+            if gerar_passos:
+                yield {"status": "executando", "estado_atual": {estado}, "tape": self.fitas_texto(fitas),
+                       "transicao_ativa": set(), "ramos": len(fronteira) + 1}
+            for sucessor in self.sucessores(configuracao):
+                if sucessor not in visitadas:
+                    visitadas.add(sucessor)
+                    fronteira.append(sucessor)
+            if self.max_configuracoes is not None and len(fronteira) > self.max_configuracoes: motivo = "limite_configuracoes"; break
+        self.motivo_parada = motivo
+        yield {"status": "rejeita", "mensagem": MOTIVOS[motivo], "passos": self.passos, "motivo": motivo}
+
+    def decidir(self, processos=1):
+        """
+        Veredito da busca, sem passos intermediários: o passo final de explorar().
+        processos > 1 expande a árvore em largura até ter ramos para todos e explora as subárvores em processos
+        separados, em tarefas de alguns ramos cada; quando um ramo aceita, as tarefas ainda não iniciadas são canceladas.
+        Cada tarefa tem seus próprios limites e visitadas.
+        """
+        if processos <= 1 or not self.automato.estado_inicial:
+            for ultimo in self.explorar(gerar_passos=False): pass
+            return ultimo
+
+        # Fronteira inicial em largura, com os mesmos testes da busca completa
+        fronteira = [self.configuracao_inicial()]
+        visitadas = set(fronteira)
+        while fronteira and len(fronteira) < 4 * processos:
+            proxima = []
+            for configuracao in fronteira:
+                self.passos += 1
+                if self._e_final(configuracao[0]):
+                    self.motivo_parada = "aceita"
+                    return {"status": "aceita", "mensagem": MOTIVOS["aceita"], "estado_atual": {configuracao[0]},
+                            "tape": self.fitas_texto(configuracao[1]), "passos": self.passos, "motivo": "aceita"}
+                for sucessor in self.sucessores(configuracao):
+                    if sucessor not in visitadas:
+                        visitadas.add(sucessor)
+                        proxima.append(sucessor)
+            fronteira = proxima
+            if self.max_passos is not None and self.passos >= self.max_passos: break
+        if not fronteira or (self.max_passos is not None and self.passos >= self.max_passos):
+            self.motivo_parada = "limite_passos" if fronteira else "esgotada"
+            return {"status": "rejeita", "mensagem": MOTIVOS[self.motivo_parada], "passos": self.passos, "motivo": self.motivo_parada}
+
+        # Importado só aqui, como no lote
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        limites = {"max_passos": self.max_passos, "max_configuracoes": self.max_configuracoes, "tempo_limite": self.tempo_limite}
+        tarefas = 4 * processos
+        grupos = [[_serializar(c) for c in fronteira[i::tarefas]] for i in range(tarefas)]
+        motivos = []
+        # Sem 'with': ao sair do bloco o pool esperaria as subárvores em andamento, e o aceite antecipado não ganharia tempo
+        executor = ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_trabalhador,
+                                       initargs=(self.automato, self.cadeia, limites))
+        concluido = False
+        try:
+            futuros = [executor.submit(_explorar_subarvores, grupo) for grupo in grupos if grupo]
+            for futuro in as_completed(futuros):
+                ultimo = futuro.result()
+                self.passos += ultimo.get("passos", 0)
+                motivos.append(ultimo["motivo"])
+                if ultimo["motivo"] == "aceita":
+                    self.motivo_parada = "aceita"
+                    return dict(ultimo, passos=self.passos)
+            concluido = True
+        finally:
+            # No aceite (ou num erro), cancela as tarefas não iniciadas e retorna sem esperar as que ainda rodam
+            executor.shutdown(wait=concluido, cancel_futures=not concluido)
+        self.motivo_parada = min(motivos, key=_PRIORIDADE.index)
+        return {"status": "rejeita", "mensagem": MOTIVOS[self.motivo_parada], "passos": self.passos, "motivo": self.motivo_parada}
+
+
+# --- Execução em vários processos ---
+# Os nós das pilhas não atravessam processos: as configurações viajam como tuplas simples e são reconstruídas
+# na TabelaPilhas do trabalhador. Como no lote, a máquina é enviada uma única vez, no inicializador do pool.
+_explorador_trabalhador = None
+
+def _serializar(configuracao):
+    estado, fitas = configuracao
+    return (estado, tuple((tuple(esquerda), simbolo, tuple(direita)) for esquerda, simbolo, direita in fitas))
+
+def _inicializar_trabalhador(automato, cadeia, limites):
+    global _explorador_trabalhador
+    _explorador_trabalhador = ExploradorMT(automato, cadeia, **limites)
+
+def _explorar_subarvores(configuracoes):
+    explorador = _explorador_trabalhador
+    explorador.passos = 0
+    pilhas = explorador.pilhas
+    iniciais = [(estado, tuple((pilhas.empilhar_cadeia(pilhas.vazia, esquerda), simbolo, pilhas.empilhar_cadeia(pilhas.vazia, direita))
+                               for esquerda, simbolo, direita in fitas))
+                for estado, fitas in configuracoes]
+    for ultimo in explorador.explorar(iniciais, gerar_passos=False): pass
+    return ultimo
@@ -0,0 +1,214 @@
+# Arquivo: simulador_de_automatos/simulador/fita.py
+
+def formatar_janela(esquerda, atual, direita):
+    """Texto de uma janela da fita: células à esquerda, a do cabeçote entre colchetes e as à direita."""
+    texto = f"[{atual}]"
+    if esquerda: texto = " " + "  ".join(esquerda) + " " + texto
+    if direita: texto = texto + " " + "  ".join(direita) + " "
+    return texto.strip()
+
+
+class Fita:
+    """
+    Fita infinita nos dois sentidos sobre um buffer contíguo (lista de símbolos) que cresce geometricamente
+    para a esquerda e para a direita. A posição p fica em celulas[p + deslocamento].
+    Ler fora do buffer devolve o branco sem alocar; escrever fora dobra o buffer do lado necessário,
+    então cada escrita custa O(1) amortizado. Os limites das células usadas (inicio, fim) também são O(1).
+    """
+    __slots__ = ("branco", "celulas", "deslocamento", "inicio", "fim")
+
+    def __init__(self, conteudo="", branco="☐"):
+        self.branco = branco
+        self.celulas = list(conteudo) or [branco]
+        self.deslocamento = 0
+        # Menor e maior posição já escritas (ou ocupadas pela entrada); fim < inicio indica fita vazia
+        self.inicio = 0
+        self.fim = len(conteudo) - 1
+
+    def __len__(self):
+        """Número de células entre a primeira e a última usadas."""
+        return max(self.fim - self.inicio + 1, 0)
+
+    def __getitem__(self, posicao):
+        i = posicao + self.deslocamento
+        if 0 <= i < len(self.celulas): return self.celulas[i]
+        return self.branco
+
+    def __setitem__(self, posicao, simbolo):
+        i = posicao + self.deslocamento
+        if i < 0:
+            self._crescer_esquerda(-i)
+            i = posicao + self.deslocamento
+        elif i >= len(self.celulas):
+            self._crescer_direita(i - len(self.celulas) + 1)
+        self.celulas[i] = simbolo
+        if self.fim < self.inicio: self.inicio = self.fim = posicao
+        elif posicao < self.inicio: self.inicio = posicao
+        elif posicao > self.fim: self.fim = posicao
+
+    def _crescer_esquerda(self, minimo):
+        extra = max(minimo, len(self.celulas))
+        self.celulas[:0] = [self.branco] * extra
+        self.deslocamento += extra
+
+    def _crescer_direita(self, minimo):
+        self.celulas.extend([self.branco] * max(minimo, len(self.celulas)))
+
+    def fatia(self, inicio, fim):
+        """Símbolos das posições inicio..fim (inclusive), com brancos fora do buffer."""
+        if fim < inicio: return []
+        a, b = inicio + self.deslocamento, fim + self.deslocamento + 1
+        n = len(self.celulas)
+        if 0 <= a and b <= n: return self.celulas[a:b]
+        esquerda = [self.branco] * min(max(-a, 0), b - a)
+        direita = [self.branco] * min(max(b - n, 0), b - a)
+        return esquerda + self.celulas[max(a, 0):max(min(b, n), 0)] + direita
+
+    def conteudo(self):
+        """Conteúdo entre a primeira e a última célula usadas."""
+        return "".join(self.fatia(self.inicio, self.fim))
+
+    def janela(self, cabecote, raio=20):
+        """Texto das células cabecote-raio..cabecote+raio, com o cabeçote destacado entre colchetes."""
+        return formatar_janela(self.fatia(cabecote - raio, cabecote - 1), self[cabecote], self.fatia(cabecote + 1, cabecote + raio))
+
+
+class FitaRLE:
+    """
+    Fita em corridas (símbolo, comprimento) com um cursor no cabeçote, usada pelos macro-passos da MT:
+    varrer uma corrida inteira de símbolos iguais custa O(1) em vez de O(comprimento).
+    As corridas cobrem as posições base..base+total-1 e são sempre maximais (vizinhas têm símbolos diferentes);
+    fora delas a fita é branca. O cabeçote está na corrida 'r', no deslocamento 'o', na posição 'posicao'.
+    """
+    __slots__ = ("branco", "simbolos", "comprimentos", "base", "r", "o", "posicao", "inicio", "fim")
+
+    def __init__(self, conteudo="", branco="☐"):
+        self.branco = branco
+        self.simbolos, self.comprimentos = [], []
+        for simbolo in conteudo:
+            if self.simbolos and self.simbolos[-1] == simbolo: self.comprimentos[-1] += 1
+            else: self.simbolos.append(simbolo); self.comprimentos.append(1)
+        if not self.simbolos: self.simbolos, self.comprimentos = [branco], [1]
+        self.base = 0
+        self.r = self.o = self.posicao = 0
+        self.inicio, self.fim = 0, len(conteudo) - 1 # Como na Fita: fim < inicio indica fita vazia
+
+    def ler(self):
+        return self.simbolos[self.r]
+
+    def corrida(self, direcao):
+        """Células a partir do cabeçote (inclusive), no sentido 'direcao' (+1/-1), com o símbolo lido; inf na borda branca."""
+        simbolos, r = self.simbolos, self.r
+        if direcao > 0:
+            if r == len(simbolos) - 1 and simbolos[r] == self.branco: return float("inf")
+            return self.comprimentos[r] - self.o
+        if r == 0 and simbolos[0] == self.branco: return float("inf")
+        return self.o + 1
+
+    def _estender_direita(self, minimo):
+        extra = max(minimo, sum(self.comprimentos), 16) # Crescimento geométrico, como na Fita
+        if self.simbolos[-1] == self.branco: self.comprimentos[-1] += extra
+        else: self.simbolos.append(self.branco); self.comprimentos.append(extra)
+
+    def _estender_esquerda(self, minimo):
+        extra = max(minimo, sum(self.comprimentos), 16)
+        if self.simbolos[0] == self.branco:
+            self.comprimentos[0] += extra
+            if self.r == 0: self.o += extra
+        else:
+            self.simbolos.insert(0, self.branco); self.comprimentos.insert(0, extra)
+            self.r += 1
+        self.base -= extra
+
+    def _marcar(self, a, b):
+        """Atualiza os limites usados com as posições a..b escritas."""
+        if self.fim < self.inicio: self.inicio, self.fim = a, b
+        else:
+            if a < self.inicio: self.inicio = a
+            if b > self.fim: self.fim = b
+
+    def preencher(self, simbolo, k, direcao):
+        """
+        Escreve 'simbolo' em k células a partir do cabeçote, no sentido 'direcao' (+1/-1), e move o cabeçote k células.
+        As k células devem estar na corrida do cabeçote (ver corrida); direcao 0 escreve uma célula sem mover.
+        """
+        simbolos, comprimentos = self.simbolos, self.comprimentos
+        r, o = self.r, self.o
+        if direcao > 0:
+            if o + k > comprimentos[r]: # Corrida branca da borda: estende antes de escrever
+                self._estender_direita(o + k - comprimentos[r] + 1)
+            primeiro = o # Deslocamento, na corrida r, da primeira célula escrita (a mais à esquerda)
+            self._marcar(self.posicao, self.posicao + k - 1)
+        elif direcao < 0:
+            if k > o + 1:
+                self._estender_esquerda(k - o)
+                r, o = self.r, self.o
+            primeiro = o - k + 1
+            self._marcar(self.posicao - k + 1, self.posicao)
+        else:
+            primeiro = o
+            self._marcar(self.posicao, self.posicao)
+
+        if simbolos[r] != simbolo: # Divide a corrida e junta a parte escrita às vizinhas de mesmo símbolo
+            antigo, total = simbolos[r], comprimentos[r]
+            resto = total - primeiro - k
+            novos_s, novos_c = [], []
+            if primeiro: novos_s.append(antigo); novos_c.append(primeiro)
+            m = r + len(novos_s)
+            novos_s.append(simbolo); novos_c.append(k)
+            if resto: novos_s.append(antigo); novos_c.append(resto)
+            simbolos[r:r + 1] = novos_s
+            comprimentos[r:r + 1] = novos_c
+            primeiro = 0
+            if m == r and m > 0 and simbolos[m - 1] == simbolo: # Sem parte à esquerda: junta com a corrida anterior
+                primeiro = comprimentos[m - 1]
+                comprimentos[m - 1] += comprimentos[m]
+                del simbolos[m], comprimentos[m]
+                m -= 1
+            if not resto and m + 1 < len(simbolos) and simbolos[m + 1] == simbolo:
+                comprimentos[m] += comprimentos[m + 1]
+                del simbolos[m + 1], comprimentos[m + 1]
+            r = m
+        # Move o cabeçote: para depois da última célula escrita (direita) ou antes da primeira (esquerda)
+        if direcao > 0:
+            o = primeiro + k
+            if o == comprimentos[r]:
+                if r == len(simbolos) - 1: self._estender_direita(1) # Pode só alongar a corrida r, se for branca
+                if o == comprimentos[r]: r, o = r + 1, 0
+            self.posicao += k
+        elif direcao < 0:
+            o = primeiro - 1
+            if o < 0:
+                if r == 0:
+                    self.r, self.o = 0, primeiro
+                    self._estender_esquerda(1) # Desloca o cursor se alongar a corrida 0 ou inserir uma antes dela
+                    r, o = self.r, self.o - 1
+                if o < 0: r, o = r - 1, comprimentos[r - 1] - 1
+            self.posicao -= k
+        else:
+            o = primeiro
+        self.r, self.o = r, o
+
+    def __getitem__(self, posicao):
+        i = posicao - self.base
+        if i < 0: return self.branco
+        for simbolo, comprimento in zip(self.simbolos, self.comprimentos):
+            if i < comprimento: return simbolo
+            i -= comprimento
+        return self.branco
+
+    def fatia(self, inicio, fim):
+        """Símbolos das posições inicio..fim (inclusive), com brancos fora das corridas."""
+        if fim < inicio: return []
+        resultado = [self.branco] * max(min(self.base, fim + 1) - inicio, 0)
+        posicao = self.base
+        for simbolo, comprimento in zip(self.simbolos, self.comprimentos):
+            a, b = max(posicao, inicio), min(posicao + comprimento - 1, fim)
+            if a <= b: resultado.extend([simbolo] * (b - a + 1))
+            posicao += comprimento
+            if posicao > fim: break
+        resultado.extend([self.branco] * (fim - inicio + 1 - len(resultado)))
+        return resultado
+
+    conteudo = Fita.conteudo
+    janela = Fita.janela
@@ -0,0 +1,195 @@
+# Arquivo: simulador_de_automatos/simulador/lote.py
+import os
+import time
+from collections import deque
+from itertools import islice
+from automato.automato_finito import AFD, AFN
+from automato.automato_pilha import AutomatoPilha
+from automato.maquinas_moore_mealy import MaquinaMoore, MaquinaMealy
+from automato.maquina_turing import MaquinaTuring, MaquinaTuringMultifita
+from simulador.simulador_passos import SimuladorAP, SimuladorAPGramatica, SimuladorMoore, SimuladorMealy, SimuladorMT
+from simulador.explorador_mt import ExploradorMT
+
+# Autômatos sem caminho compilado (nem execução rápida, como a MT) são executados drenando o gerador do simulador passo a passo;
+# esses simuladores não têm limites próprios, então os limites do lote são aplicados por _drenar
+SIMULADORES = {
+    AutomatoPilha: SimuladorAP,
+    MaquinaMoore: SimuladorMoore,
+    MaquinaMealy: SimuladorMealy,
+}
+
+# Limite de passos da busca do AP quando o lote não informa um: um AP que empilha em ε-transições sem fim
+# gera configurações novas para sempre, e uma única cadeia assim travaria o lote inteiro
+MAX_PASSOS_AP = 100_000
+SEM_LIMITE = 0 # max_passos=SEM_LIMITE desativa o limite de passos (sem ele, cada motor usa o seu padrão)
+
+def verificar_cadeia(automato, cadeia, max_passos=None, tempo_limite=None, motor_ap="busca", estrategia="largura"):
+    """
+    Executa uma cadeia sem gerar passos para a GUI e retorna o veredito como dicionário:
+    {"cadeia", "status", "aceita", "mensagem", "passos"}, mais "output" (Moore/Mealy), "tape" (MT) ou "motivo" (AP).
+    AFD e AFN usam os motores compilados; os demais respeitam os limites de passos e de tempo (segundos).
+    Sem max_passos, o AP usa MAX_PASSOS_AP e a MT, o limite do simulador; max_passos=SEM_LIMITE desativa o limite.
+    motor_ap: "busca" (SimuladorAP) ou "gramatica" (SimuladorAPGramatica, Earley sobre a gramática equivalente).
+    estrategia: estratégia de busca do SimuladorAP (ver SimuladorAP.ESTRATEGIAS).
+    """
+    if isinstance(automato, AFD): return _verificar_afd(automato, cadeia)
+    if isinstance(automato, AFN): return _verificar_afn(automato, cadeia)
+    if isinstance(automato, MaquinaTuringMultifita): return _verificar_mt_multifita(automato, cadeia, max_passos, tempo_limite)
+    if isinstance(automato, MaquinaTuring): return _verificar_mt(automato, cadeia, max_passos, tempo_limite)
+    if isinstance(automato, AutomatoPilha): return _verificar_ap(automato, cadeia, max_passos, tempo_limite, motor_ap, estrategia)
+
+    classe_simulador = next((s for classe, s in SIMULADORES.items() if isinstance(automato, classe)), None)
+    if classe_simulador is None:
+        raise TypeError(f"Tipo de autômato não suportado: {type(automato).__name__}")
+    return _drenar(classe_simulador(automato, cadeia), cadeia, max_passos or None, tempo_limite)
+
+
+def _drenar(simulador, cadeia, max_passos=None, tempo_limite=None):
+    """Consome o gerador do simulador até o veredito, cortando a execução em max_passos passos ou tempo_limite segundos."""
+    prazo = time.perf_counter() + tempo_limite if tempo_limite is not None else None
+    ultimo = None
+    passos = 0
+    for passo in simulador.gerador:
+        ultimo = passo
+        if passo.get("status") != "executando": break
+        passos += 1
+        if max_passos is not None and passos >= max_passos:
+            ultimo = dict(passo, status="limite", mensagem="Limite de passos do lote atingido.")
+            break
+        if prazo is not None and time.perf_counter() > prazo:
+            ultimo = dict(passo, status="limite", mensagem="Limite de tempo do lote atingido.")
+            break
+
+    if ultimo is None: ultimo = {"status": "erro", "mensagem": "A simulação não produziu nenhum passo."}
+    veredito = {"cadeia": cadeia, "status": ultimo["status"], "aceita": ultimo["status"] == "aceita",
+                "mensagem": ultimo.get("mensagem", ""), "passos": passos}
+    if "output" in ultimo: veredito["output"] = ultimo["output"]
+    if "tape" in ultimo: veredito["tape"] = ultimo["tape"]
+    if "motivo" in ultimo: veredito["motivo"] = ultimo["motivo"] # AP: por que a busca parou
+    return veredito
+
+
+def _verificar_ap(ap, cadeia, max_passos, tempo_limite, motor_ap, estrategia):
+    """Veredito de um AP; os limites vão para o próprio simulador, que para com o motivo correspondente."""
+    max_passos = MAX_PASSOS_AP if max_passos is None else max_passos or None
+    if motor_ap == "gramatica": simulador = SimuladorAPGramatica(ap, cadeia, max_passos=max_passos, tempo_limite=tempo_limite)
+    elif motor_ap == "busca": simulador = SimuladorAP(ap, cadeia, estrategia=estrategia, max_passos=max_passos, tempo_limite=tempo_limite)
+    else: raise ValueError(f"Motor de AP desconhecido: '{motor_ap}'.")
+    veredito = _drenar(simulador, cadeia)
+    if veredito.get("motivo") == "limite_passos": veredito.update(status="limite", mensagem="Limite de passos do lote atingido.")
+    elif veredito.get("motivo") == "limite_tempo": veredito.update(status="limite", mensagem="Limite de tempo do lote atingido.")
+    return veredito
+
+
+def _verificar_afd(afd, cadeia):
+    """Veredito de um AFD pelo AFDCompilado (mesmas mensagens do SimuladorAFD)."""
+    estado, consumidos = afd.compilar().executar(cadeia)
+    if estado is None:
+        status, mensagem = "erro", "Estado inicial não definido."
+    elif consumidos < len(cadeia):
+        status, mensagem = "rejeita", f"Transição indefinida para ({estado}, começando com '{cadeia[consumidos]}')."
+    elif afd.estados[estado] in afd.estados_finais:
+        status, mensagem = "aceita", "Cadeia aceita!"
+    else:
+        status, mensagem = "rejeita", "Parou em estado não final."
+    return {"cadeia": cadeia, "status": status, "aceita": status == "aceita", "mensagem": mensagem, "passos": consumidos}
+
+
+def _verificar_mt(mt, cadeia, max_passos, tempo_limite):
+    """
+    Veredito de uma MT pela execução rápida (sem montar a fita a cada passo); sem max_passos, usa o limite do SimuladorMT.
+    Com a detecção de ciclos, MTs que repetem uma configuração são rejeitadas logo (motivo "ciclo").
+    """
+    simulador = SimuladorMT(mt, cadeia) if max_passos is None else SimuladorMT(mt, cadeia, max_passos=max_passos or None)
+    ultimo = None
+    for ultimo in simulador.executar_rapido(tempo_limite=tempo_limite, detectar_ciclos=True): pass
+    status, mensagem = ultimo["status"], ultimo["mensagem"]
+    if max_passos is not None and ultimo.get("motivo") == "limite_passos": status, mensagem = "limite", "Limite de passos do lote atingido."
+    elif ultimo.get("motivo") == "limite_tempo": status, mensagem = "limite", "Limite de tempo do lote atingido."
+    veredito = {"cadeia": cadeia, "status": status, "aceita": status == "aceita", "mensagem": mensagem, "passos": ultimo.get("passos", 0)}
+    if "tape" in ultimo: veredito["tape"] = ultimo["tape"]
+    if "motivo" in ultimo: veredito["motivo"] = ultimo["motivo"]
+    return veredito
+
+
+def _verificar_mt_multifita(mt, cadeia, max_passos, tempo_limite):
+    """
+    Veredito de uma MT multifita ou não determinística pelo ExploradorMT (busca em largura sem configurações repetidas);
+    sem max_passos, usa o limite do explorador.
+    """
+    limites = {"tempo_limite": tempo_limite} if max_passos is None else {"tempo_limite": tempo_limite, "max_passos": max_passos or None}
+    ultimo = ExploradorMT(mt, cadeia, **limites).decidir()
+    status, mensagem = ultimo["status"], ultimo["mensagem"]
+    if max_passos is not None and ultimo.get("motivo") == "limite_passos": status, mensagem = "limite", "Limite de passos do lote atingido."
+    elif ultimo.get("motivo") == "limite_tempo": status, mensagem = "limite", "Limite de tempo do lote atingido."
+    veredito = {"cadeia": cadeia, "status": status, "aceita": status == "aceita", "mensagem": mensagem, "passos": ultimo.get("passos", 0)}
+    if "tape" in ultimo: veredito["tape"] = ultimo["tape"]
+    if "motivo" in ultimo: veredito["motivo"] = ultimo["motivo"]
+    return veredito
+
+
+def _verificar_afn(afn, cadeia):
+    """Veredito de um AFN pela determinização preguiçosa (mesmas mensagens do SimuladorAFN)."""
+    if not afn.estado_inicial:
+        return {"cadeia": cadeia, "status": "erro", "aceita": False, "mensagem": "Estado inicial não definido.", "passos": 0}
+    estados, consumidos = afn.afd_preguicoso().executar(cadeia) # Reaproveitado entre as cadeias enquanto o AFN não mudar
+    if consumidos < len(cadeia):
+        status, mensagem = "rejeita", f"Travou no processamento. Não foi possível consumir '{cadeia[consumidos:]}'."
+    elif any(afn.estados[nome] in afn.estados_finais for nome in estados):
+        status, mensagem = "aceita", "Cadeia aceita!"
+    else:
+        status, mensagem = "rejeita", "Cadeia consumida, mas nenhum estado final foi alcançado."
+    return {"cadeia": cadeia, "status": status, "aceita": status == "aceita", "mensagem": mensagem, "passos": consumidos}
+
+
+# --- Execução em vários processos ---
+# Cada processo trabalhador recebe o autômato uma única vez (no inicializador do pool);
+# as tarefas levam apenas os blocos de cadeias.
+_automato_trabalhador = None
+_opcoes_trabalhador = {}
+
+def _inicializar_trabalhador(automato, opcoes):
+    global _automato_trabalhador, _opcoes_trabalhador
+    _automato_trabalhador = automato
+    _opcoes_trabalhador = opcoes
+
+def _verificar_bloco(cadeias):
+    return [verificar_cadeia(_automato_trabalhador, cadeia, **_opcoes_trabalhador) for cadeia in cadeias]
+
+def _em_blocos(cadeias, tamanho_bloco):
+    iterador = iter(cadeias)
+    while True:
+        bloco = list(islice(iterador, tamanho_bloco))
+        if not bloco: return
+        yield bloco
+
+def executar_lote(automato, cadeias, processos=None, tamanho_bloco=256, max_passos=None, tempo_limite=None,
+                  motor_ap="busca", estrategia="largura"):
+    """
+    Verifica muitas cadeias com o mesmo autômato, gerando os vereditos (ver verificar_cadeia) na ordem da entrada.
+    processos: número de processos trabalhadores (None usa todos os núcleos; 1 executa no processo atual).
+    As cadeias são lidas sob demanda e enviadas em blocos de 'tamanho_bloco', com no máximo
+    dois blocos pendentes por processo, então 'cadeias' pode ser um iterável grande (ex.: linhas de um arquivo).
+    max_passos/tempo_limite: limites por cadeia para AP, MT e Moore/Mealy (AFD e AFN não precisam), repassados
+    a cada processo trabalhador junto com as demais opções; sem max_passos vale o padrão de cada motor (ver verificar_cadeia).
+    motor_ap/estrategia: ver verificar_cadeia.
+    """
+    if tamanho_bloco < 1: raise ValueError("tamanho_bloco deve ser pelo menos 1.")
+    opcoes = {"max_passos": max_passos, "tempo_limite": tempo_limite, "motor_ap": motor_ap, "estrategia": estrategia}
+    processos = processos or os.cpu_count() or 1
+    if processos == 1:
+        for cadeia in cadeias:
+            yield verificar_cadeia(automato, cadeia, **opcoes)
+        return
+
+    # Importado só aqui: o multiprocessing pesa no tempo de início de quem roda em um processo (ex.: a CLI)
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_trabalhador,
+                             initargs=(automato, opcoes)) as executor:
+        pendentes = deque()
+        for bloco in _em_blocos(cadeias, tamanho_bloco):
+            pendentes.append(executor.submit(_verificar_bloco, bloco))
+            if len(pendentes) >= 2 * processos:
+                yield from pendentes.popleft().result()
+        while pendentes:
+            yield from pendentes.popleft().result()
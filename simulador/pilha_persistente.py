@@ -0,0 +1,65 @@
+# Arquivo: simulador_de_automatos/simulador/pilha_persistente.py
+
+class NoPilha:
+    """
+    Pilha imutável encadeada: cada nó guarda o topo e aponta para o resto da pilha (abaixo).
+    Ramificações da busca compartilham a parte comum, então empilhar/desempilhar custam O(1).
+    Os nós são criados só pela TabelaPilhas (hash-consing): pilhas iguais são o mesmo objeto,
+    o que permite comparar e indexar configurações pela identidade do nó (id).
+    """
+    __slots__ = ("topo", "abaixo", "profundidade", "_hash")
+
+    def __init__(self, topo, abaixo):
+        self.topo = topo
+        self.abaixo = abaixo
+        self.profundidade = abaixo.profundidade + 1 if abaixo is not None else 0
+        self._hash = hash((topo, abaixo._hash if abaixo is not None else 0)) # Calculado uma única vez
+
+    def __hash__(self):
+        return self._hash
+
+    def __bool__(self):
+        return self.profundidade > 0
+
+    def __len__(self):
+        return self.profundidade
+
+    def __iter__(self):
+        """Percorre os símbolos do topo para a base."""
+        no = self
+        while no.profundidade:
+            yield no.topo
+            no = no.abaixo
+
+    def como_texto(self):
+        """Conteúdo da base para o topo (mesma ordem de ''.join(pilha) na pilha em lista)."""
+        return "".join(reversed(list(self)))
+
+
+class TabelaPilhas:
+    """Cria e reaproveita os nós de pilha de uma busca. Os nós vivem enquanto a tabela existir."""
+    def __init__(self):
+        self.vazia = NoPilha(None, None)
+        self._nos = {} # (simbolo, no_abaixo) -> no
+
+    def __len__(self):
+        return len(self._nos)
+
+    def empilhar(self, no, simbolo):
+        chave = (simbolo, no)
+        novo = self._nos.get(chave)
+        if novo is None: novo = self._nos[chave] = NoPilha(simbolo, no)
+        return novo
+
+    def empilhar_cadeia(self, no, simbolos):
+        """Empilha 'simbolos' de forma que o primeiro caractere fique no topo (como nas transições do AP)."""
+        for simbolo in reversed(simbolos):
+            no = self.empilhar(no, simbolo)
+        return no
+
+    def de_lista(self, simbolos):
+        """Pilha a partir de uma lista com o topo no fim (o formato usado antes pelo SimuladorAP)."""
+        no = self.vazia
+        for simbolo in simbolos:
+            no = self.empilhar(no, simbolo)
+        return no
@@ -1,6 +1,12 @@
 # Arquivo: simulador_de_automatos/simulador/simulador_passos.py
 from automato import EPSILON
-from collections import defaultdict
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count, zip_longest
+from simulador.pilha_persistente import TabelaPilhas
+from simulador.fita import Fita, FitaRLE
+from simulador.ciclos import DetectorCiclos, HashFita
+from simulador.explorador_mt import ExploradorMT
 import time
 
 class SimuladorPassos:
@@ -37,18 +43,13 @@ class SimuladorAFD(SimuladorPassos):
             proximo_estado = ""
 
             # Procura a transição que casa com o início da cadeia restante
-            # Ordena por comprimento decrescente para priorizar rótulos mais longos (ex: "aa" antes de "a")
-            transicoes_possiveis = sorted(
-                [(chave, destino) for chave, destino in self.automato.transicoes.items() if chave[0] == estado_atual],
-                key=lambda item: len(item[0][1]), # Chave é (origem, rotulo)
-                reverse=True
-            )
-
-            for (origem, rotulo), destino in transicoes_possiveis:
+            # O índice do autômato já traz os rótulos por comprimento decrescente (ex: "aa" antes de "a")
+            for rotulo in self.automato.rotulos_por_origem.get(estado_atual, ()):
                  # Ignora transição épsilon aqui, AFD não deveria ter explicitamente
                  # Se tiver, precisa de lógica adicional, mas geralmente não se usa em AFD puro
-                if rotulo != EPSILON and cadeia_restante_a_partir_do_indice.startswith(rotulo):
-                    transicao_encontrada = (origem, destino)
+                if rotulo != EPSILON and self.cadeia_original.startswith(rotulo, indice_atual):
+                    destino = self.automato.transicoes[(estado_atual, rotulo)]
+                    transicao_encontrada = (estado_atual, destino)
                     rotulo_consumido = rotulo
                     proximo_estado = destino
                     break # Encontrou a única transição possível para AFD
@@ -78,65 +79,35 @@ class SimuladorAFN(SimuladorPassos):
         if not self.automato.estado_inicial:
             yield {"status": "erro", "mensagem": "Estado inicial não definido."}; return
 
-        estados_atuais = self.automato.fecho_epsilon({self.automato.estado_inicial.nome})
+        # Motor de bitsets: fechos-ε e sucessores por (estado, rótulo) já pré-calculados
+        motor = self.automato.compilar()
+        mascara_atual = motor.mascara_inicial
+        estados_atuais = motor.nomes_de(mascara_atual)
         indice_atual = 0 # Usaremos índice
 
         yield {"status": "executando", "estado_atual": estados_atuais, "cadeia_restante": self.cadeia_original[indice_atual:], "pilha": None, "transicao_ativa": set()}
 
         while indice_atual < len(self.cadeia_original):
-            proximos_estados_sem_fecho = set()
-            transicoes_ativas_passo = set()
-            rotulo_mais_longo_consumido = "" # Para saber quanto avançar na cadeia
+            # Une os sucessores (já com fecho-ε) das transições que usam o rótulo mais longo que casa
+            # com o início da cadeia restante. Isso é crucial para consumir a quantidade correta da cadeia
+            proxima_mascara, len_rotulo_mais_longo, transicoes_ativas_passo = motor.passo(
+                mascara_atual, self.cadeia_original, indice_atual, com_transicoes=True)
 
-            cadeia_restante_a_partir_do_indice = self.cadeia_original[indice_atual:]
-            
-            # --- Encontra todas as transições possíveis (não-epsilon) que casam com o início da cadeia ---
-            transicoes_possiveis_neste_passo = []
-            for estado_origem in estados_atuais:
-                for (origem, rotulo), destinos in self.automato.transicoes.items():
-                    # Considera apenas transições não-epsilon que partem dos estados atuais
-                    # e que casam com o início da cadeia restante
-                    if origem == estado_origem and rotulo != EPSILON and cadeia_restante_a_partir_do_indice.startswith(rotulo):
-                         transicoes_possiveis_neste_passo.append({
-                             "origem": origem,
-                             "rotulo": rotulo,
-                             "destinos": destinos if isinstance(destinos, set) else {destinos}
-                         })
-            
-            if not transicoes_possiveis_neste_passo:
+            if not len_rotulo_mais_longo:
                  # Se não há transições normais, a cadeia pode ter acabado ou travado
                  break # Sai do loop principal para verificar aceitação
 
-            # Encontra o comprimento do rótulo mais longo que casou
-            # Isso é crucial para consumir a quantidade correta da cadeia
-            len_rotulo_mais_longo = max(len(t["rotulo"]) for t in transicoes_possiveis_neste_passo)
-            rotulo_mais_longo_consumido = self.cadeia_original[indice_atual : indice_atual + len_rotulo_mais_longo] # Guarda para debug/info se precisar
-            
-            # Executa apenas as transições que usam o rótulo do comprimento máximo encontrado
-            for t in transicoes_possiveis_neste_passo:
-                if len(t["rotulo"]) == len_rotulo_mais_longo:
-                    for estado_destino in t["destinos"]:
-                        proximos_estados_sem_fecho.add(estado_destino)
-                        transicoes_ativas_passo.add((t["origem"], estado_destino))
-
-            if not proximos_estados_sem_fecho:
-                 # Isso não deveria acontecer se transicoes_possiveis_neste_passo não for vazio
-                 simbolo_atual_falha = self.cadeia_original[indice_atual] if indice_atual < len(self.cadeia_original) else "fim da cadeia"
-                 yield {"status": "rejeita", "mensagem": f"Nenhuma transição válida a partir dos estados {estados_atuais} para '{simbolo_atual_falha}'."}; return
-
-            # Aplica fecho-epsilon aos estados alcançados
-            estados_apos_fecho = self.automato.fecho_epsilon(proximos_estados_sem_fecho)
-            estados_atuais = estados_apos_fecho
+            mascara_atual = proxima_mascara
+            estados_atuais = motor.nomes_de(mascara_atual)
             indice_atual += len_rotulo_mais_longo # Avança o índice pelo tamanho do rótulo consumido
             cadeia_restante = self.cadeia_original[indice_atual:]
 
             yield {"status": "executando", "estado_atual": estados_atuais, "cadeia_restante": cadeia_restante, "pilha": None, "transicao_ativa": transicoes_ativas_passo}
-            # --- Fim da Lógica ---
 
         # Após consumir a cadeia (ou travar), verifica aceitação
-        # É importante re-aplicar o fecho épsilon final, pois pode haver transições épsilon para estados finais
-        estados_finais_alcancaveis = self.automato.fecho_epsilon(estados_atuais)
-        aceita = any(self.automato.estados[e] in self.automato.estados_finais for e in estados_finais_alcancaveis if e in self.automato.estados)
+        # Os conjuntos do motor já estão fechados por épsilon, incluindo transições épsilon para estados finais
+        estados_finais_alcancaveis = estados_atuais
+        aceita = bool(mascara_atual & motor.mascara_finais)
 
         if aceita and indice_atual == len(self.cadeia_original): # Garante que toda a cadeia foi consumida
             yield {"status": "aceita", "mensagem": "Cadeia aceita!", "estado_atual": estados_finais_alcancaveis, "cadeia_restante": ""}
@@ -148,114 +119,194 @@ class SimuladorAFN(SimuladorPassos):
 
 # --- Simulador AP  ---
 class SimuladorAP(SimuladorPassos):
-    def _criar_gerador(self):
-        # A lógica do AP já usa um índice (indice_cadeia) e pode potencialmente
-        # lidar com s_in > 1 caractere se a chave de transição for criada assim.
-        # A lógica de busca de 'possibilidades' pode precisar de ajuste se
-        # s_in pode ter múltiplos caracteres, similar ao AFN/AFD com startswith.
-        # Por enquanto, mantendo a lógica original que parece focar em um símbolo
-        # de entrada ou epsilon por passo.
+    """
+    Busca no espaço de configurações (estado, posição na cadeia, pilha) do AP não determinístico.
+    estrategia: "largura" (BFS, padrão), "profundidade" (DFS), "aprofundamento" (DFS com limite de
+    profundidade que dobra a cada rodada) ou "melhor" (prefere as configurações que consumiram mais entrada).
+    Limites (None desativa): max_passos, tempo_limite (segundos), max_configuracoes (tamanho da fronteira)
+    e max_profundidade_pilha (configurações com pilha maior são descartadas).
+    O último passo traz "motivo" com a razão da parada (ver MOTIVOS), também guardada em self.motivo_parada.
+    Para não gastar O(profundidade) por configuração, os passos trazem o nó da pilha ("pilha", um NoPilha;
+    o texto sai de pilha.como_texto()) e a posição na cadeia ("indice_cadeia") em vez de texto já montado.
+    """
+    ESTRATEGIAS = ("largura", "profundidade", "aprofundamento", "melhor")
+    MOTIVOS = {
+        "aceita": "Cadeia aceita por estado final!",
+        "esgotada": "Nenhum caminho levou a um estado de aceitação após consumir a cadeia.",
+        "limite_pilha": "Nenhum caminho levou a um estado de aceitação (configurações acima do limite de profundidade da pilha foram descartadas).",
+        "limite_passos": "Simulação interrompida (limite de passos atingido - possível loop infinito).",
+        "limite_tempo": "Simulação interrompida (limite de tempo atingido).",
+        "limite_configuracoes": "Simulação interrompida (limite de configurações pendentes atingido).",
+    }
+
+    def __init__(self, automato, cadeia, estrategia="largura", max_passos=1000, tempo_limite=None,
+                 max_configuracoes=None, max_profundidade_pilha=None):
+        if estrategia not in self.ESTRATEGIAS:
+            raise ValueError(f"Estratégia de busca desconhecida: '{estrategia}'. Use uma de {', '.join(self.ESTRATEGIAS)}.")
+        self.estrategia = estrategia
+        self.max_passos = max_passos
+        self.tempo_limite = tempo_limite
+        self.max_configuracoes = max_configuracoes
+        self.max_profundidade_pilha = max_profundidade_pilha
+        self.motivo_parada = None
+        self.passos = 0
+        super().__init__(automato, cadeia)
 
+    def _criar_gerador(self):
+        # A lógica do AP usa um índice (indice_cadeia) e consome um símbolo de entrada
+        # ou epsilon por passo; s_in com vários caracteres não é tratado aqui.
         if not self.automato.estado_inicial:
             yield {"status": "erro", "mensagem": "Estado inicial não definido."}; return
 
-        # Inclui símbolo inicial Z se não for vazio
-        pilha_inicial = [self.automato.simbolo_inicial_pilha] if self.automato.simbolo_inicial_pilha else []
-        configs = [(self.automato.estado_inicial.nome, 0, pilha_inicial, None)] # (estado, indice_cadeia, pilha, transicao_anterior)
-        visitados_ciclo = set() # (estado, indice_cadeia, tuple(pilha))
-        max_steps = 1000 # Limite para evitar loops infinitos
-        steps = 0
-
-        while configs and steps < max_steps:
-            estado_atual, indice_cadeia, pilha, transicao_anterior = configs.pop(0) # BFS para exploração ampla
-            steps += 1
-
-            # Evita revisitar a mesma configuração (estado, posição na cadeia, conteúdo da pilha)
-            config_tupla = (estado_atual, indice_cadeia, tuple(pilha))
-            if config_tupla in visitados_ciclo: continue
-            visitados_ciclo.add(config_tupla)
-
-            cadeia_restante = self.cadeia_original[indice_cadeia:]
-            pilha_str = ''.join(pilha) if pilha else "(vazia)"
+        self._podou = False # Alguma configuração foi descartada pelo limite de profundidade da pilha
+        self._prazo = time.perf_counter() + self.tempo_limite if self.tempo_limite is not None else None
+        try:
+            if self.estrategia == "aprofundamento":
+                limite = 1
+                while True:
+                    motivo = yield from self._buscar(self._configuracao_inicial(), limite)
+                    if motivo != "corte": break # Sem cortes pelo limite, a rodada já explorou tudo o que era alcançável
+                    limite *= 2
+            else:
+                motivo = yield from self._buscar(self._configuracao_inicial())
+        finally:
+            self.pilhas = None # Os nós ainda referenciados (ex.: pelos passos guardados) continuam vivos; a tabela não
+
+        if motivo == "esgotada" and self._podou: motivo = "limite_pilha"
+        self.motivo_parada = motivo
+        if motivo != "aceita":
+            yield {"status": "rejeita", "mensagem": self.MOTIVOS[motivo], "motivo": motivo}
+
+    def _configuracao_inicial(self):
+        """
+        (estado, indice_cadeia, pilha, transicao_anterior, profundidade) inicial, com o símbolo inicial na pilha
+        se houver. Cria a TabelaPilhas da busca: cada busca (e cada rodada do aprofundamento) tem a sua, como as
+        visitadas de _buscar, para que a memória de uma não se acumule na seguinte.
+        """
+        # Pilhas persistentes: as configurações compartilham a parte comum da pilha e pilhas iguais são o mesmo nó
+        self.pilhas = TabelaPilhas()
+        simbolo = self.automato.simbolo_inicial_pilha
+        pilha_inicial = self.pilhas.empilhar(self.pilhas.vazia, simbolo) if simbolo else self.pilhas.vazia
+        return (self.automato.estado_inicial.nome, 0, pilha_inicial, None, 0)
+
+    def _buscar(self, inicial, limite_profundidade=None):
+        """
+        Explora as configurações a partir de 'inicial' com a estratégia escolhida, gerando os passos.
+        Retorna o motivo da parada; "corte" indica que o limite de profundidade (aprofundamento) podou algum caminho.
+        """
+        if self.estrategia == "largura":
+            fronteira = deque([inicial]); retirar = fronteira.popleft; inserir = fronteira.extend
+        elif self.estrategia == "melhor":
+            # Mais entrada consumida primeiro; no empate, pilha menor e depois ordem de chegada
+            ordem = count()
+            fronteira = [(0, 0, next(ordem), inicial)]
+            retirar = lambda: heappop(fronteira)[3]
+            def inserir(configs):
+                for config in configs: heappush(fronteira, (-config[1], config[2].profundidade, next(ordem), config))
+        else: # DFS (também usado em cada rodada do aprofundamento); empilha ao contrário para explorar na ordem natural
+            fronteira = [inicial]; retirar = fronteira.pop
+            inserir = lambda configs: fronteira.extend(reversed(configs))
+
+        # Evita revisitar a mesma configuração; com o hash-consing, o id do nó identifica o conteúdo da pilha.
+        # No aprofundamento guarda a menor profundidade em que a configuração foi vista
+        visitados = set() if limite_profundidade is None else {}
+        cortou = False
+        total = len(self.cadeia_original)
+
+        while fronteira:
+            if self.max_passos is not None and self.passos >= self.max_passos: return "limite_passos"
+            if self._prazo is not None and time.perf_counter() > self._prazo: return "limite_tempo"
+            estado_atual, indice_cadeia, pilha, transicao_anterior, profundidade = retirar()
+            self.passos += 1
+
+            config_tupla = (estado_atual, indice_cadeia, id(pilha))
+            if limite_profundidade is None:
+                if config_tupla in visitados: continue
+                visitados.add(config_tupla)
+            else:
+                if visitados.get(config_tupla, profundidade + 1) <= profundidade: continue
+                visitados[config_tupla] = profundidade
 
-            yield {"status": "executando", "estado_atual": {estado_atual}, "cadeia_restante": cadeia_restante, "pilha": pilha_str, "transicao_ativa": transicao_anterior}
+            yield {"status": "executando", "estado_atual": {estado_atual}, "indice_cadeia": indice_cadeia, "pilha": pilha, "transicao_ativa": transicao_anterior}
 
             # Verifica aceitação por estado final APÓS consumir toda a cadeia
-            if indice_cadeia == len(self.cadeia_original):
-                 # Considera fecho epsilon final para AP também? Opcional dependendo da definição.
-                 # estados_finais_possiveis = self.automato.fecho_epsilon_ap({estado_atual}, pilha) # Função hipotética
+            if indice_cadeia == total:
                  if estado_atual in self.automato.estados and self.automato.estados[estado_atual] in self.automato.estados_finais:
-                    yield {"status": "aceita", "mensagem": "Cadeia aceita por estado final!", "estado_atual": {estado_atual}, "pilha": pilha_str}; return
-                 # Adicionar verificação de aceitação por pilha vazia se necessário aqui
-
-            # Determina possíveis próximas transições
-            simbolo_entrada_atual = self.cadeia_original[indice_cadeia] if indice_cadeia < len(self.cadeia_original) else EPSILON
-            topo_pilha_atual = pilha[-1] if pilha else EPSILON
-
-            possibilidades = [] # Lista de dicionários {'chave': (origem, s_in, s_pop), 'consome_entrada': bool, 'consome_pilha': bool}
-
-            # 1. Transição com símbolo de entrada e símbolo da pilha
-            if simbolo_entrada_atual != EPSILON and topo_pilha_atual != EPSILON:
-                chave = (estado_atual, simbolo_entrada_atual, topo_pilha_atual)
-                if chave in self.automato.transicoes:
-                    possibilidades.append({'chave': chave, 'consome_entrada': True, 'consome_pilha': True})
-
-            # 2. Transição com símbolo de entrada, sem consumir da pilha (epsilon no pop)
-            if simbolo_entrada_atual != EPSILON:
-                chave = (estado_atual, simbolo_entrada_atual, EPSILON)
-                if chave in self.automato.transicoes:
-                    possibilidades.append({'chave': chave, 'consome_entrada': True, 'consome_pilha': False})
-
-            # 3. Transição epsilon na entrada, consumindo da pilha
-            if topo_pilha_atual != EPSILON:
-                chave = (estado_atual, EPSILON, topo_pilha_atual)
-                if chave in self.automato.transicoes:
-                    possibilidades.append({'chave': chave, 'consome_entrada': False, 'consome_pilha': True})
-
-            # 4. Transição epsilon na entrada e epsilon na pilha
-            chave = (estado_atual, EPSILON, EPSILON)
-            if chave in self.automato.transicoes:
-                 possibilidades.append({'chave': chave, 'consome_entrada': False, 'consome_pilha': False})
-
-
-            # Explora cada possibilidade
-            for p in possibilidades:
-                chave_transicao = p['chave']
-                destinos_e_push = self.automato.transicoes.get(chave_transicao, set()) # Pega o conjunto de (destino, s_push)
-
-                for destino, simbolos_push in destinos_e_push:
-                    nova_pilha = list(pilha) # Copia a pilha atual
-
-                    # Desempilha se necessário
-                    if p['consome_pilha']:
-                        if not nova_pilha: continue # Não pode desempilhar de pilha vazia
-                        nova_pilha.pop()
-
-                    # Empilha se necessário (na ordem reversa)
-                    if simbolos_push != EPSILON:
-                        for char in reversed(simbolos_push):
-                            nova_pilha.append(char)
-
-                    # Avança na cadeia se necessário
-                    novo_indice = indice_cadeia + 1 if p['consome_entrada'] else indice_cadeia
-
-                    # Adiciona a nova configuração à fila, se não exceder limite
-                    if steps < max_steps:
-                        # Adiciona no INÍCIO da lista para DFS (pode explorar um caminho até o fim)
-                        # ou no FIM para BFS (exploração em largura)
-                        # Usando BFS (append) para garantir encontrar o caminho mais curto se houver.
-                         configs.append((destino, novo_indice, nova_pilha, {(estado_atual, destino)}))
-
-        # Se a fila esvaziou ou limite atingido, verifica se alguma config final levou à aceitação (já feito no loop)
-        if steps >= max_steps:
-            yield {"status": "rejeita", "mensagem": "Simulação interrompida (limite de passos atingido - possível loop infinito)."}
+                    yield {"status": "aceita", "mensagem": self.MOTIVOS["aceita"], "estado_atual": {estado_atual}, "pilha": pilha, "motivo": "aceita"}
+                    return "aceita"
+
+            sucessores = self._sucessores(estado_atual, indice_cadeia, pilha, profundidade)
+            if limite_profundidade is not None and profundidade >= limite_profundidade:
+                if sucessores: cortou = True
+                continue
+            # Sempre insere: se o limite de passos acabou de ser atingido, a fronteira não vazia indica busca incompleta
+            inserir(sucessores)
+            if self.max_configuracoes is not None and len(fronteira) > self.max_configuracoes: return "limite_configuracoes"
+        return "corte" if cortou else "esgotada"
+
+    def _sucessores(self, estado_atual, indice_cadeia, pilha, profundidade):
+        """Configurações alcançáveis em um passo, na ordem: (entrada, pilha), (entrada, ε), (ε, pilha), (ε, ε)."""
+        transicoes = self.automato.transicoes
+        simbolo_entrada_atual = self.cadeia_original[indice_cadeia] if indice_cadeia < len(self.cadeia_original) else EPSILON
+        topo_pilha_atual = pilha.topo if pilha else EPSILON
+
+        possibilidades = [] # (chave (origem, s_in, s_pop), consome_entrada, consome_pilha)
+        if simbolo_entrada_atual != EPSILON:
+            if topo_pilha_atual != EPSILON: possibilidades.append(((estado_atual, simbolo_entrada_atual, topo_pilha_atual), True, True))
+            possibilidades.append(((estado_atual, simbolo_entrada_atual, EPSILON), True, False))
+        if topo_pilha_atual != EPSILON: possibilidades.append(((estado_atual, EPSILON, topo_pilha_atual), False, True))
+        possibilidades.append(((estado_atual, EPSILON, EPSILON), False, False))
+
+        sucessores = []
+        for chave, consome_entrada, consome_pilha in possibilidades:
+            for destino, simbolos_push in transicoes.get(chave, ()): # Conjunto de (destino, s_push)
+                nova_pilha = pilha # Sem cópia: a pilha é imutável
+                # Desempilha se necessário
+                if consome_pilha:
+                    if not nova_pilha: continue # Não pode desempilhar de pilha vazia
+                    nova_pilha = nova_pilha.abaixo
+                # Empilha se necessário (na ordem reversa, o primeiro símbolo fica no topo)
+                if simbolos_push != EPSILON:
+                    nova_pilha = self.pilhas.empilhar_cadeia(nova_pilha, simbolos_push)
+                if self.max_profundidade_pilha is not None and nova_pilha.profundidade > self.max_profundidade_pilha:
+                    self._podou = True; continue
+                novo_indice = indice_cadeia + 1 if consome_entrada else indice_cadeia
+                sucessores.append((destino, novo_indice, nova_pilha, {(estado_atual, destino)}, profundidade + 1))
+        return sucessores
+
+
+class SimuladorAPGramatica(SimuladorPassos):
+    """
+    Alternativa ao SimuladorAP que decide a aceitação pela gramática livre de contexto equivalente ao AP,
+    com o reconhecedor de Earley: O(n³) no pior caso, sempre termina e não depende de limites de busca.
+    Não há passos intermediários (configurações) para mostrar: o gerador produz só o veredito.
+    Aceita os mesmos limites do SimuladorAP (None desativa): tempo_limite interrompe a análise com o motivo
+    "limite_tempo"; max_passos não se aplica, pois a análise não explora configurações.
+    """
+    def __init__(self, automato, cadeia, max_passos=None, tempo_limite=None):
+        self.max_passos = max_passos
+        self.tempo_limite = tempo_limite
+        self.motivo_parada = None
+        super().__init__(automato, cadeia)
+
+    def _criar_gerador(self):
+        if not self.automato.estado_inicial:
+            yield {"status": "erro", "mensagem": "Estado inicial não definido."}; return
+
+        prazo = time.perf_counter() + self.tempo_limite if self.tempo_limite is not None else None
+        try:
+            aceita, consumidos = self.automato.reconhecedor().reconhecer(self.cadeia_original, prazo)
+        except TimeoutError:
+            self.motivo_parada = "limite_tempo"
+            yield {"status": "rejeita", "mensagem": SimuladorAP.MOTIVOS["limite_tempo"], "motivo": "limite_tempo"}; return
+        self.motivo_parada = "aceita" if aceita else "esgotada"
+        if aceita:
+            yield {"status": "aceita", "mensagem": SimuladorAP.MOTIVOS["aceita"], "cadeia_restante": "", "motivo": "aceita"}
+        elif consumidos < len(self.cadeia_original):
+            yield {"status": "rejeita", "mensagem": f"Nenhum caminho consegue consumir '{self.cadeia_original[consumidos:]}'.",
+                   "cadeia_restante": self.cadeia_original[consumidos:], "motivo": "esgotada"}
         else:
-            # Se saiu do loop sem aceitar
-             final_configs_check = [(s, idx, p) for s, idx, p, _ in configs if idx == len(self.cadeia_original)]
-             aceitou_final = any(s in self.automato.estados and self.automato.estados[s] in self.automato.estados_finais for s, idx, p in final_configs_check)
-             if not aceitou_final:
-                 yield {"status": "rejeita", "mensagem": "Nenhum caminho levou a um estado de aceitação após consumir a cadeia."}
-             # Se aceitou, o return dentro do loop já encerrou o gerador.
+            yield {"status": "rejeita", "mensagem": SimuladorAP.MOTIVOS["esgotada"], "cadeia_restante": "", "motivo": "esgotada"}
 
 
 # --- NOVOS SIMULADORES ---
@@ -280,14 +331,10 @@ class SimuladorMoore(SimuladorPassos):
             rotulo_consumido = ""
             proximo_estado = ""
 
-            transicoes_possiveis = sorted(
-                [(chave, destino) for chave, destino in self.automato.transicoes.items() if chave[0] == estado_atual],
-                key=lambda item: len(item[0][1]), reverse=True
-            )
-
-            for (origem, rotulo), destino in transicoes_possiveis:
-                if rotulo != EPSILON and cadeia_restante_a_partir_do_indice.startswith(rotulo):
-                    transicao_encontrada = (origem, destino)
+            for rotulo in self.automato.rotulos_por_origem.get(estado_atual, ()):
+                if rotulo != EPSILON and self.cadeia_original.startswith(rotulo, indice_atual):
+                    destino = self.automato.transicoes[(estado_atual, rotulo)]
+                    transicao_encontrada = (estado_atual, destino)
                     rotulo_consumido = rotulo
                     proximo_estado = destino
                     break
@@ -303,7 +350,7 @@ class SimuladorMoore(SimuladorPassos):
                 yield {"status": "executando", "estado_atual": {estado_atual}, "cadeia_restante": cadeia_restante, "output": output_str, "transicao_ativa": {transicao_encontrada}}
             else:
                 simbolo_atual_falha = self.cadeia_original[indice_atual] if indice_atual < len(self.cadeia_original) else "fim da cadeia"
-                yield {"status": "rejeita", "mensagem": f"Transição indefinida para ({estado_origem}, começando com '{simbolo_atual_falha}').", "output": output_str, "estado_atual": {estado_atual}, "cadeia_restante": cadeia_restante_a_partir_do_indice}; return
+                yield {"status": "rejeita", "mensagem": f"Transição indefinida para ({estado_atual}, começando com '{simbolo_atual_falha}').", "output": output_str, "estado_atual": {estado_atual}, "cadeia_restante": cadeia_restante_a_partir_do_indice}; return
 
         # Moore não "aceita" ou "rejeita", apenas finaliza
         yield {"status": "finalizado", "mensagem": "Cadeia processada.", "output": output_str, "estado_atual": {estado_atual}, "cadeia_restante": ""}
@@ -327,14 +374,11 @@ class SimuladorMealy(SimuladorPassos):
             proximo_estado = ""
             output_da_transicao = ""
 
-            transicoes_possiveis = sorted(
-                [(chave, destino_output) for chave, destino_output in self.automato.transicoes.items() if chave[0] == estado_atual],
-                 key=lambda item: len(item[0][1]), reverse=True # Prioriza rótulos mais longos
-            )
-
-            for (origem, rotulo), (destino, output_t) in transicoes_possiveis:
-                 if rotulo != EPSILON and cadeia_restante_a_partir_do_indice.startswith(rotulo):
-                    transicao_encontrada = (origem, destino)
+            # Rótulos já vêm do índice do autômato priorizando os mais longos
+            for rotulo in self.automato.rotulos_por_origem.get(estado_atual, ()):
+                 if rotulo != EPSILON and self.cadeia_original.startswith(rotulo, indice_atual):
+                    destino, output_t = self.automato.transicoes[(estado_atual, rotulo)]
+                    transicao_encontrada = (estado_atual, destino)
                     rotulo_consumido = rotulo
                     proximo_estado = destino
                     output_da_transicao = output_t or ""
@@ -351,30 +395,24 @@ class SimuladorMealy(SimuladorPassos):
                 yield {"status": "executando", "estado_atual": {estado_atual}, "cadeia_restante": cadeia_restante, "output": output_str, "transicao_ativa": {transicao_encontrada}}
             else:
                 simbolo_atual_falha = self.cadeia_original[indice_atual] if indice_atual < len(self.cadeia_original) else "fim da cadeia"
-                yield {"status": "rejeita", "mensagem": f"Transição indefinida para ({estado_origem}, começando com '{simbolo_atual_falha}').", "output": output_str, "estado_atual": {estado_atual}, "cadeia_restante": cadeia_restante_a_partir_do_indice}; return
+                yield {"status": "rejeita", "mensagem": f"Transição indefinida para ({estado_atual}, começando com '{simbolo_atual_falha}').", "output": output_str, "estado_atual": {estado_atual}, "cadeia_restante": cadeia_restante_a_partir_do_indice}; return
 
         yield {"status": "finalizado", "mensagem": "Cadeia processada.", "output": output_str, "estado_atual": {estado_atual}, "cadeia_restante": ""}
 
 # --- Simulador MT ---
 class SimuladorMT(SimuladorPassos):
-    
+    """
+    Simulador da MT. O gerador (passo a passo) monta a fita a cada passo para a GUI; executar_rapido
+    roda as transições num laço enxuto e só produz pontos de controle e o veredito.
+    max_passos limita as transições em ambos os modos (None: sem limite).
+    """
+    def __init__(self, automato, cadeia, max_passos=2000):
+        self.max_passos = max_passos
+        super().__init__(automato, cadeia)
+
     def _visualizar_fita(self, tape, head, window=20):
-        """Helper para criar uma string da fita."""
-        min_idx = min(tape.keys()) if tape else 0
-        max_idx = max(tape.keys()) if tape else 0
-        
-        # Define a janela de visualização ao redor do cabeçote
-        start = max(min(min_idx, head - window), head - window)
-        end = min(max(max_idx, head + window), head + window)
-        
-        fita_str = ""
-        for i in range(start, end + 1):
-            simbolo = tape.get(i, self.automato.simbolo_branco)
-            if i == head:
-                fita_str += f"[{simbolo}]" # Destaca o cabeçote
-            else:
-                fita_str += f" {simbolo} "
-        return fita_str.strip()
+        """Helper para criar uma string da fita (janela de 'window' células para cada lado do cabeçote)."""
+        return tape.janela(head, window)
 
     def _criar_gerador(self):
         # A lógica da MT já opera sobre um único símbolo lido da fita (fita[cabecote])
@@ -382,13 +420,11 @@ class SimuladorMT(SimuladorPassos):
         if not self.automato.estado_inicial:
             yield {"status": "erro", "mensagem": "Estado inicial não definido."}; return
 
-        fita = defaultdict(lambda: self.automato.simbolo_branco)
-        for i, s in enumerate(self.cadeia_original):
-            fita[i] = s
-        
+        fita = Fita(self.cadeia_original, self.automato.simbolo_branco)
+
         cabecote = 0
         estado_atual = self.automato.estado_inicial.nome
-        max_steps = 2000
+        max_steps = self.max_passos if self.max_passos is not None else float("inf")
         steps = 0
         
         while steps < max_steps:
@@ -424,4 +460,232 @@ class SimuladorMT(SimuladorPassos):
             
         if steps >= max_steps:
             fita_str_final = self._visualizar_fita(fita, cabecote)
-            yield {"status": "rejeita", "mensagem": "Simulação interrompida (limite de passos atingido).", "estado_atual": {estado_atual}, "tape": fita_str_final}
\ No newline at end of file
+            yield {"status": "rejeita", "mensagem": "Simulação interrompida (limite de passos atingido).", "estado_atual": {estado_atual}, "tape": fita_str_final}
+
+    def executar_rapido(self, intervalo=None, tempo_limite=None, macro=None, verificar=False, detectar_ciclos=False):
+        """
+        Executa a MT desde o início sem montar a fita a cada passo, gerando só pontos de controle
+        ("executando", a cada 'intervalo' transições; None desativa) e o passo final.
+        Os passos gerados trazem também "passos" (transições executadas) e "passos_por_segundo";
+        o final traz "motivo": "aceita", "parou" (transição indefinida), "limite_passos" ou "limite_tempo".
+        A ordem das verificações é a mesma do gerador passo a passo, então o veredito é idêntico.
+        macro: usa macro-passos (ver _laco_macro), com o mesmo resultado e os mesmos pontos de controle.
+        None escolhe sozinho: macro-passos só se a MT tem transições que voltam ao próprio estado movendo o cabeçote
+        (sem elas, a fita em corridas só custaria mais caro).
+        verificar: roda os dois laços lado a lado, comparando cada passo gerado e a fita inteira; numa divergência
+        gera um passo "erro" com motivo "divergencia". Neste modo o tempo limite e a detecção de ciclos não se aplicam.
+        detectar_ciclos: encerra com motivo "ciclo" assim que uma configuração se repete (ver DetectorCiclos),
+        o que prova que a MT nunca para, sem gastar o resto do limite de passos.
+        Ao fim, self.fita e self.cabecote guardam a configuração do último passo gerado.
+        """
+        if not self.automato.estado_inicial:
+            yield {"status": "erro", "mensagem": "Estado inicial não definido."}; return
+        if verificar: yield from self._verificar_macro(intervalo); return
+        if macro is None:
+            macro = any(destino == origem for (origem, _), (destino, _, _) in self.automato.transicoes.items())
+        if macro: yield from self._laco_macro(intervalo, tempo_limite, detectar_ciclos)
+        else: yield from self._laco_simples(intervalo, tempo_limite, detectar_ciclos)
+
+    def _ciclo(self, passo_anterior, passos):
+        return {"mensagem": f"A máquina entrou em ciclo: a configuração do passo {passo_anterior} se repete no passo {passos}, então ela nunca para.",
+                "motivo": "ciclo"}
+
+    def _laco_simples(self, intervalo, tempo_limite, detectar_ciclos=False):
+        """Uma transição por iteração, direto sobre o buffer da Fita."""
+        automato = self.automato
+        transicoes = automato.transicoes
+        finais = {nome for nome, estado in automato.estados.items() if estado in automato.estados_finais}
+        branco = automato.simbolo_branco
+        fita = Fita(self.cadeia_original, branco)
+        celulas = fita.celulas # Mesma lista durante toda a execução (a fita cresce no lugar)
+        deslocamento, tamanho = fita.deslocamento, len(celulas)
+        inicio, fim = fita.inicio, fita.fim
+        cabecote = 0
+        estado = automato.estado_inicial.nome
+        limite = self.max_passos if self.max_passos is not None else float("inf")
+        proximo_ponto = intervalo if intervalo else float("inf")
+        verificar_tempo = 1 << 14 # O relógio só é consultado a cada tantas transições
+        prazo = time.perf_counter() + tempo_limite if tempo_limite is not None else None
+        comeco = time.perf_counter()
+        passos = 0
+        detector = DetectorCiclos(branco) if detectar_ciclos else None
+        hash_fita = HashFita(self.cadeia_original, branco) if detectar_ciclos else None
+
+        def instantaneo(status, **extra):
+            fita.inicio, fita.fim = inicio, fim
+            self.fita, self.cabecote = fita, cabecote
+            decorrido = time.perf_counter() - comeco
+            return dict({"status": status, "estado_atual": {estado}, "tape": fita.janela(cabecote), "transicao_ativa": set(),
+                         "passos": passos, "passos_por_segundo": passos / decorrido if decorrido > 0 else 0.0}, **extra)
+
+        while True:
+            if detector is not None:
+                fita.inicio, fita.fim = inicio, fim
+                anterior = detector.verificar(estado, cabecote, hash_fita.valor, fita, passos)
+                if anterior is not None: yield instantaneo("rejeita", **self._ciclo(anterior, passos)); return
+            if passos >= limite:
+                yield instantaneo("rejeita", mensagem="Simulação interrompida (limite de passos atingido).", motivo="limite_passos"); return
+            if estado in finais:
+                yield instantaneo("aceita", mensagem="Cadeia aceita!", motivo="aceita"); return
+            i = cabecote + deslocamento
+            lido = celulas[i] if 0 <= i < tamanho else branco
+            transicao = transicoes.get((estado, lido))
+            if transicao is None:
+                yield instantaneo("rejeita", mensagem=f"Transição indefinida para ({estado}, {lido}).", motivo="parou"); return
+
+            estado, escrito, direcao = transicao
+            if 0 <= i < tamanho: celulas[i] = escrito
+            else:
+                fita[cabecote] = escrito
+                deslocamento, tamanho = fita.deslocamento, len(celulas)
+            if not inicio <= cabecote <= fim:
+                if fim < inicio: inicio = fim = cabecote
+                elif cabecote < inicio: inicio = cabecote
+                else: fim = cabecote
+            if direcao == 'R': cabecote += 1
+            elif direcao == 'L': cabecote -= 1
+            if hash_fita is not None: hash_fita.passo(lido, escrito, 1 if direcao == 'R' else -1 if direcao == 'L' else 0)
+            passos += 1
+
+            if passos >= proximo_ponto:
+                proximo_ponto += intervalo
+                yield instantaneo("executando")
+            if prazo is not None and passos % verificar_tempo == 0 and time.perf_counter() > prazo:
+                yield instantaneo("rejeita", mensagem="Simulação interrompida (limite de tempo atingido).", motivo="limite_tempo"); return
+
+    def _laco_macro(self, intervalo, tempo_limite, detectar_ciclos=False):
+        """
+        Macro-passos sobre a FitaRLE: uma transição que volta ao próprio estado e move o cabeçote repete-se
+        enquanto o símbolo lido for o mesmo, então a corrida inteira é varrida (e reescrita) numa só operação.
+        O salto para nos limites de passos e nos pontos de controle, para que tudo coincida com o passo a passo.
+        """
+        automato = self.automato
+        transicoes = automato.transicoes
+        finais = {nome for nome, estado in automato.estados.items() if estado in automato.estados_finais}
+        fita = FitaRLE(self.cadeia_original, automato.simbolo_branco)
+        estado = automato.estado_inicial.nome
+        infinito = float("inf")
+        limite = self.max_passos if self.max_passos is not None else infinito
+        proximo_ponto = intervalo if intervalo else infinito
+        verificar_tempo = 1 << 14
+        prazo = time.perf_counter() + tempo_limite if tempo_limite is not None else None
+        proxima_verificacao = verificar_tempo if prazo is not None else infinito
+        comeco = time.perf_counter()
+        passos = 0
+        # Com macro-passos o detector vê só as configurações entre os saltos: ainda são configurações reais,
+        # então uma repetição continua provando o ciclo
+        detector = DetectorCiclos(automato.simbolo_branco) if detectar_ciclos else None
+        hash_fita = HashFita(self.cadeia_original, automato.simbolo_branco) if detectar_ciclos else None
+
+        def instantaneo(status, **extra):
+            self.fita, self.cabecote = fita, fita.posicao
+            decorrido = time.perf_counter() - comeco
+            return dict({"status": status, "estado_atual": {estado}, "tape": fita.janela(fita.posicao), "transicao_ativa": set(),
+                         "passos": passos, "passos_por_segundo": passos / decorrido if decorrido > 0 else 0.0}, **extra)
+
+        while True:
+            if detector is not None:
+                anterior = detector.verificar(estado, fita.posicao, hash_fita.valor, fita, passos)
+                if anterior is not None: yield instantaneo("rejeita", **self._ciclo(anterior, passos)); return
+            if passos >= limite:
+                yield instantaneo("rejeita", mensagem="Simulação interrompida (limite de passos atingido).", motivo="limite_passos"); return
+            if estado in finais:
+                yield instantaneo("aceita", mensagem="Cadeia aceita!", motivo="aceita"); return
+            lido = fita.ler()
+            transicao = transicoes.get((estado, lido))
+            if transicao is None:
+                yield instantaneo("rejeita", mensagem=f"Transição indefinida para ({estado}, {lido}).", motivo="parou"); return
+
+            destino, escrito, direcao = transicao
+            sentido = 1 if direcao == 'R' else -1 if direcao == 'L' else 0
+            k = 1
+            if destino == estado and sentido:
+                k = min(fita.corrida(sentido), limite - passos, proximo_ponto - passos)
+                if k == infinito: k = 1 << 20 # Varredura sem fim pelos brancos e sem limites: avança em blocos
+            fita.preencher(escrito, k, sentido)
+            if hash_fita is not None:
+                if k == 1: hash_fita.passo(lido, escrito, sentido)
+                else: hash_fita.varrer(lido, escrito, k, sentido)
+            estado = destino
+            passos += k
+
+            if passos >= proximo_ponto:
+                proximo_ponto += intervalo
+                yield instantaneo("executando")
+            if passos >= proxima_verificacao:
+                proxima_verificacao = passos + verificar_tempo
+                if time.perf_counter() > prazo:
+                    yield instantaneo("rejeita", mensagem="Simulação interrompida (limite de tempo atingido).", motivo="limite_tempo"); return
+
+    def _verificar_macro(self, intervalo):
+        """Compara, passo gerado a passo gerado, os macro-passos com o laço simples (ver executar_rapido)."""
+        simples = SimuladorMT(self.automato, self.cadeia_original, max_passos=self.max_passos)
+        pares = zip_longest(self._laco_macro(intervalo, None), simples._laco_simples(intervalo, None))
+        for passo_macro, passo_simples in pares:
+            if passo_macro is None or passo_simples is None:
+                diferencas = ["quantidade de passos gerados"]
+            else:
+                diferencas = [chave for chave in ("status", "mensagem", "motivo", "estado_atual", "passos", "tape")
+                              if passo_macro.get(chave) != passo_simples.get(chave)]
+                if self.cabecote != simples.cabecote: diferencas.append("cabeçote")
+                if (self.fita.inicio, self.fita.fim, self.fita.conteudo()) != (simples.fita.inicio, simples.fita.fim, simples.fita.conteudo()):
+                    diferencas.append("conteúdo da fita")
+            if diferencas:
+                passos = (passo_simples or passo_macro)["passos"]
+                yield {"status": "erro", "motivo": "divergencia",
+                       "mensagem": f"Os macro-passos divergiram do passo a passo (até o passo {passos}): {', '.join(diferencas)}."}
+                return
+            yield passo_macro
+
+
+class SimuladorMTMultifita(SimuladorPassos):
+    """Passo a passo da MaquinaTuringMultifita (determinística): uma Fita por fita, a entrada na primeira."""
+    def __init__(self, automato, cadeia, max_passos=2000):
+        self.max_passos = max_passos
+        super().__init__(automato, cadeia)
+
+    def _criar_gerador(self):
+        if not self.automato.estado_inicial:
+            yield {"status": "erro", "mensagem": "Estado inicial não definido."}; return
+
+        branco = self.automato.simbolo_branco
+        fitas = [Fita(self.cadeia_original, branco)] + [Fita("", branco) for _ in range(self.automato.num_fitas - 1)]
+        cabecotes = [0] * len(fitas)
+        estado_atual = self.automato.estado_inicial.nome
+        max_steps = self.max_passos if self.max_passos is not None else float("inf")
+        steps = 0
+        visualizar = lambda: "\n".join(fita.janela(cabecote) for fita, cabecote in zip(fitas, cabecotes))
+
+        while steps < max_steps:
+            steps += 1
+            fita_str = visualizar()
+            if estado_atual in self.automato.estados and self.automato.estados[estado_atual] in self.automato.estados_finais:
+                yield {"status": "aceita", "mensagem": "Cadeia aceita!", "estado_atual": {estado_atual}, "tape": fita_str, "transicao_ativa": set()}; return
+
+            lidos = tuple(fita[cabecote] for fita, cabecote in zip(fitas, cabecotes))
+            yield {"status": "executando", "estado_atual": {estado_atual}, "tape": fita_str, "transicao_ativa": set()}
+
+            transicao = self.automato.transicoes.get((estado_atual, lidos))
+            if transicao is None:
+                yield {"status": "rejeita", "mensagem": f"Transição indefinida para ({estado_atual}, {', '.join(lidos)}).", "estado_atual": {estado_atual}, "tape": fita_str}; return
+
+            estado_atual, escritos, direcoes = transicao
+            for i, (escrito, direcao) in enumerate(zip(escritos, direcoes)):
+                fitas[i][cabecotes[i]] = escrito
+                if direcao == 'R': cabecotes[i] += 1
+                elif direcao == 'L': cabecotes[i] -= 1
+
+        yield {"status": "rejeita", "mensagem": "Simulação interrompida (limite de passos atingido).", "estado_atual": {estado_atual}, "tape": visualizar()}
+
+
+class SimuladorMTND(SimuladorPassos):
+    """
+    Passo a passo da MaquinaTuringND: cada passo mostra uma configuração (um ramo) da busca em largura
+    do ExploradorMT, com "ramos" indicando quantas ainda estão pendentes.
+    """
+    def __init__(self, automato, cadeia, max_passos=100_000, max_configuracoes=None, tempo_limite=None):
+        self.explorador = ExploradorMT(automato, cadeia, max_passos=max_passos, max_configuracoes=max_configuracoes, tempo_limite=tempo_limite)
+        super().__init__(automato, cadeia)
+
+    def _criar_gerador(self):
+        return self.explorador.explorar()
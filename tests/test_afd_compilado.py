@@ -0,0 +1,54 @@
+# Arquivo: simulador_de_automatos/tests/test_afd_compilado.py
+import itertools
+import random
+from automato.automato_finito import AFD
+from simulador.simulador_passos import SimuladorAFD
+
+def _afd_aleatorio(rng, rotulos):
+    afd = AFD()
+    n = rng.randint(1, 6)
+    for i in range(n): afd.adicionar_estado(f"q{i}", 10 * i, 0)
+    afd.definir_estado_inicial("q0")
+    for i in range(n):
+        if rng.random() < 0.4: afd.alternar_estado_final(f"q{i}")
+    for _ in range(rng.randint(0, 14)):
+        afd.adicionar_transicao(f"q{rng.randrange(n)}", rng.choice(rotulos), f"q{rng.randrange(n)}")
+    return afd
+
+def _cadeias(alfabeto="ab", maximo=5):
+    for tamanho in range(maximo + 1):
+        yield from map("".join, itertools.product(alfabeto, repeat=tamanho))
+
+def _ultimo_passo(simulador):
+    ultimo = None
+    for ultimo in simulador.gerador: pass
+    return ultimo
+
+def test_compilado_igual_ao_simulador_passo_a_passo():
+    rng = random.Random(2)
+    for tentativa in range(200):
+        rotulos = ["a", "b"] if tentativa % 2 else ["a", "b", "ab", "ba", "aa"] # Também rótulos de vários caracteres
+        afd = _afd_aleatorio(rng, rotulos)
+        compilado = afd.compilar()
+        for cadeia in _cadeias():
+            ultimo = _ultimo_passo(SimuladorAFD(afd, cadeia))
+            assert compilado.aceita(cadeia) == (ultimo["status"] == "aceita"), (cadeia, afd.transicoes)
+            estado, _ = compilado.executar(cadeia)
+            assert {estado} == ultimo["estado_atual"], (cadeia, afd.transicoes)
+
+def test_compilacao_reaproveitada_ate_a_edicao():
+    afd = AFD()
+    for nome in ("q0", "q1"): afd.adicionar_estado(nome, 0, 0)
+    afd.definir_estado_inicial("q0")
+    afd.alternar_estado_final("q1")
+    afd.adicionar_transicao("q0", "a", "q1")
+    compilado = afd.compilar()
+    assert afd.compilar() is compilado and not compilado.aceita("b")
+    afd.adicionar_transicao("q0", "b", "q1")
+    assert afd.compilar() is not compilado and afd.compilar().aceita("b")
+
+def test_sem_estado_inicial():
+    afd = AFD()
+    afd.adicionar_estado("q0", 0, 0)
+    assert afd.compilar().executar("a") == (None, 0)
+    assert not afd.compilar().aceita("")
@@ -0,0 +1,75 @@
+# Arquivo: simulador_de_automatos/tests/test_afd_preguicoso.py
+import itertools
+import random
+import pytest
+from automato import EPSILON
+from automato.automato_finito import AFN
+
+def _afn_aleatorio(rng, rotulos):
+    afn = AFN()
+    n = rng.randint(1, 6)
+    for i in range(n): afn.adicionar_estado(f"q{i}", 10 * i, 0)
+    afn.definir_estado_inicial("q0")
+    for i in range(n):
+        if rng.random() < 0.4: afn.alternar_estado_final(f"q{i}")
+    for _ in range(rng.randint(0, 14)):
+        afn.adicionar_transicao(f"q{rng.randrange(n)}", rng.choice(rotulos), f"q{rng.randrange(n)}")
+    return afn
+
+def _cadeias(alfabeto="ab", maximo=5):
+    for tamanho in range(maximo + 1):
+        yield from map("".join, itertools.product(alfabeto, repeat=tamanho))
+
+def test_para_afd_e_preguicoso_iguais_ao_afn():
+    rng = random.Random(5)
+    for tentativa in range(200):
+        rotulos = ["a", "b", EPSILON] if tentativa % 2 else ["a", "b", EPSILON, "ab", "ba", "aa"]
+        afn = _afn_aleatorio(rng, rotulos)
+        afd = afn.para_afd()
+        preguicoso = afn.afd_preguicoso(max_estados=2) # Cache mínimo: força descartes
+        for cadeia in _cadeias():
+            esperado = afn.compilar().aceita(cadeia)
+            assert afd.compilar().aceita(cadeia) == esperado, (cadeia, afn.transicoes)
+            assert preguicoso.aceita(cadeia) == esperado, (cadeia, afn.transicoes)
+            assert preguicoso.executar(cadeia) == (afn.compilar().nomes_de(afn.compilar().executar(cadeia)[0]),
+                                                   afn.compilar().executar(cadeia)[1])
+        assert len(preguicoso._cache) <= 2
+
+def _afn_n_esimo_do_fim(n):
+    """AFN de 'o n-ésimo símbolo a partir do fim é a': o AFD equivalente tem 2ⁿ estados."""
+    afn = AFN()
+    for i in range(n + 1): afn.adicionar_estado(f"q{i}", 0, 0)
+    afn.definir_estado_inicial("q0")
+    afn.alternar_estado_final(f"q{n}")
+    for simbolo in "ab": afn.adicionar_transicao("q0", simbolo, "q0")
+    afn.adicionar_transicao("q0", "a", "q1")
+    for i in range(1, n):
+        for simbolo in "ab": afn.adicionar_transicao(f"q{i}", simbolo, f"q{i + 1}")
+    return afn
+
+def test_preguicoso_descarta_alem_do_limite():
+    afn = _afn_n_esimo_do_fim(6)
+    preguicoso = afn.afd_preguicoso(max_estados=8)
+    rng = random.Random(6)
+    for _ in range(300):
+        cadeia = "".join(rng.choice("ab") for _ in range(rng.randint(0, 20)))
+        assert preguicoso.aceita(cadeia) == (len(cadeia) >= 6 and cadeia[-6] == "a")
+    assert len(preguicoso._cache) <= 8 and preguicoso.descartados > 0
+
+def test_para_afd_limite_de_estados():
+    afn = _afn_n_esimo_do_fim(6)
+    assert len(afn.para_afd().estados) == 2 ** 6
+    with pytest.raises(ValueError):
+        afn.para_afd(max_estados=10)
+
+def test_preguicoso_acompanha_a_versao_do_afn():
+    afn = AFN()
+    for nome in ("q0", "q1"): afn.adicionar_estado(nome, 0, 0)
+    afn.definir_estado_inicial("q0")
+    afn.alternar_estado_final("q1")
+    afn.adicionar_transicao("q0", "a", "q1")
+    preguicoso = afn.afd_preguicoso()
+    assert afn.afd_preguicoso() is preguicoso and not preguicoso.aceita("b")
+    afn.adicionar_transicao("q0", "b", "q1")
+    assert afn.afd_preguicoso() is not preguicoso and afn.afd_preguicoso().aceita("b")
+    assert afn.afd_preguicoso(max_estados=16).max_estados == 16
@@ -0,0 +1,68 @@
+# Arquivo: simulador_de_automatos/tests/test_afn_compilado.py
+import itertools
+import random
+from automato import EPSILON
+from automato.automato_finito import AFN
+from simulador.simulador_passos import SimuladorAFN
+
+def _afn_aleatorio(rng, rotulos):
+    afn = AFN()
+    n = rng.randint(1, 6)
+    for i in range(n): afn.adicionar_estado(f"q{i}", 10 * i, 0)
+    afn.definir_estado_inicial("q0")
+    for i in range(n):
+        if rng.random() < 0.4: afn.alternar_estado_final(f"q{i}")
+    for _ in range(rng.randint(0, 14)):
+        afn.adicionar_transicao(f"q{rng.randrange(n)}", rng.choice(rotulos), f"q{rng.randrange(n)}")
+    return afn
+
+def _cadeias(alfabeto="ab", maximo=5):
+    for tamanho in range(maximo + 1):
+        yield from map("".join, itertools.product(alfabeto, repeat=tamanho))
+
+def _referencia(afn, cadeia):
+    """Simulação por conjuntos, sem o motor: fecho-ε e, a cada passo, só as transições do rótulo mais longo que casa."""
+    atuais = afn.fecho_epsilon({afn.estado_inicial.nome})
+    indice = 0
+    while indice < len(cadeia):
+        casam = [(rotulo, destinos) for (origem, rotulo), destinos in afn.transicoes.items()
+                 if origem in atuais and rotulo != EPSILON and cadeia.startswith(rotulo, indice)]
+        if not casam: break
+        maior = max(len(rotulo) for rotulo, _ in casam)
+        atuais = afn.fecho_epsilon(set().union(*(destinos for rotulo, destinos in casam if len(rotulo) == maior)))
+        indice += maior
+    return atuais, indice
+
+def test_compilado_igual_a_simulacao_por_conjuntos():
+    rng = random.Random(3)
+    for tentativa in range(200):
+        rotulos = ["a", "b", EPSILON] if tentativa % 2 else ["a", "b", EPSILON, "ab", "ba"]
+        afn = _afn_aleatorio(rng, rotulos)
+        motor = afn.compilar()
+        for cadeia in _cadeias():
+            estados, consumidos = _referencia(afn, cadeia)
+            mascara, consumidos_motor = motor.executar(cadeia)
+            assert (motor.nomes_de(mascara), consumidos_motor) == (estados, consumidos), (cadeia, afn.transicoes)
+            aceita = consumidos == len(cadeia) and any(afn.estados[nome] in afn.estados_finais for nome in estados)
+            assert motor.aceita(cadeia) == aceita, (cadeia, afn.transicoes)
+
+def test_simulador_passo_a_passo_igual_ao_compilado():
+    rng = random.Random(4)
+    for _ in range(100):
+        afn = _afn_aleatorio(rng, ["a", "b", EPSILON, "ab"])
+        for cadeia in _cadeias(maximo=4):
+            ultimo = None
+            for ultimo in SimuladorAFN(afn, cadeia).gerador: pass
+            assert (ultimo["status"] == "aceita") == afn.compilar().aceita(cadeia), (cadeia, afn.transicoes)
+
+def test_fecho_epsilon_encadeado():
+    afn = AFN()
+    for i in range(4): afn.adicionar_estado(f"q{i}", 0, 0)
+    afn.definir_estado_inicial("q0")
+    afn.alternar_estado_final("q3")
+    afn.adicionar_transicao("q0", EPSILON, "q1")
+    afn.adicionar_transicao("q1", EPSILON, "q2")
+    afn.adicionar_transicao("q2", "a", "q3")
+    motor = afn.compilar()
+    assert motor.nomes_de(motor.mascara_inicial) == {"q0", "q1", "q2"}
+    assert motor.aceita("a") and not motor.aceita("") and not motor.aceita("aa")
@@ -0,0 +1,87 @@
+# Arquivo: simulador_de_automatos/tests/test_binario.py
+import itertools
+import random
+import pytest
+from automato import EPSILON
+from automato.automato_finito import AFD, AFN
+from automato.automato_pilha import AutomatoPilha
+from automato.maquinas_moore_mealy import MaquinaMoore, MaquinaMealy
+from automato.maquina_turing import MaquinaTuring
+from automato.binario import salvar_binario, carregar_binario, abrir_binario
+
+def _automato_aleatorio(rng, tipo):
+    automato = {"AFD": AFD, "AFN": AFN, "AP": AutomatoPilha, "Moore": MaquinaMoore, "Mealy": MaquinaMealy, "Turing": MaquinaTuring}[tipo]()
+    n = rng.randint(1, 6)
+    nomes = [f"q{i}" for i in range(n)]
+    for i, nome in enumerate(nomes):
+        if tipo == "Moore": automato.adicionar_estado(nome, 40.0 * i, rng.random() * 300, output=rng.choice(["", "0", "1"]))
+        else: automato.adicionar_estado(nome, 40.0 * i, rng.random() * 300)
+        if rng.random() < 0.4: automato.alternar_estado_final(nome)
+    if rng.random() < 0.9: automato.definir_estado_inicial(rng.choice(nomes))
+    simbolos = ["a", "b", "ab", "ç"]
+    for _ in range(rng.randint(0, 12)):
+        origem, destino = rng.choice(nomes), rng.choice(nomes)
+        if tipo in ("AFD", "Moore"): automato.adicionar_transicao(origem, rng.choice(simbolos), destino)
+        elif tipo == "AFN": automato.adicionar_transicao(origem, rng.choice(simbolos + [EPSILON]), destino)
+        elif tipo == "Mealy": automato.adicionar_transicao(origem, rng.choice(simbolos), destino, rng.choice(["0", "1", EPSILON]))
+        elif tipo == "AP": automato.adicionar_transicao(origem, rng.choice(simbolos + [EPSILON]), rng.choice(["Z", EPSILON]), destino, rng.choice(["AZ", "A", EPSILON]))
+        else: automato.adicionar_transicao(origem, rng.choice("ab" + automato.simbolo_branco), destino, rng.choice("ab" + automato.simbolo_branco), rng.choice("LR"))
+    return automato
+
+def _resumo(automato):
+    estados = {nome: (e.x, e.y, e.is_inicial, e.is_final, getattr(e, "output", "") or "") for nome, e in automato.estados.items()}
+    return (estados, automato.transicoes, automato.estado_inicial and automato.estado_inicial.nome,
+            getattr(automato, "simbolo_inicial_pilha", None), getattr(automato, "simbolo_branco", None))
+
+@pytest.mark.parametrize("tipo", ["AFD", "AFN", "AP", "Moore", "Mealy", "Turing"])
+def test_ida_e_volta(tmp_path, tipo):
+    rng = random.Random(10)
+    caminho = str(tmp_path / "automato.autb")
+    for _ in range(50):
+        automato = _automato_aleatorio(rng, tipo)
+        salvar_binario(automato, caminho)
+        tipo_lido, lido = carregar_binario(caminho)
+        assert tipo_lido == tipo
+        assert _resumo(lido) == _resumo(automato)
+
+@pytest.mark.parametrize("simbolo", [None, "", "$", "Z"])
+def test_simbolo_inicial_da_pilha(tmp_path, simbolo):
+    automato = _automato_aleatorio(random.Random(3), "AP")
+    automato.simbolo_inicial_pilha = simbolo
+    caminho = str(tmp_path / "ap.autb")
+    salvar_binario(automato, caminho)
+    assert carregar_binario(caminho)[1].simbolo_inicial_pilha == simbolo
+
+def test_branco_da_maquina_de_turing(tmp_path):
+    mt = MaquinaTuring(simbolo_branco="_")
+    mt.adicionar_estado("q0", 0, 0, is_inicial=True)
+    mt.adicionar_transicao("q0", "_", "q0", "a", "R")
+    caminho = str(tmp_path / "mt.autb")
+    salvar_binario(mt, caminho)
+    lido = carregar_binario(caminho)[1]
+    assert lido.simbolo_branco == "_" and lido.transicoes == mt.transicoes
+
+@pytest.mark.parametrize("tipo", ["AFD", "AFN"])
+def test_motor_do_instantaneo_igual_ao_do_automato(tmp_path, tipo):
+    rng = random.Random(4)
+    caminho = str(tmp_path / "automato.autb")
+    cadeias = ["".join(p) for tamanho in range(5) for p in itertools.product(["a", "b", "ç"], repeat=tamanho)]
+    for _ in range(50):
+        automato = _automato_aleatorio(rng, tipo)
+        salvar_binario(automato, caminho)
+        with abrir_binario(caminho) as instantaneo:
+            motor = instantaneo.compilar()
+            for cadeia in cadeias:
+                assert motor.aceita(cadeia) == automato.compilar().aceita(cadeia), (cadeia, automato.transicoes)
+
+def test_arquivos_invalidos(tmp_path):
+    caminho = tmp_path / "invalido.autb"
+    caminho.write_bytes(b"AUTB")
+    with pytest.raises(ValueError, match="cabeçalho"):
+        carregar_binario(str(caminho))
+    caminho.write_bytes(b"XXXX" + bytes(40))
+    with pytest.raises(ValueError, match="assinatura"):
+        carregar_binario(str(caminho))
+    salvar_binario(_automato_aleatorio(random.Random(1), "AP"), str(caminho))
+    with abrir_binario(str(caminho)) as instantaneo, pytest.raises(TypeError):
+        instantaneo.compilar()
@@ -0,0 +1,38 @@
+# Arquivo: simulador_de_automatos/tests/test_ciclos.py
+import random
+from simulador.ciclos import BASE, MODULO, HashFita, DetectorCiclos
+from simulador.fita import Fita
+
+BRANCO = "☐"
+
+def _hash_referencia(hash_fita, fita):
+    """Soma de codigo(simbolo) * BASE^posicao sobre as células usadas, calculada do zero."""
+    return sum(hash_fita.codigo(fita[p]) * pow(BASE, p, MODULO) for p in range(fita.inicio, fita.fim + 1)) % MODULO
+
+def test_hash_incremental_igual_ao_calculado_do_zero():
+    rng = random.Random(17)
+    for _ in range(300):
+        conteudo = "".join(rng.choice("ab") for _ in range(rng.randint(0, 6)))
+        hash_fita, fita = HashFita(conteudo, BRANCO), Fita(conteudo, BRANCO)
+        cabecote = 0
+        for _ in range(rng.randint(0, 30)):
+            sentido = rng.choice([-1, 0, 1])
+            k = rng.randint(1, 8) if sentido and rng.random() < 0.5 else 1
+            lido, escrito = fita[cabecote], rng.choice(["a", "b", BRANCO])
+            if any(fita[cabecote + sentido * i] != lido for i in range(k)): k = 1 # A varredura exige o mesmo símbolo lido
+            if k == 1: hash_fita.passo(lido, escrito, sentido)
+            else: hash_fita.varrer(lido, escrito, k, sentido)
+            for i in range(k): fita[cabecote + sentido * i] = escrito
+            cabecote += sentido * k
+            assert hash_fita.valor == _hash_referencia(hash_fita, fita)
+            assert hash_fita.potencia == pow(BASE, cabecote, MODULO)
+
+def test_detector_compara_a_fita_inteira():
+    detector = DetectorCiclos(BRANCO)
+    assert detector.verificar("q0", 0, 7, Fita("ab", BRANCO), 0) is None
+    # Mesma impressão digital (colisão forjada), fita diferente: não é ciclo
+    assert detector.verificar("q0", 0, 7, Fita("ba", BRANCO), 1) is None
+    detector = DetectorCiclos(BRANCO)
+    detector.verificar("q0", 0, 7, Fita("ab", BRANCO), 0)
+    # Brancos nas bordas não mudam a configuração
+    assert detector.verificar("q0", 0, 7, Fita("ab" + BRANCO * 3, BRANCO), 1) == 0
@@ -0,0 +1,73 @@
+# Arquivo: simulador_de_automatos/tests/test_fita.py
+import random
+from simulador.fita import Fita, FitaRLE
+
+BRANCO = "☐"
+
+class _FitaReferencia:
+    """Fita ingênua em dicionário (posição -> símbolo), com os limites das células usadas."""
+    def __init__(self, conteudo):
+        self.celulas = dict(enumerate(conteudo))
+
+    def __getitem__(self, posicao):
+        return self.celulas.get(posicao, BRANCO)
+
+    def limites(self):
+        return (min(self.celulas), max(self.celulas)) if self.celulas else None
+
+    def janela(self, cabecote, raio):
+        """Texto da janela como era montado antes da Fita: ' s ' por célula e '[s]' no cabeçote."""
+        return "".join(f"[{self[p]}]" if p == cabecote else f" {self[p]} " for p in range(cabecote - raio, cabecote + raio + 1)).strip()
+
+    def conteudo(self):
+        limites = self.limites()
+        return "".join(self[p] for p in range(limites[0], limites[1] + 1)) if limites else ""
+
+def test_fita_igual_a_referencia():
+    rng = random.Random(14)
+    for _ in range(300):
+        conteudo = "".join(rng.choice("ab") for _ in range(rng.randint(0, 6)))
+        fita, referencia = Fita(conteudo, BRANCO), _FitaReferencia(conteudo)
+        for _ in range(rng.randint(0, 40)):
+            posicao = rng.randint(-60, 60)
+            if rng.random() < 0.5:
+                simbolo = rng.choice(["a", "b", BRANCO])
+                fita[posicao] = simbolo; referencia.celulas[posicao] = simbolo
+            assert fita[posicao] == referencia[posicao]
+        limites = referencia.limites()
+        if limites: assert (fita.inicio, fita.fim) == limites
+        assert len(fita) == (limites[1] - limites[0] + 1 if limites else 0)
+        assert fita.conteudo() == referencia.conteudo()
+        a = rng.randint(-80, 80); b = a + rng.randint(-2, 40)
+        assert fita.fatia(a, b) == [referencia[p] for p in range(a, b + 1)]
+        cabecote = rng.randint(-70, 70)
+        assert fita.janela(cabecote, 3) == referencia.janela(cabecote, 3)
+
+def test_fita_vazia_e_janela():
+    fita = Fita("", BRANCO)
+    assert len(fita) == 0 and fita.conteudo() == "" and fita[5] == BRANCO
+    fita[-3] = "x"
+    assert (fita.inicio, fita.fim, fita.conteudo()) == (-3, -3, "x")
+    assert Fita("abc", BRANCO).janela(1, 1) == "a [b] c"
+
+def test_fita_rle_igual_a_fita():
+    rng = random.Random(16)
+    for _ in range(300):
+        conteudo = "".join(rng.choice("aab") for _ in range(rng.randint(0, 8)))
+        rle, fita = FitaRLE(conteudo, BRANCO), Fita(conteudo, BRANCO)
+        cabecote = 0
+        for _ in range(rng.randint(0, 40)):
+            direcao = rng.choice([-1, 0, 1])
+            k = rng.randint(1, min(rle.corrida(direcao), 30)) if direcao else 1
+            simbolo = rng.choice(["a", "b", BRANCO])
+            celulas = range(cabecote, cabecote + k) if direcao >= 0 else range(cabecote - k + 1, cabecote + 1)
+            assert len({fita[p] for p in celulas}) == 1 # A corrida informada tem mesmo um só símbolo
+            rle.preencher(simbolo, k, direcao)
+            for p in celulas: fita[p] = simbolo
+            cabecote += direcao * k
+            assert (rle.posicao, rle.ler()) == (cabecote, fita[cabecote])
+            assert all(a != b for a, b in zip(rle.simbolos, rle.simbolos[1:])) # Corridas maximais
+        assert (rle.inicio, rle.fim, rle.conteudo()) == (fita.inicio, fita.fim, fita.conteudo())
+        assert rle.janela(cabecote, 5) == fita.janela(cabecote, 5)
+        posicao = rng.randint(-50, 50)
+        assert rle[posicao] == fita[posicao]
@@ -0,0 +1,74 @@
+# Arquivo: simulador_de_automatos/tests/test_gramatica.py
+import itertools
+import random
+import pytest
+from automato import EPSILON
+from automato.automato_pilha import AutomatoPilha
+from simulador.simulador_passos import SimuladorAP, SimuladorAPGramatica
+
+def _ap_aleatorio(rng):
+    ap = AutomatoPilha()
+    n = rng.randint(1, 4)
+    nomes = [f"q{i}" for i in range(n)]
+    for nome in nomes:
+        ap.adicionar_estado(nome, 0, 0)
+        if rng.random() < 0.4: ap.alternar_estado_final(nome)
+    ap.definir_estado_inicial("q0")
+    for _ in range(rng.randint(1, 10)):
+        ap.adicionar_transicao(rng.choice(nomes), rng.choice(["a", "b", EPSILON]), rng.choice(["Z", "A", EPSILON]),
+                               rng.choice(nomes), rng.choice(["AZ", "AA", "A", "Z", EPSILON]))
+    return ap
+
+def _cadeias(alfabeto="ab", maximo=4):
+    for tamanho in range(maximo + 1):
+        yield from map("".join, itertools.product(alfabeto, repeat=tamanho))
+
+def _veredito(simulador):
+    ultimo = None
+    for ultimo in simulador.gerador: pass
+    return ultimo["status"], simulador.motivo_parada
+
+def test_earley_igual_a_busca_em_largura():
+    rng = random.Random(13)
+    comparados = aceitas = 0
+    for _ in range(150):
+        ap = _ap_aleatorio(rng)
+        for cadeia in _cadeias():
+            status, motivo = _veredito(SimuladorAP(ap, cadeia, max_passos=None, max_profundidade_pilha=8))
+            if motivo not in ("aceita", "esgotada"): continue # Busca podada: sem veredito exato para comparar
+            assert _veredito(SimuladorAPGramatica(ap, cadeia))[0] == status, (cadeia, ap.transicoes)
+            comparados += 1; aceitas += status == "aceita"
+    assert comparados > 1000 and aceitas > 100
+
+def _ap_anbn():
+    ap = AutomatoPilha()
+    for nome in ("q0", "q1", "q2"): ap.adicionar_estado(nome, 0, 0)
+    ap.definir_estado_inicial("q0")
+    ap.alternar_estado_final("q2")
+    ap.adicionar_transicao("q0", "a", "Z", "q0", "AZ")
+    ap.adicionar_transicao("q0", "a", "A", "q0", "AA")
+    ap.adicionar_transicao("q0", "b", "A", "q1", EPSILON)
+    ap.adicionar_transicao("q1", "b", "A", "q1", EPSILON)
+    ap.adicionar_transicao("q1", EPSILON, "Z", "q2", "Z")
+    return ap
+
+def test_reconhecedor_anbn_e_prefixo_consumido():
+    reconhecedor = _ap_anbn().reconhecedor()
+    assert reconhecedor.reconhecer("a" * 50 + "b" * 50) == (True, 100)
+    assert reconhecedor.reconhecer("aabbb") == (False, 4)
+    assert reconhecedor.reconhecer("ba") == (False, 0)
+
+def test_reconhecedor_acompanha_edicoes_e_pilha_inicial():
+    ap = _ap_anbn()
+    reconhecedor = ap.reconhecedor()
+    assert ap.reconhecedor() is reconhecedor and not reconhecedor.reconhecer("")[0]
+    ap.adicionar_transicao("q0", EPSILON, "Z", "q2", "Z")
+    assert ap.reconhecedor() is not reconhecedor and ap.reconhecedor().reconhecer("")[0]
+    reconhecedor = ap.reconhecedor()
+    ap.simbolo_inicial_pilha = None # Pilha começa vazia: nenhuma transição que desempilha Z se aplica
+    assert ap.reconhecedor() is not reconhecedor and not ap.reconhecedor().reconhecer("ab")[0]
+
+def test_limite_de_tempo():
+    ap = _ap_anbn()
+    with pytest.raises(TimeoutError):
+        ap.reconhecedor().reconhecer("ab", prazo=0)
@@ -0,0 +1,82 @@
+# Arquivo: simulador_de_automatos/tests/test_historico.py
+import random
+import pytest
+from automato import EPSILON
+from automato.automato_finito import AFN
+from automato.maquinas_moore_mealy import MaquinaMoore
+from gui.historico import Historico, capturar, aplicar, origens_para
+
+class _Editor:
+    """Edições aleatórias registradas como a tela principal faz (_iniciar_edicao / _concluir_edicao)."""
+    def __init__(self, automato, historico, rng):
+        self.automato, self.historico, self.rng = automato, historico, rng
+        self.posicoes = {}
+        self.contador = 0
+
+    def capturar_tudo(self):
+        return capturar(self.automato, self.posicoes)
+
+    def editar(self):
+        automato, rng = self.automato, self.rng
+        nomes = list(automato.estados)
+        if not nomes or rng.random() < 0.2:
+            nome = f"q{self.contador}"; self.contador += 1
+            afetados, acao = {nome}, lambda: (automato.adicionar_estado(nome, 0, 0), self.posicoes.__setitem__(nome, (rng.randint(0, 500), rng.randint(0, 500))))
+        else:
+            nome, outro = rng.choice(nomes), rng.choice(nomes)
+            escolha = rng.randrange(8)
+            if escolha == 0:
+                afetados, acao = {nome}, lambda: (automato.deletar_estado(nome), self.posicoes.pop(nome))
+            elif escolha == 1:
+                novo = f"q{self.contador}"; self.contador += 1
+                afetados, acao = {nome, novo}, lambda: (automato.renomear_estado(nome, novo), self.posicoes.__setitem__(novo, self.posicoes.pop(nome)))
+            elif escolha == 2: afetados, acao = {nome}, lambda: automato.alternar_estado_final(nome)
+            elif escolha == 3: afetados, acao = {nome}, lambda: automato.definir_estado_inicial(nome)
+            elif escolha == 4: afetados, acao = {nome}, lambda: automato.deletar_transicoes_entre(nome, outro)
+            elif escolha == 5: afetados, acao = {nome}, lambda: self.posicoes.__setitem__(nome, (rng.randint(0, 500), rng.randint(0, 500)))
+            elif escolha == 6 and hasattr(automato, "set_output_estado"): afetados, acao = {nome}, lambda: automato.set_output_estado(nome, rng.choice("01"))
+            else: afetados, acao = {nome}, lambda: automato.adicionar_transicao(nome, rng.choice(["a", "b", EPSILON]), outro)
+        origens = afetados | origens_para(automato, afetados)
+        antes = capturar(automato, self.posicoes, afetados, origens)
+        acao()
+        depois = capturar(automato, self.posicoes, afetados, origens)
+        if depois == antes: return False
+        self.historico.registrar(antes, depois, self.capturar_tudo)
+        return True
+
+@pytest.mark.parametrize("classe", [AFN, MaquinaMoore])
+def test_desfazer_e_refazer_iguais_as_capturas_completas(classe):
+    rng = random.Random(22)
+    for limite, intervalo in ((200, 25), (8, 3)):
+        historico = Historico(limite=limite, intervalo_checkpoint=intervalo)
+        editor = _Editor(classe(), historico, rng)
+        historico.reiniciar(editor.capturar_tudo())
+        estados = [editor.capturar_tudo()] # Captura completa depois de cada ação; 'atual' aponta a de agora
+        atual = 0
+        for _ in range(600):
+            sorteio = rng.random()
+            if sorteio < 0.6:
+                if editor.editar():
+                    del estados[atual + 1:]
+                    estados.append(editor.capturar_tudo()); atual += 1
+            elif sorteio < 0.8:
+                captura = historico.desfazer()
+                if captura is None: assert atual == 0 or len(historico.desfazer_pilha) == 0
+                else: aplicar(editor.automato, editor.posicoes, captura); atual -= 1
+            else:
+                captura = historico.refazer()
+                if captura is None: assert atual == len(estados) - 1
+                else: aplicar(editor.automato, editor.posicoes, captura); atual += 1
+            assert editor.capturar_tudo() == estados[atual]
+            assert len(historico.desfazer_pilha) <= limite
+            assert historico.reconstruir_atual() == estados[atual]
+
+def test_reconstruir_atual_refaz_o_estado_perdido():
+    historico = Historico(intervalo_checkpoint=2)
+    editor = _Editor(AFN(), historico, random.Random(5))
+    historico.reiniciar(editor.capturar_tudo())
+    for _ in range(30): editor.editar()
+    esperado = editor.capturar_tudo()
+    automato, posicoes = AFN(), {} # Estado perdido (ex.: um delta que falhou no meio): parte do zero
+    aplicar(automato, posicoes, historico.reconstruir_atual())
+    assert capturar(automato, posicoes) == esperado
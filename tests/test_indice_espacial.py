@@ -0,0 +1,60 @@
+# Arquivo: simulador_de_automatos/tests/test_indice_espacial.py
+import copy
+import random
+from gui.indice_espacial import IndiceGrade, PosicoesIndexadas
+
+def _caixa_aleatoria(rng):
+    x, y = rng.uniform(-500, 500), rng.uniform(-500, 500)
+    if rng.random() < 0.5: return (x, y, x, y) # Ponto
+    return (x, y, x + rng.uniform(0, 300), y + rng.uniform(0, 300))
+
+def _intersecta(caixa, x1, y1, x2, y2):
+    cx1, cy1, cx2, cy2 = caixa
+    return cx1 <= max(x1, x2) and min(x1, x2) <= cx2 and cy1 <= max(y1, y2) and min(y1, y2) <= cy2
+
+def test_indice_grade_igual_a_busca_exaustiva():
+    rng = random.Random(21)
+    for tamanho in (16, 64, 1000):
+        indice, caixas = IndiceGrade(tamanho), {}
+        for _ in range(2000):
+            chave = rng.randrange(60)
+            if rng.random() < 0.25:
+                indice.remover(chave); caixas.pop(chave, None)
+            else:
+                caixa = _caixa_aleatoria(rng)
+                indice.inserir(chave, caixa); caixas[chave] = caixa
+            x1, y1, x2, y2 = rng.uniform(-600, 600), rng.uniform(-600, 600), rng.uniform(-600, 600), rng.uniform(-600, 600)
+            if rng.random() < 0.1: x1, y1, x2, y2 = -1e4, -1e4, 1e4, 1e4 # Retângulo maior que a parte ocupada
+            assert indice.no_retangulo(x1, y1, x2, y2) == {c for c, caixa in caixas.items() if _intersecta(caixa, x1, y1, x2, y2)}
+            assert indice.no_ponto(x1, y1) == {c for c, caixa in caixas.items() if _intersecta(caixa, x1, y1, x1, y1)}
+            assert len(indice) == len(caixas) and all(chave in indice for chave in caixas)
+        lx1, ly1, lx2, ly2 = indice.limites()
+        assert all(lx1 <= cx1 and cx2 <= lx2 and ly1 <= cy1 and cy2 <= ly2 for cx1, cy1, cx2, cy2 in caixas.values())
+        for chave in list(caixas): indice.remover(chave)
+        assert indice.celulas == {} and indice.limites() is None
+
+def test_posicoes_indexadas_sincronizadas_com_o_dict():
+    rng = random.Random(21)
+    posicoes, referencia = PosicoesIndexadas(tamanho_celula=50), {}
+    for _ in range(2000):
+        nome = f"q{rng.randrange(40)}"
+        operacao = rng.random()
+        posicao = (rng.uniform(-300, 300), rng.uniform(-300, 300))
+        if operacao < 0.5: posicoes[nome] = posicao; referencia[nome] = posicao
+        elif operacao < 0.6 and nome in referencia: del posicoes[nome]; del referencia[nome]
+        elif operacao < 0.7: assert posicoes.pop(nome, None) == referencia.pop(nome, None)
+        elif operacao < 0.75 and referencia:
+            nome, valor = posicoes.popitem(); assert referencia.pop(nome) == valor
+        elif operacao < 0.85: assert posicoes.setdefault(nome, posicao) == referencia.setdefault(nome, posicao)
+        elif operacao < 0.99: posicoes.update({nome: posicao}); referencia.update({nome: posicao})
+        else: posicoes.clear(); referencia.clear()
+        assert posicoes == referencia and set(posicoes.indice.caixas) == set(referencia)
+        x, y, raio = rng.uniform(-300, 300), rng.uniform(-300, 300), rng.uniform(0, 120)
+        assert posicoes.perto(x, y, raio) == {n for n, (px, py) in referencia.items() if (px - x)**2 + (py - y)**2 <= raio**2}
+        assert posicoes.no_retangulo(x, y, x + raio, y - raio) == {n for n, (px, py) in referencia.items()
+                                                                      if x <= px <= x + raio and y - raio <= py <= y}
+
+def test_copias_sao_dicts_simples():
+    posicoes = PosicoesIndexadas({"q0": (1, 2)})
+    for copia in (copy.copy(posicoes), copy.deepcopy(posicoes)):
+        assert type(copia) is dict and copia == {"q0": (1, 2)}
@@ -0,0 +1,76 @@
+# Arquivo: simulador_de_automatos/tests/test_jff.py
+import io
+import random
+import pytest
+from automato import EPSILON
+from automato.automato_finito import AFD, AFN
+from automato.automato_pilha import AutomatoPilha
+from automato.maquinas_moore_mealy import MaquinaMoore, MaquinaMealy
+from automato.maquina_turing import MaquinaTuring
+from automato.jff import carregar_jff, salvar_jff
+
+def _automato_aleatorio(rng, tipo):
+    automato = {"AFD": AFD, "AFN": AFN, "AP": AutomatoPilha, "Moore": MaquinaMoore, "Mealy": MaquinaMealy, "Turing": MaquinaTuring}[tipo]()
+    n = rng.randint(1, 6)
+    nomes = [f"q{i}" for i in range(n)]
+    for i, nome in enumerate(nomes):
+        if tipo == "Moore": automato.adicionar_estado(nome, 40.0 * i, rng.randint(0, 300), output="1" if i == 0 else rng.choice(["", "0", "1"]))
+        else: automato.adicionar_estado(nome, 40.0 * i, rng.randint(0, 300))
+        if rng.random() < 0.4: automato.alternar_estado_final(nome)
+    automato.definir_estado_inicial("q0")
+    simbolos = "ab<&"  # Também caracteres que precisam de escape no XML
+    for _ in range(rng.randint(0, 12)):
+        origem, destino = rng.choice(nomes), rng.choice(nomes)
+        if tipo == "AFD": automato.adicionar_transicao(origem, rng.choice(simbolos), destino)
+        elif tipo == "AFN": automato.adicionar_transicao(origem, rng.choice(simbolos + EPSILON), destino)
+        elif tipo == "Moore": automato.adicionar_transicao(origem, rng.choice(simbolos), destino)
+        elif tipo == "Mealy": automato.adicionar_transicao(origem, rng.choice(simbolos), destino, rng.choice(["0", "1", EPSILON]))
+        elif tipo == "AP": automato.adicionar_transicao(origem, rng.choice(simbolos + EPSILON), rng.choice("Z" + EPSILON), destino, rng.choice(["AZ", "A", EPSILON]))
+        else: automato.adicionar_transicao(origem, rng.choice("ab" + automato.simbolo_branco), destino, rng.choice("ab" + automato.simbolo_branco), rng.choice("LR"))
+    if tipo == "AFN": automato.adicionar_transicao("q0", EPSILON, "q0") # Garante que o 'fa' seja lido como AFN
+    return automato
+
+def _resumo(automato):
+    estados = {nome: (e.x, e.y, e.is_inicial, e.is_final, getattr(e, "output", "") or "") for nome, e in automato.estados.items()}
+    return estados, automato.transicoes, automato.estado_inicial.nome
+
+@pytest.mark.parametrize("tipo", ["AFD", "AFN", "AP", "Moore", "Mealy", "Turing"])
+def test_ida_e_volta(tipo):
+    rng = random.Random(9)
+    for _ in range(50):
+        automato = _automato_aleatorio(rng, tipo)
+        arquivo = io.StringIO()
+        salvar_jff(automato, arquivo)
+        tipo_lido, lido = carregar_jff(io.BytesIO(arquivo.getvalue().encode("utf-8")))
+        assert tipo_lido == tipo
+        assert _resumo(lido) == _resumo(automato)
+
+def test_ida_e_volta_em_arquivo(tmp_path):
+    automato = _automato_aleatorio(random.Random(1), "AP")
+    caminho = str(tmp_path / "ap.jff")
+    salvar_jff(automato, caminho)
+    estatisticas = {}
+    tipo, lido = carregar_jff(caminho, estatisticas)
+    assert tipo == "AP" and _resumo(lido) == _resumo(automato)
+    assert estatisticas["elementos"] == len(automato.estados) + sum(map(len, automato.transicoes.values()))
+
+def _xml(*filhos):
+    return io.BytesIO(("<structure>" + "".join(filhos) + "</structure>").encode("utf-8"))
+
+AUTOMATON = ('<automaton><state id="0" name="q0"><x>0</x><y>0</y><initial/></state>'
+             '<state id="1" name="q1"><x>1</x><y>0</y><final/></state>'
+             '<transition><from>0</from><to>1</to><read>a</read></transition></automaton>')
+
+def test_automaton_antes_do_type():
+    tipo_antes, antes = carregar_jff(_xml(AUTOMATON, "<type>fa</type>"))
+    tipo_depois, depois = carregar_jff(_xml("<type>fa</type>", AUTOMATON))
+    assert tipo_antes == tipo_depois == "AFD"
+    assert _resumo(antes) == _resumo(depois)
+
+def test_arquivos_invalidos():
+    with pytest.raises(ValueError, match="<type>"):
+        carregar_jff(_xml(AUTOMATON))
+    with pytest.raises(ValueError, match="<automaton>"):
+        carregar_jff(_xml("<type>fa</type>"))
+    with pytest.raises(ValueError, match="não suportado"):
+        carregar_jff(_xml("<type>grammar</type>", AUTOMATON))
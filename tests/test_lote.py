@@ -0,0 +1,84 @@
+# Arquivo: simulador_de_automatos/tests/test_lote.py
+from automato import EPSILON
+from automato.automato_finito import AFN
+from automato.automato_pilha import AutomatoPilha
+from automato.maquinas_moore_mealy import MaquinaMoore
+from simulador.lote import SEM_LIMITE, verificar_cadeia, executar_lote
+
+def _ap_anbn():
+    """AP de {aⁿbⁿ | n ≥ 1}, com Z no fundo da pilha."""
+    ap = AutomatoPilha()
+    for i, nome in enumerate(("q0", "q1", "q2")): ap.adicionar_estado(nome, 100 * i, 0)
+    ap.definir_estado_inicial("q0")
+    ap.alternar_estado_final("q2")
+    ap.adicionar_transicao("q0", "a", "Z", "q0", "AZ")
+    ap.adicionar_transicao("q0", "a", "A", "q0", "AA")
+    ap.adicionar_transicao("q0", "b", "A", "q1", EPSILON)
+    ap.adicionar_transicao("q1", "b", "A", "q1", EPSILON)
+    ap.adicionar_transicao("q1", EPSILON, "Z", "q2", "Z")
+    return ap
+
+def test_ap_cadeia_longa_com_limite_grande():
+    veredito = verificar_cadeia(_ap_anbn(), "a" * 800 + "b" * 800, max_passos=10**6)
+    assert veredito["aceita"], veredito
+
+def test_ap_limite_padrao_do_lote():
+    veredito = verificar_cadeia(_ap_anbn(), "a" * 800 + "b" * 800)
+    assert veredito["aceita"], veredito
+    ap = AutomatoPilha() # Empilha em ε para sempre: sem limite, a busca não terminaria
+    ap.adicionar_estado("q0", 0, 0)
+    ap.definir_estado_inicial("q0")
+    ap.adicionar_transicao("q0", EPSILON, EPSILON, "q0", "A")
+    veredito = verificar_cadeia(ap, "a")
+    assert veredito["status"] == "limite" and veredito["motivo"] == "limite_passos", veredito
+
+def test_ap_sem_limite_explicito():
+    veredito = verificar_cadeia(_ap_anbn(), "a" * 800 + "b" * 800, max_passos=SEM_LIMITE)
+    assert veredito["aceita"], veredito
+
+def test_ap_limite_de_passos_do_lote():
+    veredito = verificar_cadeia(_ap_anbn(), "a" * 800 + "b" * 800, max_passos=100)
+    assert veredito["status"] == "limite" and veredito["motivo"] == "limite_passos"
+
+def test_ap_estrategias_no_lote():
+    ap = _ap_anbn()
+    for estrategia in ("largura", "profundidade", "aprofundamento", "melhor"):
+        vereditos = list(executar_lote(ap, ["aabb", "aab"], processos=1, max_passos=10**5, estrategia=estrategia))
+        assert [v["aceita"] for v in vereditos] == [True, False], estrategia
+
+def test_ap_gramatica_com_limites():
+    veredito = verificar_cadeia(_ap_anbn(), "a" * 300 + "b" * 300, max_passos=10, tempo_limite=60, motor_ap="gramatica")
+    assert veredito["aceita"], veredito
+
+def _moore_paridade():
+    moore = MaquinaMoore()
+    moore.adicionar_estado("par", 0, 0, output="0")
+    moore.adicionar_estado("impar", 100, 0, output="1")
+    moore.definir_estado_inicial("par")
+    moore.adicionar_transicao("par", "1", "impar")
+    moore.adicionar_transicao("impar", "1", "par")
+    moore.adicionar_transicao("par", "0", "par")
+    moore.adicionar_transicao("impar", "0", "impar")
+    return moore
+
+def test_limites_chegam_aos_processos_trabalhadores():
+    ap, longa = _ap_anbn(), "a" * 800 + "b" * 800
+    for processos in (1, 2):
+        aceitas = list(executar_lote(ap, [longa, "ab"], processos=processos, tamanho_bloco=1, max_passos=10**6))
+        assert [v["aceita"] for v in aceitas] == [True, True], processos
+        cortadas = list(executar_lote(ap, [longa], processos=processos, max_passos=100))
+        assert cortadas[0]["motivo"] == "limite_passos", processos
+        moore = list(executar_lote(_moore_paridade(), ["1101", "1" * 50], processos=processos, tamanho_bloco=1, max_passos=10))
+        assert [v["status"] for v in moore] == ["finalizado", "limite"], processos
+        assert moore[0]["output"] == "01001"
+
+def test_afn_editado_entre_cadeias():
+    afn = AFN()
+    for nome in ("q0", "q1"): afn.adicionar_estado(nome, 0, 0)
+    afn.definir_estado_inicial("q0")
+    afn.alternar_estado_final("q1")
+    afn.adicionar_transicao("q0", "a", "q1")
+    assert not verificar_cadeia(afn, "b")["aceita"]
+    afn.adicionar_transicao("q0", "b", "q1")
+    assert verificar_cadeia(afn, "b")["aceita"]
+    assert afn.afd_preguicoso().aceita("b")
@@ -0,0 +1,68 @@
+# Arquivo: simulador_de_automatos/tests/test_minimizacao.py
+import itertools
+import random
+from automato.automato_finito import AFD
+from automato.maquinas_moore_mealy import MaquinaMoore
+from simulador.simulador_passos import SimuladorAFD, SimuladorMoore
+
+def _preencher(automato, rng, rotulos, **estado):
+    n = rng.randint(1, 7)
+    for i in range(n): automato.adicionar_estado(f"q{i}", 10 * i, 0, **{chave: gerar() for chave, gerar in estado.items()})
+    automato.definir_estado_inicial("q0")
+    for _ in range(rng.randint(0, 16)):
+        automato.adicionar_transicao(f"q{rng.randrange(n)}", rng.choice(rotulos), f"q{rng.randrange(n)}")
+    return automato
+
+def _afd_aleatorio(rng, rotulos):
+    afd = _preencher(AFD(), rng, rotulos)
+    for nome in list(afd.estados):
+        if rng.random() < 0.4: afd.alternar_estado_final(nome)
+    return afd
+
+def _moore_aleatorio(rng, rotulos):
+    return _preencher(MaquinaMoore(), rng, rotulos, output=lambda: rng.choice(["", "0", "1"]))
+
+def _cadeias(alfabeto="abc", maximo=5): # 'c' fica fora do alfabeto dos autômatos
+    for tamanho in range(maximo + 1):
+        yield from map("".join, itertools.product(alfabeto, repeat=tamanho))
+
+def _resultado(simulador):
+    ultimo = None
+    for ultimo in simulador.gerador: pass
+    return ultimo["status"], ultimo.get("output")
+
+def test_afd_minimo_reconhece_a_mesma_linguagem():
+    rng = random.Random(5)
+    for tentativa in range(200):
+        rotulos = ["a", "b"] if tentativa % 2 else ["a", "b", "ab", "ba", "aa"]
+        afd = _afd_aleatorio(rng, rotulos)
+        minimo = afd.minimizar()
+        assert len(minimo.estados) <= len(afd.estados)
+        for cadeia in _cadeias():
+            esperado = _resultado(SimuladorAFD(afd, cadeia))[0] == "aceita"
+            assert (_resultado(SimuladorAFD(minimo, cadeia))[0] == "aceita") == esperado, (cadeia, afd.transicoes)
+        assert len(minimo.minimizar().estados) == len(minimo.estados) # Idempotente
+
+def test_moore_minimo_produz_as_mesmas_saidas():
+    rng = random.Random(5)
+    for tentativa in range(200):
+        rotulos = ["a", "b"] if tentativa % 2 else ["a", "b", "ab", "ba", "aa"]
+        moore = _moore_aleatorio(rng, rotulos)
+        minimo = moore.minimizar()
+        assert len(minimo.estados) <= len(moore.estados)
+        for cadeia in _cadeias():
+            assert _resultado(SimuladorMoore(minimo, cadeia)) == _resultado(SimuladorMoore(moore, cadeia)), (cadeia, moore.transicoes)
+        assert len(minimo.minimizar().estados) == len(minimo.estados)
+
+def test_afd_com_estados_equivalentes_e_inalcancaveis():
+    afd = AFD()
+    for nome in ("q0", "q1", "q2", "q3"): afd.adicionar_estado(nome, 0, 0)
+    afd.definir_estado_inicial("q0")
+    for nome in ("q1", "q2"): afd.alternar_estado_final(nome)
+    afd.adicionar_transicao("q0", "a", "q1")
+    afd.adicionar_transicao("q0", "b", "q2")
+    for origem in ("q1", "q2"):
+        for simbolo in "ab": afd.adicionar_transicao(origem, simbolo, origem)
+    afd.adicionar_transicao("q3", "a", "q0") # q3 é inalcançável
+    minimo = afd.minimizar()
+    assert set(minimo.estados) == {"q0", "q1"} and minimo.estado_inicial.nome == "q0"
@@ -0,0 +1,119 @@
+# Arquivo: simulador_de_automatos/tests/test_simulador_mt.py
+import random
+from automato.maquina_turing import MaquinaTuring
+from simulador.simulador_passos import SimuladorMT
+
+def _mt_aleatoria(rng, laços=0.0):
+    """MT aleatória; 'laços' é a chance de uma transição voltar ao próprio estado (varreduras dos macro-passos)."""
+    mt = MaquinaTuring()
+    branco = mt.simbolo_branco
+    n = rng.randint(1, 4)
+    nomes = [f"q{i}" for i in range(n)]
+    for nome in nomes: mt.adicionar_estado(nome, 0, 0)
+    mt.definir_estado_inicial("q0")
+    if rng.random() < 0.7: mt.alternar_estado_final(rng.choice(nomes))
+    for origem in nomes:
+        for lido in "ab" + branco:
+            if rng.random() < 0.8:
+                destino = origem if rng.random() < laços else rng.choice(nomes)
+                mt.adicionar_transicao(origem, lido, destino, rng.choice("ab" + branco), rng.choice("LR"))
+    return mt
+
+def _passos_do_gerador(mt, cadeia, max_passos):
+    """
+    Configurações do gerador passo a passo (a i-ésima depois de i transições) e o passo final.
+    O passo final também entra na lista: quando a máquina aceita ou atinge o limite, ele é a última configuração.
+    """
+    passos = list(SimuladorMT(mt, cadeia, max_passos=max_passos).gerador)
+    return [p for p in passos if p["status"] == "executando"] + passos[-1:], passos[-1]
+
+def _comparaveis(passo):
+    return {chave: passo.get(chave) for chave in ("status", "mensagem", "estado_atual", "tape")}
+
+def test_execucao_rapida_igual_ao_passo_a_passo():
+    rng = random.Random(15)
+    for _ in range(300):
+        mt = _mt_aleatoria(rng)
+        cadeia = "".join(rng.choice("ab") for _ in range(rng.randint(0, 6)))
+        configuracoes, final = _passos_do_gerador(mt, cadeia, 150)
+        intervalo = rng.randint(1, 20)
+        rapidos = list(SimuladorMT(mt, cadeia, max_passos=150).executar_rapido(intervalo=intervalo, macro=False))
+        assert _comparaveis(rapidos[-1]) == _comparaveis(final), (cadeia, mt.transicoes)
+        for ponto in rapidos[:-1]: # Pontos de controle: a configuração depois de 'passos' transições
+            assert ponto["status"] == "executando" and ponto["passos"] % intervalo == 0
+            configuracao = configuracoes[ponto["passos"]]
+            assert (ponto["estado_atual"], ponto["tape"]) == (configuracao["estado_atual"], configuracao["tape"]), (cadeia, mt.transicoes)
+
+def test_execucao_rapida_sem_limite_e_sem_estado_inicial():
+    mt = MaquinaTuring()
+    mt.adicionar_estado("q0", 0, 0)
+    assert next(SimuladorMT(mt, "").executar_rapido())["status"] == "erro"
+    mt.definir_estado_inicial("q0")
+    mt.adicionar_estado("q1", 0, 0)
+    mt.alternar_estado_final("q1")
+    mt.adicionar_transicao("q0", "a", "q0", "b", "R")
+    mt.adicionar_transicao("q0", mt.simbolo_branco, "q1", mt.simbolo_branco, "L")
+    simulador = SimuladorMT(mt, "a" * 5000, max_passos=None)
+    final = list(simulador.executar_rapido())[-1]
+    assert (final["motivo"], final["passos"]) == ("aceita", 5001)
+    assert simulador.fita.conteudo() == "b" * 5000 + mt.simbolo_branco and simulador.cabecote == 4999
+
+def test_macro_passos_iguais_ao_passo_a_passo():
+    rng = random.Random(16)
+    for _ in range(300):
+        mt = _mt_aleatoria(rng, laços=0.6)
+        cadeia = "".join(rng.choice("aab") for _ in range(rng.randint(0, 12)))
+        max_passos = rng.choice([40, 300, 2000])
+        intervalo = rng.choice([None, 1, 7, 100])
+        _, final = _passos_do_gerador(mt, cadeia, max_passos)
+        macro = list(SimuladorMT(mt, cadeia, max_passos=max_passos).executar_rapido(intervalo=intervalo, macro=True))
+        assert _comparaveis(macro[-1]) == _comparaveis(final), (cadeia, mt.transicoes)
+        verificados = list(SimuladorMT(mt, cadeia, max_passos=max_passos).executar_rapido(intervalo=intervalo, verificar=True))
+        assert all(passo["status"] != "erro" for passo in verificados), (cadeia, mt.transicoes, verificados[-1])
+        assert [p["passos"] for p in verificados] == [p["passos"] for p in macro]
+
+def test_macro_passos_varrem_corridas_longas():
+    mt = MaquinaTuring()
+    for nome in ("q0", "q1", "q2"): mt.adicionar_estado(nome, 0, 0)
+    mt.definir_estado_inicial("q0")
+    mt.alternar_estado_final("q2")
+    branco = mt.simbolo_branco
+    mt.adicionar_transicao("q0", "a", "q0", "b", "R") # Vai até o fim trocando a por b
+    mt.adicionar_transicao("q0", branco, "q1", branco, "L")
+    mt.adicionar_transicao("q1", "b", "q1", "b", "L") # Volta até o começo
+    mt.adicionar_transicao("q1", branco, "q2", branco, "R")
+    n = 200_000
+    simulador = SimuladorMT(mt, "a" * n, max_passos=None)
+    final = list(simulador.executar_rapido(macro=True))[-1]
+    assert (final["motivo"], final["passos"], simulador.cabecote) == ("aceita", 2 * n + 2, 0)
+    assert simulador.fita.simbolos == [branco, "b", branco]
+
+def test_deteccao_de_ciclos_so_antecipa_o_limite():
+    rng = random.Random(17)
+    ciclos = 0
+    for _ in range(300):
+        mt = _mt_aleatoria(rng, laços=0.3)
+        cadeia = "".join(rng.choice("ab") for _ in range(rng.randint(0, 6)))
+        for macro in (False, True):
+            referencia = list(SimuladorMT(mt, cadeia, max_passos=3000).executar_rapido(macro=macro))[-1]
+            detectado = list(SimuladorMT(mt, cadeia, max_passos=3000).executar_rapido(macro=macro, detectar_ciclos=True))[-1]
+            if detectado["motivo"] == "ciclo":
+                # Um ciclo prova que a MT não para: sem a detecção, ela vai até o limite de passos
+                assert referencia["motivo"] == "limite_passos", (cadeia, mt.transicoes)
+                assert detectado["passos"] <= referencia["passos"]
+                ciclos += 1
+            else:
+                assert _comparaveis(detectado) == _comparaveis(referencia), (cadeia, mt.transicoes)
+    assert ciclos > 5
+
+def test_ciclo_detectado_sem_limite_de_passos():
+    mt = MaquinaTuring()
+    mt.adicionar_estado("q0", 0, 0)
+    mt.adicionar_estado("q1", 0, 0)
+    mt.definir_estado_inicial("q0")
+    mt.adicionar_transicao("q0", "a", "q1", "b", "R") # Vai e volta entre as duas células para sempre
+    mt.adicionar_transicao("q1", "b", "q0", "b", "L")
+    mt.adicionar_transicao("q0", "b", "q1", "a", "R")
+    mt.adicionar_transicao("q1", "a", "q0", "a", "L")
+    final = list(SimuladorMT(mt, "ab", max_passos=None).executar_rapido(detectar_ciclos=True))[-1]
+    assert final["motivo"] == "ciclo" and final["passos"] < 100